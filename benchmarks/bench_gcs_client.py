@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: per-upload overhead of getting the GCS bucket.
+
+Compares the previous path (write GOOGLE_CREDENTIALS_JSON to a temp file,
+build a new storage.Client from it, then the bucket) with the shared,
+lazily built bucket used by GCSStorage. No network is needed: a
+throwaway service-account key is generated locally. The saving measured
+here excludes the new TLS connection the old path also opened per upload.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/bench_gcs_client.py [uploads]
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.cloud import storage
+
+from src.infrastructure.storage.gcs_storage import GCSStorage
+
+REPEAT = 5
+
+
+def make_credentials_json():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return json.dumps({
+        "type": "service_account",
+        "project_id": "bench-project",
+        "private_key_id": "bench",
+        "private_key": pem,
+        "client_email": "bench@bench-project.iam.gserviceaccount.com",
+        "client_id": "1",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    })
+
+
+def bucket_before(json_path):
+    """Bucket lookup as it was done on every upload before."""
+    credentials_json = os.getenv("GOOGLE_CREDENTIALS_JSON")
+    with open(json_path, "w") as f:
+        f.write(credentials_json)
+    storage_client = storage.Client.from_service_account_json(json_path)
+    return storage_client.bucket(os.getenv("GCS_BUCKET_NAME"))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    os.environ["GOOGLE_CREDENTIALS_JSON"] = make_credentials_json()
+    os.environ["GCS_BUCKET_NAME"] = "bench-bucket"
+    json_path = os.path.join(tempfile.mkdtemp(), "gcs-key.json")
+
+    gcs_storage = GCSStorage()
+    first = timeit.timeit(gcs_storage._get_bucket, number=1)
+
+    before = min(timeit.repeat(lambda: bucket_before(json_path), number=count, repeat=REPEAT))
+    after = min(timeit.repeat(gcs_storage._get_bucket, number=count, repeat=REPEAT))
+
+    print(f"uploads: {count}")
+    print(f"before (temp file + new client): {before / count * 1e3:.3f} ms/upload")
+    print(f"after  (shared bucket):          {after / count * 1e3:.6f} ms/upload")
+    print(f"after, first upload only:        {first * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: per-row cost of turning a DB row into a Profile.
+
+Compares the previous decode path (read cursor.description, zip each row
+into a dict, then build Profile by keyword) with the profile_row factory
+used by ProfilesRepository. No database is needed: rows are synthetic.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/bench_row_decode.py [rows]
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime
+
+from src.domain.profile import Profile
+from src.infrastructure.persistence.profiles_repository import PROFILE_COLUMNS, profile_row
+
+REPEAT = 5
+
+
+def make_rows(count):
+    now = datetime.now()
+    return [
+        (
+            uuid.uuid4(), f"user{i}@example.com", "student", f"User {i}",
+            "+1234567890", "Buenos Aires", "2000-01-01", "other",
+            "Description", "image.jpg", now, now,
+        )
+        for i in range(count)
+    ]
+
+
+def decode_before(description, rows):
+    """Decode path before explicit projections and the row factory."""
+    columns = [desc[0] for desc in description]
+    profiles = []
+    for row in rows:
+        profile_data = dict(zip(columns, row))
+        profiles.append(
+            Profile(
+                uuid=profile_data["uuid"],
+                email=profile_data["email"],
+                role=profile_data["role"],
+                display_name=profile_data["display_name"],
+                phone=profile_data["phone"],
+                location=profile_data["location"],
+                birthday=profile_data["birthday"],
+                gender=profile_data["gender"],
+                description=profile_data["description"],
+                display_image=profile_data["display_image"],
+                created_at=profile_data.get("created_at"),
+                updated_at=profile_data.get("updated_at"),
+            )
+        )
+    return profiles
+
+
+def decode_after(rows):
+    make_row = profile_row(None)
+    return [make_row(row) for row in rows]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = make_rows(count)
+    description = [(column,) for column in PROFILE_COLUMNS]
+
+    before = min(timeit.repeat(lambda: decode_before(description, rows), number=1, repeat=REPEAT))
+    after = min(timeit.repeat(lambda: decode_after(rows), number=1, repeat=REPEAT))
+
+    print(f"rows: {count}")
+    print(f"before (dict + kwargs): {before / count * 1e6:.3f} us/row")
+    print(f"after  (row factory):   {after / count * 1e6:.3f} us/row")
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
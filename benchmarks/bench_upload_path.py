@@ -0,0 +1,75 @@
+"""
+Benchmark: the image upload path end to end, without cloud credentials.
+
+Runs ProfileService.add_image against LocalStorage in a temp directory,
+with an in-memory stored_images index instead of the database. Reports
+the upload itself (sniff, hash, store, signed URL), the variant
+rendering done by the image workers, and a duplicate upload that the
+content-hash index answers without writing.
+
+Usage:
+    PYTHONPATH=$(pwd) python benchmarks/bench_upload_path.py [uploads] [side_px]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from src.application.profile_service import ProfileService
+from src.domain.stored_image import StoredImage
+from src.infrastructure.config.storage_config import StorageConfig
+from src.infrastructure.storage.local_storage import LocalStorage
+
+
+def make_jpeg(side, seed):
+    # Ruido para que el JPEG pese como una foto y cada imagen tenga otro hash
+    image = Image.effect_noise((side, side), 64 + seed % 64).convert("RGB")
+    body = io.BytesIO()
+    image.save(body, "JPEG", quality=90)
+    return body.getvalue()
+
+
+def make_repository():
+    index = {}
+    repository = MagicMock()
+    repository.get_stored_image.side_effect = index.get
+    repository.insert_stored_image.side_effect = lambda sha256, *fields: index.setdefault(
+        sha256, StoredImage(sha256, *fields)
+    )
+    return repository
+
+
+def timed(fn, items):
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - started) / len(items) * 1e3
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    side = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    os.environ["STORAGE_LOCAL_DIR"] = tempfile.mkdtemp()
+    service = ProfileService(make_repository(), storage=LocalStorage(StorageConfig()))
+    images = [make_jpeg(side, seed) for seed in range(count)]
+
+    def upload(data):
+        service.add_image("bench", FileStorage(stream=io.BytesIO(data), filename="a.jpg"))
+
+    first = timed(upload, images)
+    duplicate = timed(upload, images)
+    render = timed(lambda data: service._process_image("bench", "bench", data), images[:5])
+
+    print(f"uploads: {count} JPEGs of {side}x{side}, {sum(map(len, images)) / count / 1024:.0f} KiB avg")
+    print(f"add_image, new content:       {first:.2f} ms/upload")
+    print(f"add_image, duplicate content: {duplicate:.2f} ms/upload")
+    print(f"variants (6 renders + puts):  {render:.2f} ms/image")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,7 @@ ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON SEQUENCES TO profile_db;
 
 -- Enable extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Create profiles table with explicit UUID (no default)
 DROP TABLE IF EXISTS profiles;
@@ -48,10 +49,34 @@ CREATE TABLE profiles (
     gender TEXT,
     description TEXT,
     display_image TEXT,
-    created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    -- URLs de las variantes redimensionadas de display_image: {"card": {"webp": ..., "jpg": ...}, ...}
+    image_variants JSONB
+);
+
+-- Imágenes subidas, direccionadas por contenido: un upload repetido apunta
+-- al objeto (y a las variantes) que ya existen en vez de volver a subirlo
+DROP TABLE IF EXISTS stored_images;
+
+CREATE TABLE stored_images (
+    sha256 TEXT PRIMARY KEY,
+    object_key TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    size BIGINT NOT NULL,
+    variants JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
 -- Índice para búsquedas por UUID (relación lógica con users)
 CREATE INDEX IF NOT EXISTS profiles_uuid_idx ON profiles(uuid);
-CREATE INDEX IF NOT EXISTS profiles_email_idx ON profiles(email);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS profiles_email_idx ON profiles(email);
+
+-- Índice para la paginación por cursor (keyset) de GET /profiles
+CREATE INDEX IF NOT EXISTS profiles_created_at_uuid_idx ON profiles(created_at, uuid);
+
+-- Índices para GET /profiles/search: trigramas para nombre y ubicación
+-- (similarity, % e ILIKE) y prefijo de email sin distinguir mayúsculas
+CREATE INDEX IF NOT EXISTS profiles_display_name_trgm_idx ON profiles USING GIN (display_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS profiles_location_trgm_idx ON profiles USING GIN (location gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS profiles_email_prefix_idx ON profiles (lower(email) text_pattern_ops);
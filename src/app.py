@@ -3,8 +3,12 @@ import os
 from flask import Flask, request
 from flask_cors import CORS
 from flask_swagger_ui import get_swaggerui_blueprint
+from werkzeug.exceptions import RequestEntityTooLarge
 
 from src.app_factory import AppFactory
+from src.deadline import with_deadline
+from src.infrastructure.persistence.query_metrics import query_metrics
+from src.presentation.error_generator import get_error_json
 from src.logger_config import get_logger
 
 profiles_app = Flask(__name__)
@@ -14,6 +18,10 @@ CORS(profiles_app)
 profiles_app.secret_key = os.getenv("SECRET_KEY_SESSION")
 profiles_app.permanent_session_lifetime = timedelta(minutes=5)
 
+# Request size limit: checked against Content-Length before reading the body,
+# and while reading it when the body is chunked
+profiles_app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", 8 * 1024 * 1024))
+
 # Logger config
 logger = get_logger("api-profiles")
 
@@ -27,33 +35,122 @@ swaggerui_blueprint = get_swaggerui_blueprint(
 profiles_app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 
 
+@profiles_app.errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    detail = f"Request body exceeds {profiles_app.config['MAX_CONTENT_LENGTH']} bytes"
+    return get_error_json("Request too large", detail, request.path, request.method), 413
+
+
 @profiles_app.get("/health")
 def health_check():
     return {"status": "ok"}, 200
 
 
+@profiles_app.get("/metrics/queries")
+def query_metrics_snapshot():
+    """Per-query histograms of duration, rows returned and pool wait."""
+    return query_metrics.snapshot(), 200
+
+
+@profiles_app.get("/metrics/cache")
+def cache_metrics_snapshot():
+    """Counters of the in-process caches and of coalesced profile reads."""
+    caches = {
+        "profiles": profile_controller.profile_service.profile_cache,
+        "missing": profile_controller.profile_service.missing_cache,
+        "public_bodies": profile_controller.public_body_cache,
+        "single_flight": profile_controller.profile_service.single_flight,
+        "upload_jobs": profile_controller.profile_service.upload_jobs,
+    }
+    return {name: cache.stats() for name, cache in caches.items() if cache is not None}, 200
+
+
 @profiles_app.post("/profiles")
-def create_profile():
+@with_deadline
+async def create_profile():
     """
     Create a new profile.
     Expects JSON with: uuid, name, surname, email, etc.
     """
-    result = profile_controller.create_profile(request)
+    result = await profile_controller.create_profile_async(request)
     return result["response"], result["code_status"]
 
 
 # curl - X POST http: // localhost: 8081/profiles - H "Content-Type: application/json" - d '{"uuid": "123e4567-e89b-12d3-a456-426614174000","email": "usuario@ejemplo.com","role": "student"}'
 
 
+@profiles_app.post("/profiles/bulk")
+@with_deadline
+def create_profiles():
+    """
+    Create many profiles in one transaction.
+    Expects JSON with: profiles (list of profiles, max 5000).
+    """
+    result = profile_controller.create_profiles(request)
+    return result["response"], result["code_status"]
+
+
+# curl - X POST http: // localhost: 8081/profiles/bulk - H "Content-Type: application/json" - d '{"profiles": [{"uuid": "123e4567-e89b-12d3-a456-426614174000","email": "usuario@ejemplo.com","role": "student"}]}'
+
+
 @profiles_app.get("/profiles")
+@with_deadline
 def get_all_profile():
-    result = profile_controller.get_all_profiles()
+    """
+    List profiles, one page at a time.
+    Query params: limit (max 100), after (cursor returned as "next").
+    """
+    result = profile_controller.get_all_profiles(request)
+    return result["response"], result["code_status"]
+
+
+# curl - X GET "http: // localhost: 8081/profiles?limit=20&after=<next>"
+
+
+@profiles_app.get("/profiles/search")
+@with_deadline
+def search_profiles():
+    """
+    Search profiles by display name, location or email prefix.
+    Query params: q (min 3 chars), role, limit (max 100), after (cursor returned as "next").
+    """
+    result = profile_controller.search_profiles(request)
+    return result["response"], result["code_status"]
+
+
+# curl - X GET "http: // localhost: 8081/profiles/search?q=ana&role=student&limit=20"
+
+
+@profiles_app.post("/profiles/batch")
+@with_deadline
+async def get_profiles_batch():
+    """
+    Resolve many profiles in one call.
+    Expects JSON with: uuids (max 100), view ("public" or "private").
+    """
+    result = await profile_controller.get_profiles_batch_async(request)
+    return result["response"], result["code_status"]
+
+
+# curl - X POST http: // localhost: 8081/profiles/batch - H "Content-Type: application/json" - d '{"uuids": ["123e4567-e89b-12d3-a456-426614174000"], "view": "public"}'
+
+
+@profiles_app.get("/profiles/export")
+def export_profiles():
+    """Stream every profile as newline-delimited JSON."""
+    result = profile_controller.export_profiles()
     return result["response"], result["code_status"]
 
 
+# curl - X GET http: // localhost: 8081/profiles/export
+
+
 @profiles_app.get("/profiles/<uuid:uuid>")
-def get_private_profile(uuid):
-    result = profile_controller.get_specific_profiles(uuid, public_view=False)
+@with_deadline
+async def get_private_profile(uuid):
+    result = await profile_controller.get_specific_profiles_async(
+        uuid, public_view=False, request=request
+    )
     return result["response"], result["code_status"]
 
 
@@ -61,8 +158,11 @@ def get_private_profile(uuid):
 
 
 @profiles_app.get("/profiles/public/<uuid:uuid>")
-def get_public_profile(uuid):
-    result = profile_controller.get_specific_profiles(uuid, public_view=True)
+@with_deadline
+async def get_public_profile(uuid):
+    result = await profile_controller.get_specific_profiles_async(
+        uuid, public_view=True, request=request
+    )
     return result["response"], result["code_status"]
 
 
@@ -70,8 +170,9 @@ def get_public_profile(uuid):
 
 
 @profiles_app.put("/profiles/modify")
-def modify_profile():
-    result = profile_controller.modify_profile(request)
+@with_deadline
+async def modify_profile():
+    result = await profile_controller.modify_profile_async(request)
     return result["response"], result["code_status"]
 
 
@@ -79,6 +180,59 @@ def modify_profile():
 
 
 @profiles_app.post("/upload")
-def upload_image():
-    result = profile_controller.upload_image(request)
+async def upload_image():
+    """
+    Upload a profile image. With "Prefer: respond-async" the image is
+    spooled and uploaded in the background: 202 plus the job to poll.
+    """
+    result = await profile_controller.upload_image_async(request)
+    return result["response"], result["code_status"]
+
+
+# curl -X POST http://localhost:8081/upload -H "Prefer: respond-async" -F uuid=123e4567-e89b-12d3-a456-426614174000 -F image=@avatar.png
+
+
+@profiles_app.get("/storage/<path:key>")
+def get_stored_file(key):
+    """Files of the local storage backend (STORAGE_BACKEND=local); 404 otherwise."""
+    result = profile_controller.get_stored_file(key)
+    return result["response"], result["code_status"]
+
+
+@profiles_app.post("/upload/direct")
+@with_deadline
+def create_direct_upload():
+    """
+    Signed URL to PUT an image straight to storage.
+    Expects JSON with: uuid, content_type, size (bytes).
+    """
+    result = profile_controller.create_direct_upload(request)
+    return result["response"], result["code_status"]
+
+
+# curl -X POST http://localhost:8081/upload/direct -H "Content-Type: application/json" -d '{"uuid": "123e4567-e89b-12d3-a456-426614174000", "content_type": "image/png", "size": 48213}'
+
+
+@profiles_app.post("/upload/direct/complete")
+@with_deadline
+def complete_direct_upload():
+    """
+    Validate a direct upload and set it as the profile image.
+    Expects JSON with: uuid, key (returned by /upload/direct).
+    """
+    result = profile_controller.complete_direct_upload(request)
+    return result["response"], result["code_status"]
+
+
+@profiles_app.put("/storage/<path:key>")
+def put_stored_file(key):
+    """Direct uploads to the local storage backend; 404 otherwise."""
+    result = profile_controller.put_stored_file(key, request)
+    return result["response"], result["code_status"]
+
+
+@profiles_app.get("/upload/jobs/<job_id>")
+def get_upload_job(job_id):
+    """Status of a background upload and, once done, the image URL."""
+    result = profile_controller.get_upload_job(job_id)
     return result["response"], result["code_status"]
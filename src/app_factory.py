@@ -1,12 +1,73 @@
-from src.application.profile_service import ProfileService
+import redis
+
+from src.application.async_profile_service import AsyncProfileService
+from src.application.image_processing import ImageWorkers
+from src.application.upload_jobs import UploadJobs
+from src.infrastructure.cache.lru_cache import LRUCache
+from src.infrastructure.cache.shared_cache import SharedProfileCache
+from src.infrastructure.config.cache_config import CacheConfig
+from src.infrastructure.config.db_config import DatabaseConfig
+from src.infrastructure.config.image_config import ImageConfig
+from src.infrastructure.config.storage_config import StorageConfig
+from src.infrastructure.persistence.async_profiles_repository import AsyncProfilesRepository
 from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+from src.infrastructure.persistence.replica_router import RecentWrites
+from src.infrastructure.storage.gcs_storage import GCSStorage
+from src.infrastructure.storage.local_storage import LocalStorage
 from src.presentation.profile_controller import ProfileController
 
 
 class AppFactory:
     @staticmethod
     def create():
-        profile_repository = ProfilesRepository()
-        profile_service = ProfileService(profile_repository)
-        profile_controller = ProfileController(profile_service)
+        # Compartido para que una escritura en un repo fije al primario las
+        # lecturas del otro
+        recent_writes = RecentWrites(DatabaseConfig().read_your_writes_seconds)
+        profile_repository = ProfilesRepository(recent_writes)
+        async_profile_repository = AsyncProfilesRepository(recent_writes)
+        cache_config = CacheConfig()
+        profile_cache = None
+        if cache_config.profile_cache_size > 0:
+            profile_cache = LRUCache(cache_config.profile_cache_size, cache_config.profile_cache_ttl)
+        missing_cache = None
+        if cache_config.missing_cache_size > 0:
+            missing_cache = LRUCache(cache_config.missing_cache_size, cache_config.missing_cache_ttl)
+        shared_cache = None
+        if cache_config.redis_url:
+            shared_cache = SharedProfileCache(
+                redis.Redis.from_url(cache_config.redis_url), cache_config.shared_cache_ttl
+            )
+            local_caches = [cache for cache in (profile_cache, missing_cache) if cache is not None]
+            if local_caches:
+                shared_cache.listen(*local_caches)
+        storage_config = StorageConfig()
+        if storage_config.backend == "local":
+            storage = LocalStorage(storage_config)
+        else:
+            storage = GCSStorage(storage_config)
+        image_config = ImageConfig()
+        image_workers = None
+        upload_jobs = None
+        if image_config.workers > 0:
+            image_workers = ImageWorkers(
+                image_config.workers, image_config.max_pending, image_config.queue_timeout
+            )
+            upload_jobs = UploadJobs(
+                image_config.upload_spool_dir, ttl=image_config.upload_job_ttl
+            )
+        profile_service = AsyncProfileService(
+            profile_repository,
+            async_profile_repository,
+            profile_cache,
+            shared_cache,
+            missing_cache,
+            image_workers,
+            upload_jobs,
+            storage,
+        )
+        # Cuerpos JSON ya renderizados de la vista pública, por uuid+updated_at
+        public_body_cache = None
+        if cache_config.public_body_cache_size > 0:
+            public_body_cache = LRUCache(cache_config.public_body_cache_size, float("inf"))
+        profile_controller = ProfileController(profile_service, public_body_cache)
         return profile_controller
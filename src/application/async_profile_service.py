@@ -0,0 +1,122 @@
+import asyncio
+
+from src.application.image_processing import ImageWorkers
+from src.application.profile_service import ProfileService
+from src.application.upload_jobs import UploadJobs
+from src.infrastructure.cache.lru_cache import LRUCache
+from src.infrastructure.cache.shared_cache import SharedProfileCache
+from src.infrastructure.persistence.async_profiles_repository import AsyncProfilesRepository
+from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+from src.infrastructure.storage.storage_backend import StorageBackend
+from src.logger_config import get_logger
+
+logger = get_logger("api-profiles")
+
+
+class AsyncProfileService(ProfileService):
+    """
+    ProfileService plus awaitable variants of the I/O bound operations.
+    Validation is shared with the sync methods; only the I/O changes.
+    """
+
+    def __init__(
+        self,
+        profile_repository: ProfilesRepository,
+        async_profile_repository: AsyncProfilesRepository,
+        profile_cache: LRUCache = None,
+        shared_cache: SharedProfileCache = None,
+        missing_cache: LRUCache = None,
+        image_workers: ImageWorkers = None,
+        upload_jobs: UploadJobs = None,
+        storage: StorageBackend = None,
+    ):
+        super().__init__(
+            profile_repository,
+            profile_cache,
+            shared_cache,
+            missing_cache,
+            image_workers,
+            upload_jobs,
+            storage,
+        )
+        self.async_profile_repository = async_profile_repository
+
+    async def create_profile_async(self, profile_data: dict):
+        self._validate_new_profile(profile_data)
+
+        profile = await self.async_profile_repository.insert_profile(profile_data)
+        if not profile:
+            logger.info(f"[SERVICE] Profile already exists for this user.")
+            raise ValueError("Profile already exists for this user.")
+        self._cache_profile(profile)
+        return profile
+
+    async def get_specific_profile_async(self, uuid):
+        profile = self._cached_profile(uuid)
+        if profile:
+            return profile
+        if self._known_missing(uuid):
+            return None
+
+        # Misma clave que el camino sync: ambos comparten la consulta en vuelo
+        return await self.single_flight.do_async(
+            f"profile:{uuid}", lambda: self._load_profile_async(uuid)
+        )
+
+    async def _load_profile_async(self, uuid):
+        profile = await self.async_profile_repository.get_profile(uuid)
+        if not profile and self._confirm_on_primary(self.async_profile_repository):
+            profile = await self.async_profile_repository.get_profile(uuid, primary=True)
+        if not profile:
+            self._mark_missing(uuid)
+            return None
+        self._fill_cache(profile)
+        return profile
+
+    async def get_profile_version_async(self, uuid):
+        profile = self._cached_profile(uuid)
+        if profile:
+            return profile.updated_at
+        if self._known_missing(uuid):
+            return None
+
+        return await self.single_flight.do_async(
+            f"version:{uuid}", lambda: self._load_profile_version_async(uuid)
+        )
+
+    async def _load_profile_version_async(self, uuid):
+        updated_at = await self.async_profile_repository.get_profile_updated_at(uuid)
+        if updated_at is None and self._confirm_on_primary(self.async_profile_repository):
+            updated_at = await self.async_profile_repository.get_profile_updated_at(
+                uuid, primary=True
+            )
+        if updated_at is None:
+            self._mark_missing(uuid)
+        return updated_at
+
+    async def get_profiles_batch_async(self, uuids):
+        keys = self._batch_keys(uuids)
+        found = {
+            str(profile.uuid): profile
+            for profile in await self.async_profile_repository.get_profiles_by_uuids(keys)
+        }
+        return {key: found.get(key) for key in keys}
+
+    async def modify_profile_async(self, uuid, updates):
+        updates = self._validate_updates(updates)
+
+        profile = await self.async_profile_repository.update_profile(uuid, updates)
+        if not profile:
+            logger.warn(f"[SERVICE] Profile not found.")
+            raise ValueError("Profile not found.")
+        self._cache_profile(profile)
+        return profile
+
+    async def add_image_async(self, uuid, file):
+        # Los backends de storage son sync: la subida va a un hilo para no
+        # bloquear el event loop
+        return await asyncio.to_thread(self.add_image, uuid, file)
+
+    async def submit_image_async(self, uuid, file):
+        # Escribir el spool a disco también bloquea
+        return await asyncio.to_thread(self.submit_image, uuid, file)
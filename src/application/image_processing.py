@@ -0,0 +1,93 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from src.application.image_upload import check_dimensions
+from src.logger_config import get_logger
+
+logger = get_logger("api-profiles")
+
+# (variante, lado máximo en px), de mayor a menor: cada una sale de la anterior
+VARIANTS = (("full", 1600), ("card", 480), ("thumbnail", 128))
+# (extensión, content type, formato de Pillow, opciones del encoder)
+FORMATS = (
+    ("webp", "image/webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "image/jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+# Variante que se usa como display_image
+DISPLAY_VARIANT = ("card", "jpg")
+
+
+class ImageQueueFull(TimeoutError):
+    """Every image worker is busy and the pending queue is full."""
+
+
+def variant_key(sha256: str, variant: str, ext: str) -> str:
+    return f"images/{sha256}/{variant}.{ext}"
+
+
+def render_variants(data: bytes):
+    """
+    Decode an image once and yield (variant, ext, content_type, body) for
+    every entry of VARIANTS x FORMATS. Images are never upscaled.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        check_dimensions(original)
+        # JPEG: el decoder ya reduce por potencias de 2 hasta el tamaño mayor
+        largest = VARIANTS[0][1]
+        original.draft("RGB", (largest, largest))
+        image = _flatten(ImageOps.exif_transpose(original))
+
+    for variant, max_side in VARIANTS:
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        for ext, content_type, image_format, options in FORMATS:
+            body = io.BytesIO()
+            image.save(body, image_format, **options)
+            yield variant, ext, content_type, body.getvalue()
+
+
+def _flatten(image):
+    """RGB copy of the image; transparency goes over a white background."""
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+class ImageWorkers:
+    """
+    Bounded pool for image processing: `workers` threads and at most
+    `max_pending` jobs queued or running. When full, submit waits up to
+    `queue_timeout` seconds for a slot and then raises ImageQueueFull.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 16, queue_timeout: float = 2.0):
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="image-worker")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.queue_timeout = queue_timeout
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise ImageQueueFull("Image processing queue is full")
+        try:
+            return self._executor.submit(self._run, fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _run(self, fn, *args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            # Nadie espera el resultado: el error solo queda en el log
+            logger.error(f"[IMAGES] Image processing failed: {str(e)}")
+            raise
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,91 @@
+import hashlib
+import os
+
+from PIL import Image, UnidentifiedImageError
+
+# Límite por imagen; el del request completo es MAX_CONTENT_LENGTH (app.py)
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", 5 * 1024 * 1024))
+# Límite de píxeles: unos pocos KB comprimidos pueden ocupar GB al decodificarse
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", 40_000_000))
+# Lecturas del upload para hashearlo sin cargarlo entero en memoria
+READ_CHUNK_SIZE = 1024 * 1024
+SNIFF_BYTES = 16
+
+# (content type, extensión) según los primeros bytes del archivo
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", ("image/jpeg", ".jpg")),
+    (b"\x89PNG\r\n\x1a\n", ("image/png", ".png")),
+    (b"GIF87a", ("image/gif", ".gif")),
+    (b"GIF89a", ("image/gif", ".gif")),
+]
+IMAGE_CONTENT_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+
+class UploadedImage:
+    """A validated upload: its real type, size and SHA-256 of the content."""
+
+    def __init__(self, content_type: str, ext: str, size: int, sha256: str):
+        self.content_type = content_type
+        self.ext = ext
+        self.size = size
+        self.sha256 = sha256
+
+    @property
+    def object_key(self) -> str:
+        # Direccionado por contenido: el mismo archivo siempre cae en la misma key
+        return f"images/{self.sha256}{self.ext}"
+
+
+class ImageTooLarge(ValueError):
+    """The uploaded image exceeds MAX_IMAGE_BYTES or MAX_IMAGE_PIXELS."""
+
+
+def sniff_image(head: bytes):
+    """
+    Return (content_type, extension) from the magic bytes of an image.
+    The client's filename and Content-Type are not trusted.
+    """
+    for signature, image_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp", ".webp"
+    raise ValueError("Unsupported image type, expected JPEG, PNG, GIF or WebP")
+
+
+def check_dimensions(image):
+    """Reject an opened (not yet decoded) image with more than MAX_IMAGE_PIXELS."""
+    width, height = image.size
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ImageTooLarge(f"Image too large, max is {MAX_IMAGE_PIXELS} pixels")
+
+
+def check_image(stream):
+    """
+    Sniff the first chunk, then hash and measure the rest of an uploaded
+    image in READ_CHUNK_SIZE reads, so memory stays bounded, and check its
+    dimensions from the header. Leaves the stream at the start.
+    """
+    head = stream.read(SNIFF_BYTES)
+    content_type, ext = sniff_image(head)
+
+    digest = hashlib.sha256(head)
+    size = len(head)
+    while chunk := stream.read(READ_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_IMAGE_BYTES:
+            raise ImageTooLarge(f"Image too large, max is {MAX_IMAGE_BYTES} bytes")
+        digest.update(chunk)
+
+    stream.seek(0)
+    try:
+        # Image.open solo lee el encabezado; no decodifica los píxeles
+        with Image.open(stream) as image:
+            check_dimensions(image)
+    except Image.DecompressionBombError:
+        raise ImageTooLarge(f"Image too large, max is {MAX_IMAGE_PIXELS} pixels")
+    except UnidentifiedImageError:
+        raise ValueError("Invalid image")
+
+    stream.seek(0)
+    return UploadedImage(content_type, ext, size, digest.hexdigest())
@@ -1,20 +1,157 @@
-from google.cloud import storage
-from datetime import timedelta
-import os
+from datetime import datetime, timedelta
+import base64
+import io
+import uuid as uuid_lib
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from src.application.image_processing import (
+    DISPLAY_VARIANT,
+    ImageWorkers,
+    render_variants,
+    variant_key,
+)
+from src.application.image_upload import (
+    IMAGE_CONTENT_TYPES,
+    MAX_IMAGE_BYTES,
+    ImageTooLarge,
+    UploadedImage,
+    check_image,
+)
+from src.application.single_flight import SingleFlight
+from src.application.upload_jobs import PROCESSING, UploadJob, UploadJobs
+from src.domain.stored_image import StoredImage
+from src.infrastructure.cache.lru_cache import LRUCache
+from src.infrastructure.cache.shared_cache import SharedProfileCache
 from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+from src.infrastructure.storage.gcs_storage import GCSStorage
+from src.infrastructure.storage.storage_backend import StorageBackend
 from src.logger_config import get_logger
 
 logger = get_logger("api-profiles")
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+EXPORT_BATCH_SIZE = 1000
+MAX_BATCH_LOOKUP = 100
+MAX_BULK_CREATE = 5000
+MIN_SEARCH_LENGTH = 3
+MAX_SEARCH_LENGTH = 100
+VALID_ROLES = ["student", "teacher", "admin"]
+# Campos opcionales de un perfil nuevo: texto o null
+OPTIONAL_FIELDS = [
+    "display_name",
+    "location",
+    "birthday",
+    "gender",
+    "description",
+    "display_image",
+    "phone",
+]
+# Las variantes van bajo el hash del contenido: una key nunca cambia de contenido
+VARIANT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Vigencia de las URLs firmadas para subir directo al storage
+DIRECT_UPLOAD_EXPIRATION = timedelta(minutes=10)
+# Errores de un upload en segundo plano tal como los ve el cliente: nunca el
+# texto de la excepción, que puede traer detalles de la DB o del storage
+UPLOAD_JOB_ERRORS = [
+    (ImageTooLarge, "Image too large"),
+    (ValueError, "Invalid image"),
+]
+UPLOAD_JOB_FAILED = "Upload failed, try again"
+
 class ProfileService:
-    def __init__(self, profile_repository: ProfilesRepository):
+    def __init__(
+        self,
+        profile_repository: ProfilesRepository,
+        profile_cache: LRUCache = None,
+        shared_cache: SharedProfileCache = None,
+        missing_cache: LRUCache = None,
+        image_workers: ImageWorkers = None,
+        upload_jobs: UploadJobs = None,
+        storage: StorageBackend = None,
+    ):
         self.profile_repository = profile_repository
+        # Caches de perfiles individuales: local al proceso y compartido
+        # entre pods; None desactiva cada nivel
+        self.profile_cache = profile_cache
+        self.shared_cache = shared_cache
+        # Cache negativo (TTL corto) de UUIDs que no tienen perfil
+        self.missing_cache = missing_cache
+        # Lecturas concurrentes del mismo perfil comparten una sola consulta
+        self.single_flight = SingleFlight()
+        # Donde se guardan las imágenes (GCS salvo que se inyecte otro)
+        self.storage = storage if storage is not None else GCSStorage()
+        # Pool que genera las variantes redimensionadas; None las desactiva
+        self.image_workers = image_workers
+        # Uploads en segundo plano (202 + job); necesitan image_workers
+        self.upload_jobs = upload_jobs if image_workers is not None else None
 
     def create_profile(self, profile_data: dict):
+        self._validate_new_profile(profile_data)
+
+        # Insertar en la base de datos; ON CONFLICT decide si ya existía
+        profile = self.profile_repository.insert_profile(profile_data)
+        if not profile:
+            logger.info(f"[SERVICE] Profile already exists for this user.")
+            raise ValueError("Profile already exists for this user.")
+        self._cache_profile(profile)
+        return profile
+
+    def create_profiles(self, profiles_data: list):
+        """
+        Create many profiles in a single transaction.
+        Invalid rows and rows whose profile already exists are skipped and
+        reported by their index in the batch; the rest are inserted together.
+        """
+        if not isinstance(profiles_data, list) or not profiles_data:
+            raise ValueError("profiles must be a non-empty list")
+
+        if len(profiles_data) > MAX_BULK_CREATE:
+            logger.info(f"[SERVICE] Bulk create too large.")
+            raise ValueError(f"Too many profiles, max is {MAX_BULK_CREATE}")
+
+        errors = []
+        valid = {}  # uuid -> (index, profile_data)
+        for index, profile_data in enumerate(profiles_data):
+            try:
+                if not isinstance(profile_data, dict):
+                    raise ValueError("Profile must be an object")
+                self._validate_new_profile(profile_data)
+                profile_uuid = str(uuid_lib.UUID(str(profile_data["uuid"])))
+            except ValueError as e:
+                errors.append({"index": index, "uuid": None, "error": str(e)})
+                continue
+
+            if profile_uuid in valid:
+                errors.append({
+                    "index": index,
+                    "uuid": profile_uuid,
+                    "error": "Duplicated uuid in batch",
+                })
+                continue
+            valid[profile_uuid] = (index, {**profile_data, "uuid": profile_uuid})
+
+        created = set()
+        if valid:
+            created = self.profile_repository.insert_profiles(
+                [profile_data for _, profile_data in valid.values()]
+            )
+            self._forget_missing(created)
+
+        for profile_uuid, (index, _) in valid.items():
+            if profile_uuid not in created:
+                errors.append({
+                    "index": index,
+                    "uuid": profile_uuid,
+                    "error": "Profile already exists for this user.",
+                })
+
+        errors.sort(key=lambda error: error["index"])
+        return [u for u in valid if u in created], errors
+
+    def _validate_new_profile(self, profile_data: dict):
         # Validar campos obligatorios
         required_fields = ["uuid", "email", "role"]
         missing_fields = [
@@ -24,37 +161,246 @@ class ProfileService:
             logger.info(f"[SERVICE] Missing required fields.")
             raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
 
+        # Validar tipos: en la carga masiva un solo valor que no encaja
+        # aborta el COPY y con él todo el lote
+        for field in required_fields:
+            if not isinstance(profile_data[field], str):
+                logger.info(f"[SERVICE] Invalid field type.")
+                raise ValueError(f"Field {field} must be a string")
+        for field in OPTIONAL_FIELDS:
+            value = profile_data.get(field)
+            if value is not None and not isinstance(value, str):
+                logger.info(f"[SERVICE] Invalid field type.")
+                raise ValueError(f"Field {field} must be a string or null")
+
         # Validar roles permitidos
-        valid_roles = ["student", "teacher", "admin"]
-        if profile_data.get("role") not in valid_roles:
+        if profile_data.get("role") not in VALID_ROLES:
             logger.info(f"[SERVICE] Invalid role.")
-            raise ValueError(f"Invalid role. Must be one of: {', '.join(valid_roles)}")
+            raise ValueError(f"Invalid role. Must be one of: {', '.join(VALID_ROLES)}")
 
-        if self.profile_repository.profile_exists(profile_data["uuid"]):
-            logger.info(f"[SERVICE] Profile already exists for this user.")
-            raise ValueError("Profile already exists for this user.")
+    def get_specific_profile(self, uuid):
+        profile = self._cached_profile(uuid)
+        if profile:
+            return profile
+        if self._known_missing(uuid):
+            return None
 
-        # Insertar en la base de datos
-        return self.profile_repository.insert_profile(profile_data)
+        return self.single_flight.do(
+            f"profile:{uuid}", lambda: self._load_profile(uuid)
+        )
 
-    def get_specific_profile(self, uuid):
+    def _load_profile(self, uuid):
         profile = self.profile_repository.get_profile(uuid)
+        if not profile and self._confirm_on_primary(self.profile_repository):
+            profile = self.profile_repository.get_profile(uuid, primary=True)
         if not profile:
+            self._mark_missing(uuid)
             return None
+        self._fill_cache(profile)
         return profile
+
+    def get_profile_version(self, uuid):
+        """
+        updated_at of a profile (None if it does not exist), used to answer
+        conditional requests. Served from the cache when possible.
+        """
+        profile = self._cached_profile(uuid)
+        if profile:
+            return profile.updated_at
+        if self._known_missing(uuid):
+            return None
+
+        return self.single_flight.do(
+            f"version:{uuid}", lambda: self._load_profile_version(uuid)
+        )
+
+    def _load_profile_version(self, uuid):
+        updated_at = self.profile_repository.get_profile_updated_at(uuid)
+        if updated_at is None and self._confirm_on_primary(self.profile_repository):
+            updated_at = self.profile_repository.get_profile_updated_at(uuid, primary=True)
+        if updated_at is None:
+            self._mark_missing(uuid)
+        return updated_at
+
+    def _cached_profile(self, uuid):
+        if self.profile_cache is not None:
+            profile = self.profile_cache.get(uuid)
+            if profile:
+                return profile
+
+        if self.shared_cache is not None:
+            profile = self.shared_cache.get(uuid)
+            if profile and self.profile_cache is not None:
+                self.profile_cache.fill(uuid, profile)
+            return profile
+        return None
+
+    def _known_missing(self, uuid) -> bool:
+        return self.missing_cache is not None and self.missing_cache.get(uuid) is not None
+
+    def _confirm_on_primary(self, repository) -> bool:
+        """
+        Whether a miss must be re-read on the primary before it is
+        negative-cached: a lagging replica may not have a new profile yet.
+        """
+        return self.missing_cache is not None and bool(repository.replicas)
+
+    def _mark_missing(self, uuid):
+        if self.missing_cache is not None:
+            self.missing_cache.set(uuid, True)
+
+    def _forget_missing(self, uuids):
+        """Drop created profiles from the negative cache of every pod."""
+        if self.missing_cache is not None:
+            for uuid in uuids:
+                self.missing_cache.delete(uuid)
+        if self.shared_cache is not None and uuids:
+            self.shared_cache.invalidate(uuids)
+
+    def _fill_cache(self, profile):
+        """
+        Cache a profile just read from the DB. Fills never overwrite: an
+        update that finished during the read already cached a newer value.
+        """
+        if self.profile_cache is not None:
+            self.profile_cache.fill(profile.uuid, profile)
+        if self.shared_cache is not None:
+            self.shared_cache.fill(profile)
+
+    def _cache_profile(self, profile):
+        """Write a created/updated profile through every cache level."""
+        if self.missing_cache is not None:
+            self.missing_cache.delete(profile.uuid)
+        if self.profile_cache is not None:
+            self.profile_cache.set(profile.uuid, profile)
+        if self.shared_cache is not None:
+            self.shared_cache.set(profile)
     
-    def get_all_profiles(self):
-        profiles = self.profile_repository.get_profiles()
+    def get_profiles_batch(self, uuids):
+        """
+        Resolve many profiles with a single query.
+        Returns a dict keyed by UUID; unknown UUIDs map to None.
+        """
+        keys = self._batch_keys(uuids)
+        found = {
+            str(profile.uuid): profile
+            for profile in self.profile_repository.get_profiles_by_uuids(keys)
+        }
+        return {key: found.get(key) for key in keys}
+
+    def _batch_keys(self, uuids):
+        """Validate a batch lookup and return its normalized, unique UUIDs."""
+        if not isinstance(uuids, list) or not uuids:
+            raise ValueError("uuids must be a non-empty list")
+
+        if len(uuids) > MAX_BATCH_LOOKUP:
+            logger.info(f"[SERVICE] Batch lookup too large.")
+            raise ValueError(f"Too many uuids, max is {MAX_BATCH_LOOKUP}")
+
+        try:
+            # dict.fromkeys: sin duplicados y respetando el orden pedido
+            return list(dict.fromkeys(str(uuid_lib.UUID(str(u))) for u in uuids))
+        except ValueError:
+            raise ValueError("uuids must contain valid UUIDs")
+
+    def get_all_profiles(self, limit=DEFAULT_PAGE_SIZE, after=None):
+        """
+        Return one page of profiles and the cursor of the next page
+        (None when this is the last one).
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        after_key = self._decode_cursor(after) if after else None
+
+        # Pedimos uno de más para saber si hay otra página
+        profiles = self.profile_repository.get_profiles(limit + 1, after_key)
         if not profiles:
-            return []
-        return profiles
+            return [], None
+
+        if len(profiles) <= limit:
+            return profiles, None
+
+        profiles = profiles[:limit]
+        return profiles, self._encode_cursor(profiles[-1])
+
+    def search_profiles(self, q, role=None, limit=DEFAULT_PAGE_SIZE, after=None):
+        """
+        Search profiles by name, location or email prefix, best matches first.
+        Returns one page and the cursor of the next one, like get_all_profiles.
+        """
+        q = (q or "").strip()
+        if not MIN_SEARCH_LENGTH <= len(q) <= MAX_SEARCH_LENGTH:
+            logger.info(f"[SERVICE] Invalid search query.")
+            raise ValueError(
+                f"q must have between {MIN_SEARCH_LENGTH} and {MAX_SEARCH_LENGTH} characters"
+            )
+
+        if role and role not in VALID_ROLES:
+            logger.info(f"[SERVICE] Invalid role.")
+            raise ValueError(f"Invalid role. Must be one of: {', '.join(VALID_ROLES)}")
+
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        after_key = self._decode_search_cursor(after) if after else None
+
+        results = self.profile_repository.search_profiles(q, role or None, limit + 1, after_key)
+        if len(results) <= limit:
+            return [profile for profile, _ in results], None
+
+        results = results[:limit]
+        profile, score = results[-1]
+        return [profile for profile, _ in results], self._encode_search_cursor(score, profile.uuid)
+
+    def export_profiles(self, batch_size=EXPORT_BATCH_SIZE):
+        """Lazily yield every profile, fetched from the DB in batches."""
+        return self.profile_repository.iter_profiles(batch_size)
+
+    def _encode_cursor(self, profile):
+        key = f"{profile.created_at.isoformat()},{profile.uuid}"
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor: str):
+        """Accepts an opaque cursor (created_at,uuid) or a bare profile UUID."""
+        try:
+            return str(uuid_lib.UUID(cursor))
+        except ValueError:
+            pass
+
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, profile_uuid = (
+                base64.urlsafe_b64decode(padded).decode().split(",", 1)
+            )
+            return datetime.fromisoformat(created_at), str(uuid_lib.UUID(profile_uuid))
+        except (ValueError, UnicodeDecodeError):
+            logger.info(f"[SERVICE] Invalid pagination cursor.")
+            raise ValueError("Invalid pagination cursor")
+
+    def _encode_search_cursor(self, score, profile_uuid):
+        # repr() conserva el float exacto para que el keyset no repita filas
+        key = f"{score!r},{profile_uuid}"
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+    def _decode_search_cursor(self, cursor: str):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            score, profile_uuid = base64.urlsafe_b64decode(padded).decode().split(",", 1)
+            return float(score), str(uuid_lib.UUID(profile_uuid))
+        except (ValueError, UnicodeDecodeError):
+            logger.info(f"[SERVICE] Invalid search cursor.")
+            raise ValueError("Invalid pagination cursor")
 
     def modify_profile(self, uuid, updates):
-        # Validar que el perfil exista
-        if not self.profile_repository.profile_exists(uuid):
+        updates = self._validate_updates(updates)
+
+        # UPDATE ... RETURNING decide si el perfil existe
+        profile = self.profile_repository.update_profile(uuid, updates)
+        if not profile:
             logger.warn(f"[SERVICE] Profile not found.")
             raise ValueError("Profile not found.")
+        self._cache_profile(profile)
+        return profile
 
+    def _validate_updates(self, updates: dict) -> dict:
+        """Reject protected fields and drop the ones that cannot be modified."""
         # Campos permitidos para modificación
         allowed_fields = [
             "display_name",
@@ -80,30 +426,209 @@ class ProfileService:
             logger.warn(f"[SERVICE] Cannot modify protected field: {field}.")
             raise ValueError("No valid fields to update")
 
-        return self.profile_repository.update_profile(uuid, updates)
+        # Las variantes son de la imagen anterior: no deben seguir apuntando a ella
+        if "display_image" in updates:
+            updates["image_variants"] = None
+
+        return updates
 
     def add_image(self, uuid, file):
-        """Save the image to GCP."""
-        bucket = self._get_gcp_bucket()
-        ext = os.path.splitext(file.filename)[1]  # Extract extension (.jpg, .png, etc.)
-        filename = f"{uuid}{ext}"
-        blob = bucket.blob(filename)
-        blob.upload_from_file(file, content_type=file.content_type)
-        url = blob.generate_signed_url(
-            version="v4",
-            expiration=timedelta(minutes=15),
-            method="GET",
+        """
+        Save the image to the storage backend. The type comes from its
+        magic bytes. Objects are keyed by content hash: a repeated upload
+        is not stored again.
+        """
+        uuid = self._profile_uuid(uuid)
+        # Validar antes de abrir la subida: tipo real, tamaño y hash
+        image = check_image(file.stream)
+        stored = self._store_original(image, file.stream)
+        self._attach_image(uuid, stored, file.stream, background=True)
+        return self._signed_url(stored.object_key)
+
+    def _store_original(self, image: UploadedImage, stream=None, staged_key=None) -> StoredImage:
+        """
+        The stored object for this content. If it is new it is written from
+        `stream`, or copied inside the storage from `staged_key`.
+        """
+        stored = self.profile_repository.get_stored_image(image.sha256)
+        if stored:
+            logger.info(f"[SERVICE] Image already stored, skipping upload.")
+            return stored
+
+        if staged_key is not None:
+            self.storage.copy(staged_key, image.object_key)
+        else:
+            self.storage.put(image.object_key, stream, image.size, image.content_type)
+        return self.profile_repository.insert_stored_image(
+            image.sha256, image.object_key, image.content_type, image.size
         )
-        return url
-
-    def _get_gcp_bucket(self):
-        # Reconstruct JSON file from environment variable:
-        credentials_json = os.getenv('GOOGLE_CREDENTIALS_JSON')
-        json_path = '/tmp/gcs-key.json'
-        with open(json_path, 'w') as f:
-            f.write(credentials_json)
-
-        # Initialize GCS:
-        storage_client = storage.Client.from_service_account_json(json_path)
-        bucket = storage_client.bucket(os.getenv('GCS_BUCKET_NAME'))
-        return bucket
+
+    def _signed_url(self, object_key):
+        return self.storage.signed_url(object_key, timedelta(minutes=15))
+
+    def _attach_image(self, uuid, stored: StoredImage, stream, background: bool):
+        """
+        Point the profile at the variants of `stored`, rendering them first
+        (on the image workers if `background`) when this content is new.
+        """
+        if not self.storage.public_reads:
+            # Bucket privado: una URL permanente daría 403, el cliente usa la firmada
+            logger.info(f"[SERVICE] Storage is not public, profile images not updated.")
+            return None
+        if stored.variants:
+            # Contenido ya procesado: ni se sube ni se vuelve a renderizar
+            return self._set_profile_images(uuid, stored.variants)
+        if background and self.image_workers is None:
+            return None
+
+        # Ya validada y acotada por MAX_IMAGE_BYTES: se procesa en memoria
+        stream.seek(0)
+        data = stream.read()
+        if background:
+            return self.image_workers.submit(self._process_image, uuid, stored.sha256, data)
+        return self._process_image(uuid, stored.sha256, data)
+
+    def create_direct_upload(self, uuid, content_type, size):
+        """
+        Signed URL for the client to PUT an image straight to storage.
+        Returns (key, url, headers); the client sends `headers` with the
+        PUT and then calls complete_direct_upload with the key.
+        """
+        uuid = self._profile_uuid(uuid)
+        if content_type not in IMAGE_CONTENT_TYPES:
+            raise ValueError("Unsupported image type, expected JPEG, PNG, GIF or WebP")
+        if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+            raise ValueError("size must be a positive integer")
+        if size > MAX_IMAGE_BYTES:
+            raise ImageTooLarge(f"Image too large, max is {MAX_IMAGE_BYTES} bytes")
+        if not self.profile_repository.profile_exists(uuid):
+            raise ValueError("Profile not found.")
+
+        # Key temporal: el hash del contenido recién se conoce al completar
+        key = f"uploads/{uuid}/{uuid_lib.uuid4().hex}"
+        url, headers = self.storage.signed_upload_url(
+            key, content_type, size, DIRECT_UPLOAD_EXPIRATION
+        )
+        return key, url, headers
+
+    def complete_direct_upload(self, uuid, key):
+        """
+        Validate an image uploaded with create_direct_upload, move it to its
+        content-addressed key and point the profile at it. The staged
+        object is deleted once it is stored or rejected; after a storage
+        or DB error it is kept so the client can retry. Returns a signed
+        URL of the image.
+        """
+        uuid = self._profile_uuid(uuid)
+        if not isinstance(key, str) or not key.startswith(f"uploads/{uuid}/") or ".." in key:
+            raise ValueError("Invalid upload key")
+
+        with self.storage.stream(key) as stream:
+            # Un byte más que el máximo alcanza para detectar un objeto grande
+            data = stream.read(MAX_IMAGE_BYTES + 1)
+        try:
+            image = check_image(io.BytesIO(data))
+        except ValueError:
+            # Contenido inválido o demasiado grande: reintentar no lo arregla
+            self.storage.delete(key)
+            raise
+        stored = self._store_original(image, staged_key=key)
+        self.storage.delete(key)
+
+        if self.storage.public_reads and (stored.variants or self.image_workers is None):
+            # El perfil se actualiza en este request: se puede responder 404
+            if stored.variants:
+                profile = self._set_profile_images(uuid, stored.variants)
+            else:
+                # Sin variantes el perfil apunta al original
+                profile = self.profile_repository.update_profile(
+                    uuid,
+                    {"display_image": self.storage.public_url(stored.object_key), "image_variants": None},
+                )
+                if profile:
+                    self._cache_profile(profile)
+            if not profile:
+                logger.warn(f"[SERVICE] Profile not found.")
+                raise ValueError("Profile not found.")
+        else:
+            self._attach_image(uuid, stored, io.BytesIO(data), background=True)
+        return self._signed_url(stored.object_key)
+
+    def _profile_uuid(self, uuid) -> str:
+        # Antes que cualquier consulta: un uuid inválido sería un DataError (500)
+        try:
+            return str(uuid_lib.UUID(str(uuid)))
+        except ValueError:
+            raise ValueError("uuid must be a valid UUID")
+
+    def accepts_background_uploads(self) -> bool:
+        return self.upload_jobs is not None
+
+    def submit_image(self, uuid, file) -> UploadJob:
+        """
+        Validate the image, spool it to local disk and upload it on the
+        image workers. Returns the job to poll with get_upload_job.
+        """
+        uuid = self._profile_uuid(uuid)
+        if self.upload_jobs is None:
+            raise ValueError("Background uploads are disabled")
+        image = check_image(file.stream)
+
+        job = self.upload_jobs.create(uuid)
+        try:
+            file.save(self.upload_jobs.spool_path(job))
+            self.image_workers.submit(self._run_upload_job, job, image)
+        except BaseException:
+            self.upload_jobs.discard(job)
+            raise
+        return job
+
+    def _run_upload_job(self, job: UploadJob, image: UploadedImage):
+        job.status = PROCESSING
+        try:
+            with open(self.upload_jobs.spool_path(job), "rb") as stream:
+                stored = self._store_original(image, stream)
+                # Ya estamos en un worker: las variantes se generan acá mismo
+                self._attach_image(job.uuid, stored, stream, background=False)
+            url = self._signed_url(stored.object_key)
+        except Exception as e:
+            # El detalle queda en el log: ImageWorkers registra la excepción
+            job.finish(error=self._upload_job_error(e))
+            raise
+        finally:
+            self.upload_jobs.remove_spool(job)
+        job.finish(url=url)
+
+    def _upload_job_error(self, error: Exception) -> str:
+        for error_type, message in UPLOAD_JOB_ERRORS:
+            if isinstance(error, error_type):
+                return message
+        return UPLOAD_JOB_FAILED
+
+    def get_upload_job(self, job_id: str):
+        if self.upload_jobs is None:
+            return None
+        return self.upload_jobs.get(job_id)
+
+    def _process_image(self, uuid, sha256: str, data: bytes):
+        """
+        Render the variants of an image, store them next to the original
+        and point the profile at them.
+        """
+        variants = {}
+        for variant, ext, content_type, body in render_variants(data):
+            key = variant_key(sha256, variant, ext)
+            self.storage.put(key, io.BytesIO(body), len(body), content_type, VARIANT_CACHE_CONTROL)
+            variants.setdefault(variant, {})[ext] = self.storage.public_url(key)
+
+        self.profile_repository.set_stored_image_variants(sha256, variants)
+        return self._set_profile_images(uuid, variants)
+
+    def _set_profile_images(self, uuid, variants: dict):
+        variant, ext = DISPLAY_VARIANT
+        profile = self.profile_repository.set_profile_images(uuid, variants[variant][ext], variants)
+        if not profile:
+            logger.warn(f"[SERVICE] Profile not found for processed image.")
+            return None
+        self._cache_profile(profile)
+        return profile
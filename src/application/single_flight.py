@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from src import deadline
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one: the first caller
+    runs the function and every caller that arrives while it is in flight
+    gets the same result (or exception).
+
+    In-flight calls are concurrent.futures.Future objects, so sync callers
+    (threads) and async callers (each on its own event loop) share them.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        """Return (future, is_leader) for `key`."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.executed += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        with self._lock:
+            del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                return future.result(timeout=deadline.check())
+            except TimeoutError:
+                # El líder pudo fallar con su propio TimeoutError: se propaga tal cual
+                if future.done():
+                    raise
+                raise deadline.DeadlineExceeded("Request deadline exceeded")
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key, coro_fn):
+        future, leader = self._join(key)
+        if not leader:
+            # shield: si este pedido vence, no cancela la llamada compartida
+            waiter = asyncio.shield(asyncio.wrap_future(future))
+            try:
+                return await asyncio.wait_for(waiter, deadline.check())
+            except TimeoutError:
+                if future.done():
+                    raise
+                raise deadline.DeadlineExceeded("Request deadline exceeded")
+
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import uuid as uuid_lib
+from datetime import datetime, timezone
+
+from src.infrastructure.cache.lru_cache import LRUCache
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class UploadJob:
+    def __init__(self, profile_uuid: str):
+        self.id = uuid_lib.uuid4().hex
+        self.uuid = profile_uuid
+        self.status = PENDING
+        self.url = None
+        self.error = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def finish(self, url=None, error=None):
+        self.url = url
+        self.error = error
+        self.status = FAILED if error else DONE
+        self.finished_at = datetime.now(timezone.utc)
+
+
+class UploadJobs:
+    """
+    Background image uploads: the request spools the file to local disk
+    and returns a job; a worker uploads it and updates the job.
+
+    Jobs live in memory for `ttl` seconds, so a job is only visible on the
+    pod that accepted the upload.
+    """
+
+    def __init__(self, spool_dir: str = None, max_jobs: int = 10000, ttl: float = 900.0):
+        self.spool_dir = spool_dir or os.path.join(tempfile.gettempdir(), "profile-uploads")
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._jobs = LRUCache(max_jobs, ttl)
+
+    def create(self, profile_uuid: str) -> UploadJob:
+        job = UploadJob(profile_uuid)
+        self._jobs.set(job.id, job)
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def discard(self, job: UploadJob):
+        self._jobs.delete(job.id)
+        self.remove_spool(job)
+
+    def spool_path(self, job: UploadJob) -> str:
+        return os.path.join(self.spool_dir, f"{job.id}.upload")
+
+    def remove_spool(self, job: UploadJob):
+        try:
+            os.remove(self.spool_path(job))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        return self._jobs.stats()
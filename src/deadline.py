@@ -0,0 +1,65 @@
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Instante (time.monotonic) en el que vence el request actual, o None
+_deadline = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request ran out of time budget."""
+
+
+def request_budget() -> float:
+    """Seconds a request may spend before it is answered with a 503."""
+    return float(os.environ.get("REQUEST_DEADLINE_SECONDS", 10))
+
+
+def remaining():
+    """Seconds left in the current deadline, or None when there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check():
+    """Raise DeadlineExceeded if the current deadline already expired."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Run the block under a deadline `seconds` from now (or sooner if nested)."""
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def with_deadline(view):
+    """Flask view decorator: the view and everything it calls share one budget."""
+    if inspect.iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            with deadline(request_budget()):
+                return await view(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with deadline(request_budget()):
+            return view(*args, **kwargs)
+
+    return wrapper
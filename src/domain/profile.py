@@ -11,6 +11,9 @@ class Profile:
         gender: str = None,
         description: str = None,
         display_image: str = None,
+        created_at=None,
+        updated_at=None,
+        image_variants: dict = None,
     ):
         self.uuid = uuid
         self.email = email
@@ -22,4 +25,7 @@ class Profile:
         self.gender = gender
         self.description = description
         self.display_image = display_image
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.image_variants = image_variants
         return
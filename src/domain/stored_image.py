@@ -0,0 +1,17 @@
+class StoredImage:
+    def __init__(
+        self,
+        sha256: str,
+        object_key: str,
+        content_type: str,
+        size: int,
+        variants: dict = None,
+        created_at=None,
+    ):
+        self.sha256 = sha256
+        self.object_key = object_key
+        self.content_type = content_type
+        self.size = size
+        self.variants = variants
+        self.created_at = created_at
+        return
@@ -1,7 +1,9 @@
 PROFILE_CREATED = "Profile created successfully"
+PROFILES_CREATED = "Bulk profile creation processed"
 PROFILE_NOT_FOUND = "Profile not found"
 BAD_REQUEST = "Bad request error"
 SERVER_ERROR = "Internal server error"
+SERVICE_UNAVAILABLE = "Service temporarily unavailable"
 PROFILE_ALREADY_EXISTS = "Profile already exists for this user"
 PROFILE_NOT_FOUND = "Profile not found"
 PROFILE_UPDATED = "Profile updated successfully"
@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+import uuid as uuid_lib
+from datetime import datetime
+
+import redis
+
+from src.domain.profile import Profile
+from src.infrastructure.cache.lru_cache import LRUCache
+from src.logger_config import get_logger
+
+logger = get_logger("api-profiles")
+
+INVALIDATION_CHANNEL = "profiles:invalidate"
+# Fallas de Redis o de (de)serialización: se loguean y cuentan como miss
+CACHE_ERRORS = (redis.RedisError, TypeError, ValueError)
+
+
+def _profile_key(uuid) -> str:
+    return f"profiles:{uuid}"
+
+
+def _dumps(profile: Profile) -> str:
+    data = {
+        field: value.isoformat() if isinstance(value, datetime) else value
+        for field, value in vars(profile).items()
+    }
+    # uuid.UUID, date, Decimal... tal como los devuelve psycopg
+    return json.dumps(data, default=str)
+
+
+def _loads(payload) -> Profile:
+    data = json.loads(payload)
+    for field in ("created_at", "updated_at"):
+        if data.get(field):
+            data[field] = datetime.fromisoformat(data[field])
+    return Profile(**data)
+
+
+def _clear(local_caches):
+    for local_cache in local_caches:
+        local_cache.clear()
+
+
+class SharedProfileCache:
+    """
+    Profile cache shared by every pod, over the Redis protocol (any client
+    with the redis-py API works, e.g. fakeredis in tests).
+
+    Writes go through it and are broadcast on a pub/sub channel so the
+    other pods drop their in-process copy. Redis and encoding errors are
+    logged and treated as misses: the cache never fails a request.
+    """
+
+    def __init__(self, client, ttl: float = 300.0, channel: str = INVALIDATION_CHANNEL):
+        self.client = client
+        self.ttl = ttl
+        self.channel = channel
+        # Identifica a este pod para ignorar sus propias invalidaciones
+        self.origin = uuid_lib.uuid4().hex
+        self._listener = None
+        self._retry = None
+        self._closed = threading.Event()
+
+    def get(self, uuid):
+        try:
+            payload = self.client.get(_profile_key(uuid))
+            return _loads(payload) if payload else None
+        except CACHE_ERRORS as e:
+            logger.warning(f"[CACHE] Shared cache get failed: {str(e)}")
+            return None
+
+    def set(self, profile: Profile):
+        """Write-through after a create/update, then tell the other pods."""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(_profile_key(profile.uuid), _dumps(profile), px=int(self.ttl * 1000))
+            pipe.publish(self.channel, f"{self.origin} {profile.uuid}")
+            pipe.execute()
+        except CACHE_ERRORS as e:
+            logger.warning(f"[CACHE] Shared cache set failed: {str(e)}")
+
+    def fill(self, profile: Profile):
+        """
+        Store a profile read from the DB. NX: a fill never overwrites a
+        value written through by a concurrent update.
+        """
+        try:
+            self.client.set(
+                _profile_key(profile.uuid), _dumps(profile), px=int(self.ttl * 1000), nx=True
+            )
+        except CACHE_ERRORS as e:
+            logger.warning(f"[CACHE] Shared cache fill failed: {str(e)}")
+
+    def invalidate(self, uuids):
+        """Tell the other pods that these profiles changed (e.g. bulk creates)."""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for uuid in uuids:
+                pipe.publish(self.channel, f"{self.origin} {uuid}")
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"[CACHE] Shared cache invalidate failed: {str(e)}")
+
+    def listen(self, *local_caches: LRUCache, retry_interval: float = 1.0):
+        """
+        Drop from `local_caches` every profile written by another pod. If
+        the subscription breaks, invalidations may have been missed, so the
+        local caches are cleared. If it cannot start, it is retried every
+        `retry_interval` seconds in the background, and the local caches
+        are cleared on every attempt until it succeeds.
+        """
+        if not self._subscribe(local_caches):
+            self._retry = threading.Thread(
+                target=self._resubscribe,
+                args=(local_caches, retry_interval),
+                name="cache-invalidation-retry",
+                daemon=True,
+            )
+            self._retry.start()
+        return self._listener
+
+    def _subscribe(self, local_caches) -> bool:
+        def on_message(message):
+            origin, _, uuid = message["data"].decode().partition(" ")
+            if origin != self.origin:
+                for local_cache in local_caches:
+                    local_cache.delete(uuid)
+
+        def on_error(error, pubsub, thread):
+            logger.warning(f"[CACHE] Invalidation listener error: {str(error)}")
+            _clear(local_caches)
+            time.sleep(1)
+
+        try:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: on_message})
+        except redis.RedisError as e:
+            logger.error(f"[CACHE] Could not subscribe to invalidations: {str(e)}")
+            return False
+
+        self._listener = pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=on_error
+        )
+        return True
+
+    def _resubscribe(self, local_caches, retry_interval: float):
+        # Sin suscripción no llegan invalidaciones: nada local puede durar
+        while not self._closed.wait(retry_interval):
+            _clear(local_caches)
+            if self._subscribe(local_caches):
+                # Lo escrito por otros pods mientras tanto tampoco se invalidó
+                _clear(local_caches)
+                logger.info(f"[CACHE] Subscribed to invalidations.")
+                if self._closed.is_set():
+                    self.close()
+                return
+
+    def close(self):
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
@@ -0,0 +1,28 @@
+import os
+
+
+class CacheConfig:
+    profile_cache_size: int
+    profile_cache_ttl: float
+    public_body_cache_size: int
+    missing_cache_size: int
+    missing_cache_ttl: float
+    redis_url: str
+    shared_cache_ttl: float
+
+    """
+    In-process cache of single profile lookups (GET /profiles/<uuid>).
+    A size of 0 disables it (same for the rendered public view cache and
+    the negative cache of UUIDs without a profile).
+    Shared cache: Redis tier used by every pod; disabled when REDIS_URL is unset.
+    """
+
+    def __init__(self):
+        self.profile_cache_size = int(os.environ.get("PROFILE_CACHE_SIZE", 10000))
+        self.profile_cache_ttl = float(os.environ.get("PROFILE_CACHE_TTL_SECONDS", 60))
+        self.public_body_cache_size = int(os.environ.get("PUBLIC_PROFILE_BODY_CACHE_SIZE", 10000))
+        self.missing_cache_size = int(os.environ.get("PROFILE_MISSING_CACHE_SIZE", 10000))
+        self.missing_cache_ttl = float(os.environ.get("PROFILE_MISSING_CACHE_TTL_SECONDS", 5))
+
+        self.redis_url = os.environ.get("REDIS_URL")
+        self.shared_cache_ttl = float(os.environ.get("PROFILE_SHARED_CACHE_TTL_SECONDS", 300))
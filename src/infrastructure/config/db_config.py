@@ -1,3 +1,4 @@
+import math
 import os
 
 from src.logger_config import get_logger
@@ -9,6 +10,19 @@ class DatabaseConfig:
     database: str
     user: str
     password: str
+    pool_min_size: int
+    pool_max_size: int
+    pool_timeout: float
+    pool_max_lifetime: float
+    pool_check_idle: float
+    connect_timeout: float
+    statement_timeout_ms: int
+    replica_dsns: list
+    replica_eject_seconds: float
+    replica_connect_timeout: float
+    read_your_writes_seconds: float
+    slow_query_ms: float
+    explain_sample_rate: float
 
     """
     Order of precedence of variables:
@@ -23,6 +37,44 @@ class DatabaseConfig:
         self.password = os.environ.get("DB_PASSWORD")
         self.port = os.environ.get("DB_PORT")
 
+        # Connection pool
+        self.pool_min_size = int(os.environ.get("DB_POOL_MIN_SIZE", 1))
+        self.pool_max_size = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+        self.pool_timeout = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+        self.pool_max_lifetime = float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600))
+        self.pool_check_idle = float(os.environ.get("DB_POOL_CHECK_IDLE", 30))
+        self.connect_timeout = float(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+
+        # Timeouts de cada sesión; un request con menos presupuesto los baja
+        self.statement_timeout_ms = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 5000))
+
+        # Read replicas: comma separated DSNs, reads fall back to the primary
+        self.replica_dsns = [
+            dsn.strip()
+            for dsn in os.environ.get("DB_REPLICA_DSNS", "").split(",")
+            if dsn.strip()
+        ]
+        self.replica_eject_seconds = float(os.environ.get("DB_REPLICA_EJECT_SECONDS", 30))
+        # Lo que se espera a una réplica (conexión nueva o checkout) antes de expulsarla
+        self.replica_connect_timeout = min(
+            float(os.environ.get("DB_REPLICA_CONNECT_TIMEOUT", 2)), self.pool_timeout
+        )
+        self.read_your_writes_seconds = float(os.environ.get("DB_READ_YOUR_WRITES_SECONDS", 5))
+
+        # Query instrumentation: slow queries are logged, and a sample of the
+        # slow SELECTs also logs its EXPLAIN (ANALYZE, BUFFERS) plan
+        self.slow_query_ms = float(os.environ.get("DB_SLOW_QUERY_MS", 200))
+        self.explain_sample_rate = float(os.environ.get("DB_EXPLAIN_SAMPLE_RATE", 0))
+
+    def connection_kwargs(self, connect_timeout: float) -> dict:
+        """Arguments of every pooled connection besides the DSN."""
+        timeout = self.statement_timeout_ms
+        return {
+            "autocommit": True,
+            "connect_timeout": math.ceil(connect_timeout),
+            "options": f"-c statement_timeout={timeout} -c lock_timeout={timeout}",
+        }
+
     @property
     def connection_strings(self) -> str:
         connection_strings = f"dbname={self.database} user={self.user} host={self.host} password={self.password} port={self.port}"
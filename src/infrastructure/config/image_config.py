@@ -0,0 +1,23 @@
+import os
+
+
+class ImageConfig:
+    workers: int
+    max_pending: int
+    queue_timeout: float
+    upload_spool_dir: str
+    upload_job_ttl: float
+
+    """
+    Background pool that renders the resized variants of uploaded images.
+    IMAGE_WORKERS=0 disables it: only the original upload is stored.
+    Background uploads (Prefer: respond-async) spool files to
+    UPLOAD_SPOOL_DIR and run on the same pool.
+    """
+
+    def __init__(self):
+        self.workers = int(os.environ.get("IMAGE_WORKERS", 2))
+        self.max_pending = int(os.environ.get("IMAGE_MAX_PENDING", 16))
+        self.queue_timeout = float(os.environ.get("IMAGE_QUEUE_TIMEOUT_SECONDS", 2))
+        self.upload_spool_dir = os.environ.get("UPLOAD_SPOOL_DIR")
+        self.upload_job_ttl = float(os.environ.get("UPLOAD_JOB_TTL_SECONDS", 900))
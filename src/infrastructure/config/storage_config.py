@@ -0,0 +1,24 @@
+import os
+
+
+class StorageConfig:
+    backend: str
+    gcs_bucket_name: str
+    gcs_credentials_json: str
+    gcs_public_bucket: bool
+    local_dir: str
+    local_base_url: str
+
+    """
+    Where uploaded images are stored: "gcs" (default) or "local".
+    The local backend writes under STORAGE_LOCAL_DIR and is served by this
+    service at /storage/<key>; it is meant for development and benchmarks.
+    """
+
+    def __init__(self):
+        self.backend = os.environ.get("STORAGE_BACKEND", "gcs")
+        self.gcs_bucket_name = os.environ.get("GCS_BUCKET_NAME")
+        self.gcs_credentials_json = os.environ.get("GOOGLE_CREDENTIALS_JSON")
+        self.gcs_public_bucket = os.environ.get("GCS_PUBLIC_BUCKET", "false").lower() == "true"
+        self.local_dir = os.environ.get("STORAGE_LOCAL_DIR", "storage")
+        self.local_base_url = os.environ.get("STORAGE_LOCAL_BASE_URL", "/storage")
@@ -0,0 +1,193 @@
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+
+import psycopg
+from src import deadline
+from src.infrastructure.config.db_config import DatabaseConfig
+from src.infrastructure.persistence.base_entity import (
+    RESET_TIMEOUTS,
+    SET_TIMEOUTS,
+    deadline_timeout,
+)
+from src.infrastructure.persistence.connection_pool import AsyncConnectionPool, PoolTimeout
+from src.infrastructure.persistence.query_metrics import (
+    log_slow_query,
+    pool_wait_ms,
+    query_metrics,
+    returned_rows,
+    should_explain,
+)
+from src.infrastructure.persistence.replica_router import RecentWrites, ReplicaRouter
+from src.logger_config import get_logger
+
+logger = get_logger("api-profiles")
+
+
+def on_db_loop(method):
+    """
+    Run a repository coroutine on the entity's own event loop, so it can be
+    awaited from any other loop (e.g. the one Flask creates per async view)
+    while every query shares the same async pool.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self.run(method(self, *args, **kwargs))
+
+    return wrapper
+
+
+class AsyncBaseEntity:
+
+    def __init__(self, config: DatabaseConfig = None, recent_writes: RecentWrites = None):
+        self.config = config or DatabaseConfig()
+        self._shortened = weakref.WeakSet()
+        self.pool = AsyncConnectionPool(
+            self.config.connection_strings,
+            kwargs=self.config.connection_kwargs(self.config.connect_timeout),
+            min_size=self.config.pool_min_size,
+            max_size=self.config.pool_max_size,
+            timeout=self.config.pool_timeout,
+            max_lifetime=self.config.pool_max_lifetime,
+            check_idle=self.config.pool_check_idle,
+            reset=self._reset_timeouts,
+            name="async-primary",
+        )
+        self.replicas = [
+            AsyncConnectionPool(
+                dsn,
+                kwargs=self.config.connection_kwargs(self.config.replica_connect_timeout),
+                min_size=0,
+                max_size=self.config.pool_max_size,
+                timeout=self.config.pool_timeout,
+                max_lifetime=self.config.pool_max_lifetime,
+                check_idle=self.config.pool_check_idle,
+                reset=self._reset_timeouts,
+                name=f"async-replica-{index}",
+            )
+            for index, dsn in enumerate(self.config.replica_dsns)
+        ]
+        self.router = ReplicaRouter(len(self.replicas), self.config.replica_eject_seconds)
+        if recent_writes is None:
+            recent_writes = RecentWrites(self.config.read_your_writes_seconds)
+        self.recent_writes = recent_writes
+        self.metrics = query_metrics
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a pooled async primary connection for a single operation."""
+        started = time.perf_counter()
+        async with self.pool.connection(self._acquire_timeout()) as conn:
+            pool_wait_ms.set((time.perf_counter() - started) * 1000)
+            await self._apply_deadline(conn)
+            yield conn
+
+    @asynccontextmanager
+    async def read_connection(self, keys=(), primary: bool = False):
+        """Async counterpart of BaseEntity.read_connection."""
+        started = time.perf_counter()
+        if not primary and not self.recent_writes.any(keys):
+            for index in self.router.candidates():
+                replica = self.replicas[index]
+                try:
+                    conn = await replica.getconn(self._replica_timeout())
+                except (psycopg.OperationalError, PoolTimeout) as e:
+                    logger.warning(f"[DB] Ejecting replica {index}: {str(e)}")
+                    self.router.eject(index)
+                    continue
+
+                pool_wait_ms.set((time.perf_counter() - started) * 1000)
+                try:
+                    await self._apply_deadline(conn)
+                    yield conn
+                finally:
+                    if conn.broken:
+                        logger.warning(f"[DB] Ejecting replica {index}: connection lost.")
+                        self.router.eject(index)
+                    await replica.putconn(conn)
+                return
+
+        async with self.pool.connection(self._acquire_timeout()) as conn:
+            pool_wait_ms.set((time.perf_counter() - started) * 1000)
+            await self._apply_deadline(conn)
+            yield conn
+
+    async def execute(self, cursor, name: str, query, params=None, **kwargs):
+        """Async counterpart of BaseEntity.execute."""
+        deadline.check()
+        started = time.perf_counter()
+        try:
+            await cursor.execute(query, params, **kwargs)
+        except (psycopg.errors.QueryCanceled, psycopg.errors.LockNotAvailable) as e:
+            logger.warning(f"[DB] Query {name} timed out: {str(e)}")
+            raise deadline.DeadlineExceeded("Database deadline exceeded") from e
+        duration = (time.perf_counter() - started) * 1000
+
+        rows = returned_rows(cursor)
+        pool_wait = pool_wait_ms.get()
+        self.metrics.observe(name, duration, rows, pool_wait)
+        if duration >= self.config.slow_query_ms:
+            plan = None
+            if should_explain(query, self.config.explain_sample_rate):
+                plan = await self._explain(cursor.connection, query, params)
+            log_slow_query(name, duration, rows, pool_wait, plan)
+        return cursor
+
+    def _acquire_timeout(self):
+        left = deadline.check()
+        if left is None:
+            return self.config.pool_timeout
+        return min(self.config.pool_timeout, left)
+
+    def _replica_timeout(self):
+        return min(self._acquire_timeout(), self.config.replica_connect_timeout)
+
+    async def _apply_deadline(self, conn):
+        """Async counterpart of BaseEntity._apply_deadline."""
+        timeout = deadline_timeout(self.config.statement_timeout_ms)
+        if timeout is not None:
+            await conn.execute(SET_TIMEOUTS, (timeout, timeout), prepare=True)
+            self._shortened.add(conn)
+
+    async def _reset_timeouts(self, conn):
+        if conn in self._shortened:
+            self._shortened.discard(conn)
+            await conn.execute(RESET_TIMEOUTS)
+
+    async def _explain(self, conn, query, params):
+        try:
+            async with conn.cursor() as explain:
+                await explain.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                return "\n".join(row[0] for row in await explain.fetchall())
+        except psycopg.Error as e:
+            logger.warning(f"[DB] Could not explain slow query: {str(e)}")
+            return None
+
+    async def run(self, coro):
+        """Run `coro` on the DB event loop and await its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        return await asyncio.wrap_future(future)
+
+    def close(self):
+        if self._loop is None:
+            return
+        for pool in [self.pool, *self.replicas]:
+            asyncio.run_coroutine_threadsafe(pool.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _get_loop(self):
+        # El loop (y su hilo) se crea recién con la primera consulta
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="async-db-loop", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
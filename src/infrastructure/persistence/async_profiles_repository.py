@@ -0,0 +1,80 @@
+from src.infrastructure.persistence.async_base_entity import AsyncBaseEntity, on_db_loop
+from src.infrastructure.persistence.replica_router import RecentWrites
+from src.infrastructure.persistence.profiles_repository import (
+    INSERT_COLUMNS,
+    INSERT_FIELDS,
+    PROFILE_FIELDS,
+    profile_row,
+)
+
+
+class AsyncProfilesRepository(AsyncBaseEntity):
+    """Async variant of ProfilesRepository for the latency sensitive paths."""
+
+    def __init__(self, recent_writes: RecentWrites = None):
+        super().__init__(recent_writes=recent_writes)
+
+    @on_db_loop
+    async def get_profile(self, uuid, primary: bool = False):
+        """Obtiene un perfil por UUID"""
+        query = f"SELECT {PROFILE_FIELDS} FROM profiles WHERE uuid = %s"
+        params = (str(uuid),)
+        async with self.read_connection([uuid], primary) as conn, conn.cursor(row_factory=profile_row) as cursor:
+            await self.execute(cursor, "get_profile", query, params, prepare=True)
+            return await cursor.fetchone()
+
+    @on_db_loop
+    async def get_profile_updated_at(self, uuid, primary: bool = False):
+        """Solo el updated_at de un perfil (None si no existe), para validar ETags."""
+        query = "SELECT updated_at FROM profiles WHERE uuid = %s"
+        params = (str(uuid),)
+        async with self.read_connection([uuid], primary) as conn, conn.cursor() as cursor:
+            await self.execute(cursor, "get_profile_updated_at", query, params, prepare=True)
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    @on_db_loop
+    async def get_profiles_by_uuids(self, uuids: list):
+        """Obtiene varios perfiles por UUID en una sola consulta"""
+        query = f"SELECT {PROFILE_FIELDS} FROM profiles WHERE uuid = ANY(%s::uuid[])"
+        params = ([str(uuid) for uuid in uuids],)
+        async with self.read_connection(uuids) as conn, conn.cursor(row_factory=profile_row) as cursor:
+            await self.execute(cursor, "get_profiles_by_uuids", query, params, prepare=True)
+            return await cursor.fetchall()
+
+    @on_db_loop
+    async def insert_profile(self, profile_data: dict):
+        """
+        Inserta un nuevo perfil. Retorna None si ya existe un perfil con ese UUID.
+        """
+        query = f"""
+        INSERT INTO profiles ({INSERT_FIELDS})
+        VALUES ({", ".join(f"%({column})s" for column in INSERT_COLUMNS)})
+        ON CONFLICT (uuid) DO NOTHING
+        RETURNING {PROFILE_FIELDS}
+        """
+        # Campos opcionales no proporcionados como NULL
+        for column in INSERT_COLUMNS:
+            profile_data.setdefault(column, None)
+
+        async with self.connection() as conn, conn.cursor(row_factory=profile_row) as cursor:
+            await self.execute(cursor, "insert_profile", query, profile_data, prepare=True)
+            self.recent_writes.add(profile_data["uuid"])
+            return await cursor.fetchone()
+
+    @on_db_loop
+    async def update_profile(self, uuid, updates):
+        """Actualiza un perfil. Retorna None si no existe."""
+        set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
+        query = f"""
+            UPDATE profiles
+            SET {set_clause}, updated_at = NOW()
+            WHERE uuid = %s
+            RETURNING {PROFILE_FIELDS}
+        """
+        params = list(updates.values()) + [uuid]
+
+        async with self.connection() as conn, conn.cursor(row_factory=profile_row) as cursor:
+            await self.execute(cursor, "update_profile", query, params)
+            self.recent_writes.add(uuid)
+            return await cursor.fetchone()
@@ -1,28 +1,230 @@
 import psycopg
+import psycopg_pool
+from src import deadline
 import time
+import weakref
+from contextlib import contextmanager
 from src.infrastructure.config.db_config import DatabaseConfig
+from src.infrastructure.persistence.connection_pool import ConnectionPool, PoolTimeout
+from src.infrastructure.persistence.query_metrics import (
+    log_slow_query,
+    pool_wait_ms,
+    query_metrics,
+    returned_rows,
+    should_explain,
+)
+from src.infrastructure.persistence.replica_router import RecentWrites, ReplicaRouter
+from src.logger_config import get_logger
+
+logger = get_logger("api-profiles")
+
+# Cada sesión arranca con DB_STATEMENT_TIMEOUT_MS (DatabaseConfig.connection_kwargs);
+# solo si el deadline es más corto se baja para la sesión, y el reset del pool
+# devuelve la conexión a ese valor por defecto
+SET_TIMEOUTS = (
+    "SELECT set_config('statement_timeout', %s, false), "
+    "set_config('lock_timeout', %s, false)"
+)
+RESET_TIMEOUTS = "RESET statement_timeout; RESET lock_timeout"
+
+
+def deadline_timeout(default_ms: int):
+    """
+    Milliseconds left in the request's budget when that is shorter than the
+    session default, as the string set_config expects; None otherwise.
+    """
+    left = deadline.check()
+    if left is None:
+        return None
+    timeout = max(1, int(left * 1000))
+    return str(timeout) if timeout < default_ms else None
 
 
 class BaseEntity:
 
-    def __init__(self):
-        self.conn = self.connect_with_retries()
-        self.cursor = self.conn.cursor()
+    def __init__(self, config: DatabaseConfig = None, recent_writes: RecentWrites = None):
+        self.config = config or DatabaseConfig()
+        # Conexiones con los timeouts del deadline aplicados, a resetear al devolverlas
+        self._shortened = weakref.WeakSet()
+        self.pool = ConnectionPool(
+            self.config.connection_strings,
+            kwargs=self.config.connection_kwargs(self.config.connect_timeout),
+            min_size=self.config.pool_min_size,
+            max_size=self.config.pool_max_size,
+            timeout=self.config.pool_timeout,
+            max_lifetime=self.config.pool_max_lifetime,
+            check_idle=self.config.pool_check_idle,
+            reset=self._reset_timeouts,
+            name="primary",
+            open=True,
+        )
+
+        # Las réplicas se conectan bajo demanda: si no entregan una conexión
+        # a tiempo se expulsan y la lectura va a otra réplica o al primario
+        self.replicas = [
+            ConnectionPool(
+                dsn,
+                kwargs=self.config.connection_kwargs(self.config.replica_connect_timeout),
+                min_size=0,
+                max_size=self.config.pool_max_size,
+                timeout=self.config.pool_timeout,
+                max_lifetime=self.config.pool_max_lifetime,
+                check_idle=self.config.pool_check_idle,
+                reset=self._reset_timeouts,
+                name=f"replica-{index}",
+                open=True,
+            )
+            for index, dsn in enumerate(self.config.replica_dsns)
+        ]
+        self.router = ReplicaRouter(len(self.replicas), self.config.replica_eject_seconds)
+        if recent_writes is None:
+            recent_writes = RecentWrites(self.config.read_your_writes_seconds)
+        self.recent_writes = recent_writes
+        self.metrics = query_metrics
+        self.wait_until_ready()
+
+    def wait_until_ready(self, timeout: float = 15.0):
+        """
+        Block at startup until the primary pool holds its min_size
+        connections. The pool keeps retrying with backoff in the background;
+        if it is still not ready after `timeout` seconds the DB is down.
+        """
+        try:
+            self.pool.wait(timeout)
+        except psycopg_pool.PoolTimeout as e:
+            raise RuntimeError("Database connection error.") from e
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled primary connection for a single operation."""
+        started = time.perf_counter()
+        with self.pool.connection(self._acquire_timeout()) as conn:
+            pool_wait_ms.set((time.perf_counter() - started) * 1000)
+            self._apply_deadline(conn)
+            yield conn
+
+    @contextmanager
+    def read_connection(self, keys=(), primary: bool = False):
+        """
+        Borrow a connection for a read. Goes to a healthy replica in
+        round-robin order, or to the primary when there are none, when they
+        all fail, when any of `keys` was written recently, or when `primary`.
+        """
+        started = time.perf_counter()
+        if not primary and not self.recent_writes.any(keys):
+            for index in self.router.candidates():
+                replica = self.replicas[index]
+                try:
+                    conn = replica.getconn(self._replica_timeout())
+                except (psycopg.OperationalError, PoolTimeout) as e:
+                    logger.warning(f"[DB] Ejecting replica {index}: {str(e)}")
+                    self.router.eject(index)
+                    continue
+
+                pool_wait_ms.set((time.perf_counter() - started) * 1000)
+                try:
+                    self._apply_deadline(conn)
+                    yield conn
+                finally:
+                    if conn.broken:
+                        logger.warning(f"[DB] Ejecting replica {index}: connection lost.")
+                        self.router.eject(index)
+                    replica.putconn(conn)
+                return
+
+        with self.pool.connection(self._acquire_timeout()) as conn:
+            pool_wait_ms.set((time.perf_counter() - started) * 1000)
+            self._apply_deadline(conn)
+            yield conn
+
+    def execute(self, cursor, name: str, query, params=None, **kwargs):
+        """
+        cursor.execute() timed under `name`: records duration, rows returned
+        and pool wait, and logs the statement if it exceeds the threshold.
+        """
+        deadline.check()
+        started = time.perf_counter()
+        with self._deadline_errors(name):
+            cursor.execute(query, params, **kwargs)
+        self._observe(cursor, name, query, params, started)
+        return cursor
+
+    @contextmanager
+    def copy(self, cursor, name: str, statement):
+        """
+        cursor.copy() timed under `name` like execute(): the COPY shows up in
+        the query metrics and a cancelled one becomes DeadlineExceeded.
+        """
+        deadline.check()
+        started = time.perf_counter()
+        with self._deadline_errors(name), cursor.copy(statement) as copy:
+            yield copy
+        self._observe(cursor, name, statement, None, started)
+
+    @contextmanager
+    def _deadline_errors(self, name: str):
+        # statement_timeout / lock_timeout vencidos: es el deadline del request
+        try:
+            yield
+        except (psycopg.errors.QueryCanceled, psycopg.errors.LockNotAvailable) as e:
+            logger.warning(f"[DB] Query {name} timed out: {str(e)}")
+            raise deadline.DeadlineExceeded("Database deadline exceeded") from e
+
+    def _observe(self, cursor, name: str, query, params, started: float):
+        duration = (time.perf_counter() - started) * 1000
+        rows = returned_rows(cursor)
+        pool_wait = pool_wait_ms.get()
+        self.metrics.observe(name, duration, rows, pool_wait)
+        if duration >= self.config.slow_query_ms:
+            plan = None
+            if should_explain(query, self.config.explain_sample_rate):
+                plan = self._explain(cursor.connection, query, params)
+            log_slow_query(name, duration, rows, pool_wait, plan)
+
+    def _acquire_timeout(self):
+        """Pool checkout timeout, capped by what is left of the request deadline."""
+        left = deadline.check()
+        if left is None:
+            return self.config.pool_timeout
+        return min(self.config.pool_timeout, left)
+
+    def _replica_timeout(self):
+        """
+        Replica checkout timeout: a replica that cannot hand out a connection
+        within replica_connect_timeout is ejected, and the read moves on.
+        """
+        return min(self._acquire_timeout(), self.config.replica_connect_timeout)
+
+    def _apply_deadline(self, conn):
+        """
+        Bound every statement of this checkout by the remaining budget.
+        Sessions already start with the configured statement_timeout, so
+        the extra round trip is only paid when the budget is shorter; the
+        pool's reset callback restores it before the next checkout.
+        """
+        timeout = deadline_timeout(self.config.statement_timeout_ms)
+        if timeout is not None:
+            conn.execute(SET_TIMEOUTS, (timeout, timeout), prepare=True)
+            self._shortened.add(conn)
 
-    """Retry connecting to the DB until it is available."""
+    def _reset_timeouts(self, conn):
+        if conn in self._shortened:
+            self._shortened.discard(conn)
+            conn.execute(RESET_TIMEOUTS)
 
-    def connect_with_retries(self, retries=5, delay=3):
-        for attempt in range(retries):
-            try:
-                connection_string = DatabaseConfig().connection_strings
-                return psycopg.connect(connection_string)
-            except psycopg.OperationalError:
-                time.sleep(delay)
-        raise RuntimeError("Database connection error.")
+    def _explain(self, conn, query, params):
+        try:
+            with conn.cursor() as explain:
+                explain.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                return "\n".join(row[0] for row in explain.fetchall())
+        except psycopg.Error as e:
+            logger.warning(f"[DB] Could not explain slow query: {str(e)}")
+            return None
 
-    def commit(self):
-        self.cursor.commit()
+    def close(self):
+        self.pool.close()
+        for replica in self.replicas:
+            replica.close()
 
     def __del__(self):
-        self.cursor.close()
-        self.conn.close()
+        self.close()
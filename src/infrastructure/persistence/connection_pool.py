@@ -0,0 +1,71 @@
+import time
+import weakref
+
+import psycopg_pool
+
+
+class PoolTimeout(TimeoutError):
+    """No connection could be checked out before the acquire timeout."""
+
+
+class ConnectionPool(psycopg_pool.ConnectionPool):
+    """
+    psycopg_pool.ConnectionPool with two adjustments for this API:
+
+    - running out of time waiting for a connection raises PoolTimeout, a
+      TimeoutError, so it is answered like any other exhausted deadline;
+    - a connection is pinged on checkout only when it sat idle for more than
+      `check_idle` seconds, instead of on every checkout.
+    """
+
+    def __init__(self, conninfo: str = "", check_idle: float = 30.0, **kwargs):
+        self.check_idle = check_idle
+        self._last_used = weakref.WeakKeyDictionary()
+        super().__init__(conninfo, check=self._check_idle, **kwargs)
+
+    def getconn(self, timeout: float = None):
+        try:
+            return super().getconn(timeout)
+        except psycopg_pool.PoolTimeout as e:
+            raise PoolTimeout(str(e)) from e
+
+    def putconn(self, conn):
+        self._last_used[conn] = time.monotonic()
+        super().putconn(conn)
+
+    def _check_idle(self, conn):
+        # Las conexiones quietas un rato pueden haber sido cortadas por el servidor
+        last_used = self._last_used.get(conn)
+        if last_used is not None and time.monotonic() - last_used >= self.check_idle:
+            self.check_connection(conn)
+
+
+class AsyncConnectionPool(psycopg_pool.AsyncConnectionPool):
+    """
+    asyncio counterpart of ConnectionPool for psycopg.AsyncConnection.
+
+    Must only be used from a single event loop. It is opened by the first
+    checkout, so the pool can be built before that loop is running.
+    """
+
+    def __init__(self, conninfo: str = "", check_idle: float = 30.0, **kwargs):
+        self.check_idle = check_idle
+        self._last_used = weakref.WeakKeyDictionary()
+        super().__init__(conninfo, check=self._check_idle, open=False, **kwargs)
+
+    async def getconn(self, timeout: float = None):
+        if not self._opened:
+            await self.open()
+        try:
+            return await super().getconn(timeout)
+        except psycopg_pool.PoolTimeout as e:
+            raise PoolTimeout(str(e)) from e
+
+    async def putconn(self, conn):
+        self._last_used[conn] = time.monotonic()
+        await super().putconn(conn)
+
+    async def _check_idle(self, conn):
+        last_used = self._last_used.get(conn)
+        if last_used is not None and time.monotonic() - last_used >= self.check_idle:
+            await self.check_connection(conn)
@@ -1,46 +1,67 @@
+from psycopg.types.json import Jsonb
 from src.domain.profile import Profile
+from src.domain.stored_image import StoredImage
 from werkzeug.security import generate_password_hash
 from src.infrastructure.config.db_config import DatabaseConfig
 from src.infrastructure.persistence.base_entity import BaseEntity
+from src.infrastructure.persistence.replica_router import RecentWrites
+
+# Mismo orden que los parámetros de Profile: profile_row depende de esto
+PROFILE_COLUMNS = (
+    "uuid", "email", "role", "display_name", "phone", "location",
+    "birthday", "gender", "description", "display_image",
+    "created_at", "updated_at", "image_variants",
+)
+PROFILE_FIELDS = ", ".join(PROFILE_COLUMNS)
+
+# Columnas que se escriben al crear un perfil (el resto tiene default)
+INSERT_COLUMNS = PROFILE_COLUMNS[:10]
+INSERT_FIELDS = ", ".join(INSERT_COLUMNS)
+
+# Índice de imágenes por contenido; mismo orden que los parámetros de StoredImage
+STORED_IMAGE_FIELDS = "sha256, object_key, content_type, size, variants, created_at"
+
+
+def profile_row(cursor):
+    """Row factory de psycopg que construye un Profile directo de la tupla."""
+    return lambda values: Profile(*values)
+
+
+def stored_image_row(cursor):
+    return lambda values: StoredImage(*values)
+
+
+def scored_profile_row(cursor):
+    """Row factory para búsquedas: (Profile, score), con el score al final."""
+    return lambda values: (Profile(*values[:-1]), values[-1])
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class ProfilesRepository(BaseEntity):
-    def __init__(self):
-        super().__init__()
-
-    def _parse_profile(self, profile_data):
-        """Convierte datos de la DB a objeto Profile"""
-        return Profile(
-            uuid=profile_data["uuid"],
-            email=profile_data["email"],
-            role=profile_data["role"],
-            display_name=profile_data["display_name"],
-            phone=profile_data["phone"],
-            location=profile_data["location"],
-            birthday=profile_data["birthday"],
-            gender=profile_data["gender"],
-            description=profile_data["description"],
-            display_image=profile_data["display_image"],
-        )
+    def __init__(self, recent_writes: RecentWrites = None):
+        super().__init__(recent_writes=recent_writes)
 
     def profile_exists(self, profile_uuid: str) -> bool:
         """Verifica si un perfil existe"""
         query = "SELECT 1 FROM profiles WHERE uuid = %s LIMIT 1"
         params = (str(profile_uuid),)
-        self.cursor.execute(query, params)
-        return bool(self.cursor.fetchone())
+        with self.read_connection([profile_uuid]) as conn, conn.cursor() as cursor:
+            self.execute(cursor, "profile_exists", query, params, prepare=True)
+            return bool(cursor.fetchone())
 
     def insert_profile(self, profile_data: dict):
-        """Inserta un nuevo perfil con campos obligatorios y opcionales"""
-        query = """
-        INSERT INTO profiles (
-            uuid, email, role, display_name, location, 
-            birthday, gender, description, display_image, phone
-        ) VALUES (
-            %(uuid)s, %(email)s, %(role)s, %(display_name)s, %(location)s,
-            %(birthday)s, %(gender)s, %(description)s, %(display_image)s, %(phone)s
-        )
-        RETURNING *
+        """
+        Inserta un nuevo perfil con campos obligatorios y opcionales.
+        Retorna None si ya existe un perfil con ese UUID.
+        """
+        query = f"""
+        INSERT INTO profiles ({INSERT_FIELDS})
+        VALUES ({", ".join(f"%({column})s" for column in INSERT_COLUMNS)})
+        ON CONFLICT (uuid) DO NOTHING
+        RETURNING {PROFILE_FIELDS}
         """
 
         # Validar campos obligatorios
@@ -65,70 +86,231 @@ class ProfilesRepository(BaseEntity):
             if field not in profile_data:
                 profile_data[field] = None
 
-        self.cursor.execute(query, profile_data)
-        self.conn.commit()
+        with self.connection() as conn, conn.cursor(row_factory=profile_row) as cursor:
+            self.execute(cursor, "insert_profile", query, profile_data, prepare=True)
+            self.recent_writes.add(profile_data["uuid"])
+
+            # Obtener y retornar el perfil creado (None si ya existía)
+            return cursor.fetchone()
+
+    def insert_profiles(self, profiles_data: list) -> set:
+        """
+        Inserta varios perfiles en una sola transacción: COPY a una tabla
+        temporal y luego INSERT ... ON CONFLICT DO NOTHING.
+        Retorna los UUID que efectivamente se insertaron.
+        """
+        # Conexiones autocommit: la tabla temporal vive solo dentro de esta transacción
+        with self.connection() as conn, conn.transaction(), conn.cursor() as cursor:
+            self.execute(
+                cursor,
+                "insert_profiles_staging",
+                "CREATE TEMP TABLE profiles_staging "
+                "(LIKE profiles INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            with self.copy(
+                cursor, "insert_profiles_copy", f"COPY profiles_staging ({INSERT_FIELDS}) FROM STDIN"
+            ) as copy:
+                for profile_data in profiles_data:
+                    copy.write_row([profile_data.get(column) for column in INSERT_COLUMNS])
+
+            self.execute(cursor, "insert_profiles", f"""
+                INSERT INTO profiles ({INSERT_FIELDS})
+                SELECT {INSERT_FIELDS} FROM profiles_staging
+                ON CONFLICT (uuid) DO NOTHING
+                RETURNING uuid
+            """)
+            created = {str(row[0]) for row in cursor.fetchall()}
 
-        # Obtener y retornar el perfil creado
-        new_profile = self.cursor.fetchone()
-        columns = [desc[0] for desc in self.cursor.description]
-        return self._parse_profile(dict(zip(columns, new_profile)))
+        for profile_uuid in created:
+            self.recent_writes.add(profile_uuid)
 
-    def get_profile(self, uuid):
+        return created
+
+    def get_profile(self, uuid, primary: bool = False):
         """Obtiene un perfil por UUID"""
-        query = "SELECT * FROM profiles WHERE uuid = %s"
+        query = f"SELECT {PROFILE_FIELDS} FROM profiles WHERE uuid = %s"
         params = (str(uuid),)
-        self.cursor.execute(query, params)
-        profile = self.cursor.fetchone()
+        with self.read_connection([uuid], primary) as conn, conn.cursor(row_factory=profile_row) as cursor:
+            self.execute(cursor, "get_profile", query, params, prepare=True)
+            return cursor.fetchone()
 
-        if not profile:
-            return None
+    def get_profile_updated_at(self, uuid, primary: bool = False):
+        """Solo el updated_at de un perfil (None si no existe), para validar ETags."""
+        query = "SELECT updated_at FROM profiles WHERE uuid = %s"
+        params = (str(uuid),)
+        with self.read_connection([uuid], primary) as conn, conn.cursor() as cursor:
+            self.execute(cursor, "get_profile_updated_at", query, params, prepare=True)
+            row = cursor.fetchone()
+            return row[0] if row else None
 
-        # Mapear resultados a un diccionario
-        columns = [desc[0] for desc in self.cursor.description]
-        profile_data = dict(zip(columns, profile))
-        return self._parse_profile(profile_data)
+    def get_profiles(self, limit: int, after=None):
+        """
+        Obtiene una página de perfiles ordenada por (created_at, uuid).
+        `after` es la clave (created_at, uuid) del último perfil de la página
+        anterior, o solo su UUID.
+        """
+        if after is None:
+            query = f"SELECT {PROFILE_FIELDS} FROM profiles ORDER BY created_at, uuid LIMIT %s"
+            params = (limit,)
+        elif isinstance(after, tuple):
+            query = f"""
+                SELECT {PROFILE_FIELDS} FROM profiles
+                WHERE (created_at, uuid) > (%s, %s)
+                ORDER BY created_at, uuid
+                LIMIT %s
+            """
+            params = (after[0], str(after[1]), limit)
+        else:
+            query = f"""
+                SELECT {PROFILE_FIELDS} FROM profiles
+                WHERE (created_at, uuid) > (
+                    SELECT created_at, uuid FROM profiles WHERE uuid = %s
+                )
+                ORDER BY created_at, uuid
+                LIMIT %s
+            """
+            params = (str(after), limit)
 
+        with self.read_connection() as conn, conn.cursor(row_factory=profile_row) as cursor:
+            self.execute(cursor, "get_profiles", query, params, prepare=True)
+            return cursor.fetchall()
 
-    def get_profiles(self):
-        query = "SELECT * FROM profiles"
-        params = ()
-        self.cursor.execute(query, params)
-        profiles = self.cursor.fetchall()
+    def search_profiles(self, q: str, role: str = None, limit: int = 50, after=None):
+        """
+        Busca perfiles por nombre o ubicación (trigramas) y por prefijo de
+        email. Retorna una lista de (Profile, score) ordenada por relevancia.
+        `after` es el (score, uuid) del último resultado de la página anterior.
+        """
+        role_filter = "AND role = %(role)s" if role else ""
+        after_filter = (
+            "WHERE score < %(after_score)s "
+            "OR (score = %(after_score)s AND uuid > %(after_uuid)s::uuid)"
+            if after else ""
+        )
+        query = f"""
+            SELECT {PROFILE_FIELDS}, score FROM (
+                SELECT {PROFILE_FIELDS}, GREATEST(
+                    similarity(display_name, %(q)s),
+                    similarity(location, %(q)s),
+                    CASE WHEN lower(email) LIKE %(email_prefix)s THEN 1 ELSE 0 END
+                )::float8 AS score
+                FROM profiles
+                WHERE (
+                    display_name %% %(q)s OR display_name ILIKE %(pattern)s
+                    OR location %% %(q)s OR location ILIKE %(pattern)s
+                    OR lower(email) LIKE %(email_prefix)s
+                )
+                {role_filter}
+            ) AS matches
+            {after_filter}
+            ORDER BY score DESC, uuid
+            LIMIT %(limit)s
+        """
+        escaped = _like_escape(q)
+        params = {
+            "q": q,
+            "pattern": f"%{escaped}%",
+            "email_prefix": f"{escaped.lower()}%",
+            "role": role,
+            "limit": limit,
+            "after_score": after[0] if after else None,
+            "after_uuid": str(after[1]) if after else None,
+        }
 
-        if not profiles:
-            return []
+        with self.read_connection() as conn, conn.cursor(row_factory=scored_profile_row) as cursor:
+            self.execute(cursor, "search_profiles", query, params, prepare=True)
+            return cursor.fetchall()
 
-        # Mapear resultados a un diccionario
-        profiles_final = []
-        columns = [desc[0] for desc in self.cursor.description]
-        for profile in profiles:
-            profile_data = dict(zip(columns, profile))
-            profile_p = self._parse_profile(profile_data)
-            profiles_final.append(profile_p)
+    def get_profiles_by_uuids(self, uuids: list):
+        """Obtiene varios perfiles por UUID en una sola consulta"""
+        query = f"SELECT {PROFILE_FIELDS} FROM profiles WHERE uuid = ANY(%s::uuid[])"
+        params = ([str(uuid) for uuid in uuids],)
+        with self.read_connection(uuids) as conn, conn.cursor(row_factory=profile_row) as cursor:
+            self.execute(cursor, "get_profiles_by_uuids", query, params, prepare=True)
+            return cursor.fetchall()
 
-        return profiles_final
+    def iter_profiles(self, itersize: int = 1000):
+        """
+        Recorre todos los perfiles con un cursor del lado del servidor,
+        trayendo `itersize` filas por viaje. La conexión queda tomada
+        hasta que se agota o se cierra el generador.
+        """
+        query = f"SELECT {PROFILE_FIELDS} FROM profiles"
+        # Un cursor con nombre necesita una transacción abierta (el pool es autocommit)
+        with self.read_connection() as conn, conn.transaction(), conn.cursor(
+            name="profiles_export", row_factory=profile_row
+        ) as cursor:
+            cursor.itersize = itersize
+            self.execute(cursor, "iter_profiles", query)
+            yield from cursor
 
     def update_profile(self, uuid, updates):
-        # Construir la consulta dinámica
+        """Actualiza un perfil. Retorna None si no existe."""
+        # Construir la consulta dinámica (no se prepara: varía con los campos)
         set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
         query = f"""
             UPDATE profiles
             SET {set_clause}, updated_at = NOW()
             WHERE uuid = %s
-            RETURNING *
+            RETURNING {PROFILE_FIELDS}
         """
 
         params = list(updates.values()) + [uuid]
 
-        self.cursor.execute(query, params)
-        self.conn.commit()
+        with self.connection() as conn, conn.cursor(row_factory=profile_row) as cursor:
+            self.execute(cursor, "update_profile", query, params)
+            self.recent_writes.add(uuid)
+
+            return cursor.fetchone()
 
-        updated_profile = self.cursor.fetchone()
-        if not updated_profile:
-            raise ValueError("Profile not found after update")
+    def set_profile_images(self, uuid, display_image: str, image_variants: dict):
+        """
+        Apunta el perfil a las variantes procesadas de su imagen.
+        Retorna None si el perfil no existe.
+        """
+        query = f"""
+            UPDATE profiles
+            SET display_image = %s, image_variants = %s, updated_at = NOW()
+            WHERE uuid = %s
+            RETURNING {PROFILE_FIELDS}
+        """
+        params = (display_image, Jsonb(image_variants), str(uuid))
+
+        with self.connection() as conn, conn.cursor(row_factory=profile_row) as cursor:
+            self.execute(cursor, "set_profile_images", query, params, prepare=True)
+            self.recent_writes.add(uuid)
+
+            return cursor.fetchone()
+
+    def get_stored_image(self, sha256: str):
+        """Imagen ya guardada con este contenido, o None."""
+        query = f"SELECT {STORED_IMAGE_FIELDS} FROM stored_images WHERE sha256 = %s"
+        with self.read_connection([sha256]) as conn, conn.cursor(row_factory=stored_image_row) as cursor:
+            self.execute(cursor, "get_stored_image", query, (sha256,), prepare=True)
+            return cursor.fetchone()
+
+    def insert_stored_image(self, sha256: str, object_key: str, content_type: str, size: int):
+        """
+        Registra una imagen recién subida. Si otra subida del mismo
+        contenido ganó la carrera, retorna la que ya estaba.
+        """
+        query = f"""
+            INSERT INTO stored_images (sha256, object_key, content_type, size)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (sha256) DO NOTHING
+            RETURNING {STORED_IMAGE_FIELDS}
+        """
+        params = (sha256, object_key, content_type, size)
 
-        # Convertir a diccionario
-        columns = [desc[0] for desc in self.cursor.description]
-        profile_data = dict(zip(columns, updated_profile))
+        with self.connection() as conn, conn.cursor(row_factory=stored_image_row) as cursor:
+            self.execute(cursor, "insert_stored_image", query, params, prepare=True)
+            self.recent_writes.add(sha256)
+            stored = cursor.fetchone()
+        return stored or self.get_stored_image(sha256)
 
-        return self._parse_profile(profile_data)
+    def set_stored_image_variants(self, sha256: str, variants: dict):
+        """Guarda las URLs de las variantes generadas para este contenido."""
+        query = "UPDATE stored_images SET variants = %s WHERE sha256 = %s"
+        with self.connection() as conn, conn.cursor() as cursor:
+            self.execute(cursor, "set_stored_image_variants", query, (Jsonb(variants), sha256), prepare=True)
+            self.recent_writes.add(sha256)
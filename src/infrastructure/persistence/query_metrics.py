@@ -0,0 +1,103 @@
+import bisect
+import random
+import threading
+from contextvars import ContextVar
+
+from src.logger_config import get_logger
+
+logger = get_logger("api-profiles")
+
+DURATION_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000)
+
+# Cuánto esperó la conexión actual en el pool; lo fija BaseEntity al
+# prestarla y lo lee cada query que se ejecute con ella
+pool_wait_ms = ContextVar("pool_wait_ms", default=0.0)
+
+
+class Histogram:
+    """Per-bucket (not cumulative) counts; the last bucket is +Inf."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
+class QueryMetrics:
+    """
+    Per-statement histograms of duration, rows returned and pool wait,
+    keyed by the query name the repository gives each statement.
+    """
+
+    def __init__(self):
+        self._queries = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, duration_ms: float, rows, pool_wait: float):
+        with self._lock:
+            query = self._queries.get(name)
+            if query is None:
+                query = self._queries[name] = {
+                    "duration_ms": Histogram(DURATION_BUCKETS_MS),
+                    "rows": Histogram(ROWS_BUCKETS),
+                    "pool_wait_ms": Histogram(DURATION_BUCKETS_MS),
+                }
+            query["duration_ms"].observe(duration_ms)
+            query["pool_wait_ms"].observe(pool_wait)
+            if rows is not None:
+                query["rows"].observe(rows)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {metric: hist.snapshot() for metric, hist in query.items()}
+                for name, query in self._queries.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+
+
+query_metrics = QueryMetrics()
+
+
+def returned_rows(cursor):
+    # rowcount es -1 cuando psycopg no lo conoce (p. ej. cursores con nombre)
+    rows = cursor.rowcount
+    return rows if isinstance(rows, int) and rows >= 0 else None
+
+
+def should_explain(query: str, sample_rate: float) -> bool:
+    # EXPLAIN ANALYZE ejecuta la sentencia: nunca sobre escrituras
+    return (
+        sample_rate > 0
+        and query.lstrip().upper().startswith("SELECT")
+        and random.random() < sample_rate
+    )
+
+
+def log_slow_query(name, duration_ms, rows, pool_wait, plan=None):
+    logger.warning(
+        "[DB] Slow query",
+        query=name,
+        duration_ms=round(duration_ms, 3),
+        rows=rows,
+        pool_wait_ms=round(pool_wait, 3),
+        plan=plan,
+    )
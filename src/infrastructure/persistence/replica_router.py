@@ -0,0 +1,72 @@
+import itertools
+import threading
+import time
+import uuid as uuid_lib
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection over read replicas. A replica that fails is
+    ejected for `eject_seconds` and then tried again.
+    """
+
+    def __init__(self, size: int, eject_seconds: float = 30.0):
+        self.size = size
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * size
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list:
+        """Healthy replica indexes, starting at the next one in the rotation."""
+        if not self.size:
+            return []
+
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._counter) % self.size
+            order = [(start + offset) % self.size for offset in range(self.size)]
+            return [index for index in order if self._ejected_until[index] <= now]
+
+    def eject(self, index: int):
+        with self._lock:
+            self._ejected_until[index] = time.monotonic() + self.eject_seconds
+
+    def is_ejected(self, index: int) -> bool:
+        return self._ejected_until[index] > time.monotonic()
+
+
+def _normalize(key) -> str:
+    # Mismo uuid en mayúsculas o sin guiones: misma key; otras keys (sha256) tal cual
+    try:
+        return str(uuid_lib.UUID(str(key)))
+    except ValueError:
+        return str(key)
+
+
+class RecentWrites:
+    """
+    Keys written in the last `window` seconds. Reads of those keys stay on
+    the primary so a client always sees its own writes, even if the
+    replicas are lagging.
+    """
+
+    def __init__(self, window: float = 5.0):
+        self.window = window
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._expires[_normalize(key)] = now + self.window
+            # Limpiar vencidos para que el dict no crezca sin límite
+            if len(self._expires) > 1024:
+                self._expires = {k: t for k, t in self._expires.items() if t > now}
+
+    def __contains__(self, key) -> bool:
+        expires = self._expires.get(_normalize(key))
+        return expires is not None and expires > time.monotonic()
+
+    def any(self, keys) -> bool:
+        return any(key in self for key in keys)
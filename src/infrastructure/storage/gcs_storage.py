@@ -0,0 +1,84 @@
+import json
+import threading
+from datetime import timedelta
+
+from google.api_core.exceptions import NotFound
+from google.cloud import storage
+
+from src.infrastructure.config.storage_config import StorageConfig
+from src.infrastructure.storage.storage_backend import StorageBackend
+
+# Subida resumable en partes de este tamaño (múltiplo de 256 KiB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class GCSStorage(StorageBackend):
+    def __init__(self, config: StorageConfig = None):
+        self.config = config or StorageConfig()
+        self.public_reads = self.config.gcs_public_bucket
+        # Bucket de GCS: se crea con el primer uso y se reutiliza
+        self._bucket = None
+        self._bucket_lock = threading.Lock()
+
+    def put(self, key, stream, size, content_type, cache_control=None):
+        blob = self._get_bucket().blob(key, chunk_size=UPLOAD_CHUNK_SIZE)
+        if cache_control:
+            blob.cache_control = cache_control
+        blob.upload_from_file(stream, size=size, content_type=content_type)
+
+    def stream(self, key):
+        blob = self._get_bucket().blob(key, chunk_size=UPLOAD_CHUNK_SIZE)
+        try:
+            blob.reload()
+        except NotFound:
+            raise FileNotFoundError(key)
+        return blob.open("rb")
+
+    def public_url(self, key):
+        if not self.public_reads:
+            # La URL existiría igual, pero un bucket privado la responde con 403
+            raise ValueError("Bucket is not public, set GCS_PUBLIC_BUCKET to use public URLs")
+        return self._get_bucket().blob(key).public_url
+
+    def signed_url(self, key, expiration: timedelta):
+        return self._get_bucket().blob(key).generate_signed_url(
+            version="v4",
+            expiration=expiration,
+            method="GET",
+        )
+
+    def signed_upload_url(self, key, content_type, max_size, expiration: timedelta):
+        # GCS rechaza el PUT si el tamaño o el content type no coinciden con lo firmado
+        headers = {"x-goog-content-length-range": f"0,{max_size}"}
+        url = self._get_bucket().blob(key).generate_signed_url(
+            version="v4",
+            expiration=expiration,
+            method="PUT",
+            content_type=content_type,
+            headers=headers,
+        )
+        return url, {"Content-Type": content_type, **headers}
+
+    def copy(self, source_key, key):
+        bucket = self._get_bucket()
+        bucket.copy_blob(bucket.blob(source_key), bucket, key)
+
+    def delete(self, key):
+        try:
+            self._get_bucket().blob(key).delete()
+        except NotFound:
+            pass
+
+    def _get_bucket(self):
+        """
+        Bucket shared by every upload: the client (credentials and HTTP
+        connection pool) is built once, on first use.
+        """
+        if self._bucket is None:
+            with self._bucket_lock:
+                if self._bucket is None:
+                    # Credenciales desde la variable de entorno, sin archivo temporal
+                    credentials = json.loads(self.config.gcs_credentials_json)
+                    storage_client = storage.Client.from_service_account_info(credentials)
+                    self._bucket = storage_client.bucket(self.config.gcs_bucket_name)
+        return self._bucket
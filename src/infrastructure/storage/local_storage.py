@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from werkzeug.security import safe_join
+
+from src.infrastructure.config.storage_config import StorageConfig
+from src.infrastructure.storage.storage_backend import StorageBackend
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class LocalStorage(StorageBackend):
+    """
+    Objects as files under a local directory, served by this service at
+    `local_base_url`, which also takes the PUTs of direct uploads. There
+    is no access control: signed URLs are plain URLs. For development,
+    tests and benchmarks of the upload path.
+    """
+
+    serves_files = True
+    public_reads = True
+
+    def __init__(self, config: StorageConfig = None):
+        self.config = config or StorageConfig()
+        self.root = os.path.abspath(self.config.local_dir)
+        self.base_url = self.config.local_base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def put(self, key, stream, size, content_type, cache_control=None):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Archivo temporal + rename: un lector nunca ve un objeto a medias
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(stream, f, COPY_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def stream(self, key):
+        return open(self.path(key), "rb")
+
+    def public_url(self, key):
+        return f"{self.base_url}/{key}"
+
+    def signed_url(self, key, expiration: timedelta):
+        return self.public_url(key)
+
+    def signed_upload_url(self, key, content_type, max_size, expiration: timedelta):
+        return self.public_url(key), {"Content-Type": content_type}
+
+    def copy(self, source_key, key):
+        with self.stream(source_key) as stream:
+            self.put(key, stream, os.fstat(stream.fileno()).st_size, None)
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def path(self, key) -> str:
+        path = safe_join(self.root, key)
+        if path is None:
+            raise FileNotFoundError(key)
+        return path
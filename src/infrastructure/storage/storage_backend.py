@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+
+class StorageBackend(ABC):
+    """Object storage for uploaded images, addressed by key."""
+
+    # True si este servicio sirve los objetos en GET /storage/<key>
+    serves_files = False
+    # True si public_url da acceso de lectura sin firmar; si no, solo hay URLs firmadas
+    public_reads = False
+
+    @abstractmethod
+    def put(self, key: str, stream, size: int, content_type: str, cache_control: str = None):
+        """Store `size` bytes read from `stream` under `key`, replacing any previous object."""
+
+    @abstractmethod
+    def stream(self, key: str):
+        """Binary file object to read the object; FileNotFoundError if missing."""
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        """Permanent URL of an object; only valid when `public_reads`."""
+
+    @abstractmethod
+    def signed_url(self, key: str, expiration: timedelta) -> str:
+        """URL that grants read access to the object for `expiration`."""
+
+    @abstractmethod
+    def signed_upload_url(self, key: str, content_type: str, max_size: int, expiration: timedelta):
+        """
+        (url, headers) for a client to PUT the object directly. The
+        request must carry `headers`, which pin the content type and size.
+        """
+
+    @abstractmethod
+    def copy(self, source_key: str, key: str):
+        """Copy an object inside the storage, without going through this service."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Delete an object; missing objects are ignored."""
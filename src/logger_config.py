@@ -16,6 +16,8 @@ def configure_logging():
         stream=sys.stdout,
         level=logging.DEBUG,
     )
+    # Pillow loguea cada chunk que parsea en DEBUG
+    logging.getLogger("PIL").setLevel(logging.WARNING)
 
     structlog.configure(
         processors=[
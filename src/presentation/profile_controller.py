@@ -1,137 +1,148 @@
-from flask import jsonify
+import hashlib
+import mimetypes
+
+from flask import Response, current_app, jsonify, send_file, stream_with_context
+from werkzeug.http import quote_etag
 from src.headers import (
     PROFILE_CREATED,
+    PROFILES_CREATED,
     BAD_REQUEST,
     PROFILE_NOT_FOUND,
     SERVER_ERROR,
+    SERVICE_UNAVAILABLE,
+)
+from src.application.profile_service import (
+    DEFAULT_PAGE_SIZE,
+    DIRECT_UPLOAD_EXPIRATION,
+    VARIANT_CACHE_CONTROL,
 )
-from src.application.profile_service import ProfileService
+from src.application.async_profile_service import AsyncProfileService
+from src.application.image_upload import ImageTooLarge
+from src.infrastructure.cache.lru_cache import LRUCache
 from src.presentation.error_generator import get_error_json
 from src.logger_config import get_logger
 
 logger = get_logger("api-profiles")
 
+# Segundos que clientes y proxies pueden reutilizar la vista pública
+PUBLIC_PROFILE_MAX_AGE = 60
+PUBLIC_CACHE_CONTROL = f"public, max-age={PUBLIC_PROFILE_MAX_AGE}"
+
 class ProfileController:
-    def __init__(self, profile_service: ProfileService):
+    def __init__(self, profile_service: AsyncProfileService, public_body_cache: LRUCache = None):
         self.profile_service = profile_service
+        # (body, etag) de la vista pública por uuid+updated_at; None lo desactiva
+        self.public_body_cache = public_body_cache
 
-    def create_profile(self, request):
+    async def create_profile_async(self, request):
         if not request.is_json:
             return {"response": jsonify({"error": BAD_REQUEST}), "code_status": 400}
 
         try:
             profile_data = request.get_json()
+            error = self._check_role(profile_data)
+            if error:
+                return error
 
-            valid_roles = ["student", "teacher", "admin"]
-            if "role" in profile_data and profile_data["role"] not in valid_roles:
-                return {
-                    "response": jsonify(
-                        {
-                            "error": "Invalid role",
-                            "detail": f"Role must be one of: {', '.join(valid_roles)}",
-                        }
-                    ),
-                    "code_status": 400,
-                }
-
-            # Crear el perfil
-            self.profile_service.create_profile(profile_data)
-
-            return {
-                "response": jsonify({"message": PROFILE_CREATED, "data": profile_data}),
-                "code_status": 201,
-            }
+            await self.profile_service.create_profile_async(profile_data)
+            return self._created_result(profile_data)
 
         except ValueError as e:
-            return {
-                "response": jsonify({"error": BAD_REQUEST, "detail": str(e)}),
-                "code_status": 400,
-            }
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
         except Exception as e:
             logger.error(f"Profile API - Error creating profile: {str(e)}")
+            return self._server_error()
+
+    def create_profiles(self, request):
+        if not request.is_json:
+            return {"response": jsonify({"error": BAD_REQUEST}), "code_status": 400}
+
+        try:
+            data = request.get_json()
+            error = self._check_list_body(data, "profiles")
+            if error:
+                return error
+
+            created, errors = self.profile_service.create_profiles(data["profiles"])
+
             return {
                 "response": jsonify(
-                    {"error": SERVER_ERROR, "detail": "Internal server error"}
+                    {
+                        "message": PROFILES_CREATED,
+                        "created": created,
+                        "errors": errors,
+                    }
                 ),
-                "code_status": 500,
+                "code_status": 201 if not errors else 200,
             }
 
-    def get_specific_profiles(self, uuid, public_view=False):
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error creating profiles in bulk: {str(e)}")
+            return self._server_error()
+
+    async def get_specific_profiles_async(self, uuid, public_view=False, request=None):
         try:
-            profile = self.profile_service.get_specific_profile(uuid)
+            # Pedido condicional: alcanza con el updated_at para responder 304
+            if request is not None and request.if_none_match:
+                updated_at = await self.profile_service.get_profile_version_async(uuid)
+                if updated_at:
+                    etag = self._profile_etag(uuid, updated_at, public_view)
+                    if request.if_none_match.contains_weak(etag):
+                        return self._not_modified(etag, public_view)
 
-            if not profile:
-                return {
-                    "response": jsonify(
-                        {
-                            "type": "about:blank",
-                            "title": PROFILE_NOT_FOUND,
-                            "status": 404,
-                            "detail": f"Profile with UUID {uuid} not found",
-                            "instance": f"/profiles/{uuid}",
-                        }
-                    ),
-                    "code_status": 404,
-                }
+            profile = await self.profile_service.get_specific_profile_async(uuid)
+            return self._profile_result(uuid, profile, public_view)
 
-            if public_view:
-                # Solo campos públicos
-                response_data = {
-                    "role": profile.role,
-                    "display_name": profile.display_name,
-                    "phone": profile.phone,
-                    "birthday": profile.birthday,
-                    "gender": profile.gender,
-                    "description": profile.description,
-                    "display_image": profile.display_image,
-                }
-            else:
-                # Todos los campos (vista privada)
-                response_data = {
-                    "uuid": profile.uuid,
-                    "email": profile.email,
-                    "role": profile.role,
-                    "display_name": profile.display_name,
-                    "location": profile.location,
-                    "birthday": profile.birthday,
-                    "gender": profile.gender,
-                    "description": profile.description,
-                    "display_image": profile.display_image,
-                    "phone": profile.phone,
-                }
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error fetching profile: {str(e)}")
+            return self._server_error()
+
+    async def get_profiles_batch_async(self, request):
+        if not request.is_json:
+            return {"response": jsonify({"error": BAD_REQUEST}), "code_status": 400}
+
+        try:
+            data = request.get_json()
+            error = self._check_list_body(data, "uuids") or self._check_view(data)
+            if error:
+                return error
 
-            return {"response": jsonify({"data": response_data}), "code_status": 200}
+            profiles = await self.profile_service.get_profiles_batch_async(data.get("uuids"))
+            return self._batch_result(profiles, data.get("view", "private"), request)
 
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
         except Exception as e:
-            logger.error(f"Profile API - Error fetching profile: {str(e)}")
+            logger.error(f"Profile API - Error fetching profiles batch: {str(e)}")
+            return self._server_error()
+
+    def get_all_profiles(self, request):
+        try:
+            limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+            after = request.args.get("after")
+            profiles, next_cursor = self.profile_service.get_all_profiles(limit, after)
+
+            response_data = [self._private_data(profile) for profile in profiles]
+
             return {
-                "response": jsonify(
-                    {"error": SERVER_ERROR, "detail": "Internal server error"}
-                ),
-                "code_status": 500,
+                "response": jsonify({"data": response_data, "next": next_cursor}),
+                "code_status": 200,
             }
-        
-    def get_all_profiles(self):
-        try:
-            profiles = self.profile_service.get_all_profiles()
-
-            response_data = []
-            for profile in profiles:
-                response_data.append({
-                    "uuid": profile.uuid,
-                    "email": profile.email,
-                    "role": profile.role,
-                    "display_name": profile.display_name,
-                    "location": profile.location,
-                    "birthday": profile.birthday,
-                    "gender": profile.gender,
-                    "description": profile.description,
-                    "display_image": profile.display_image,
-                    "phone": profile.phone,
-                })
-
-            return {"response": jsonify({"data": response_data}), "code_status": 200}
 
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
         except Exception as e:
             logger.error(f"Profile API - Error fetching profiles: {str(e)}")
             return {
@@ -141,108 +152,436 @@ class ProfileController:
                 "code_status": 500,
             }
 
-    def modify_profile(self, request):
+    def search_profiles(self, request):
+        try:
+            limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+            profiles, next_cursor = self.profile_service.search_profiles(
+                request.args.get("q"),
+                request.args.get("role"),
+                limit,
+                request.args.get("after"),
+            )
+
+            response_data = [self._private_data(profile) for profile in profiles]
+
+            return {
+                "response": jsonify({"data": response_data, "next": next_cursor}),
+                "code_status": 200,
+            }
+
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error searching profiles: {str(e)}")
+            return self._server_error()
+
+    def export_profiles(self):
+        """Stream every profile as NDJSON, one private view per line."""
+        profiles = self.profile_service.export_profiles()
+
+        def generate():
+            try:
+                for profile in profiles:
+                    yield current_app.json.dumps(self._private_data(profile)) + "\n"
+            except Exception as e:
+                # Los headers ya se enviaron: se relanza para que el servidor
+                # corte la respuesta y el cliente no la tome por completa
+                logger.error(f"Profile API - Error exporting profiles: {str(e)}")
+                raise
+
+        return {
+            "response": Response(
+                stream_with_context(generate()), mimetype="application/x-ndjson"
+            ),
+            "code_status": 200,
+        }
+
+    async def modify_profile_async(self, request):
         if not request.is_json:
             return {"response": jsonify({"error": BAD_REQUEST}), "code_status": 400}
 
         try:
             data = request.get_json()
-            uuid = data.get("uuid")
-            updates = data.get("updates")
+            error = self._check_modify_request(data)
+            if error:
+                return error
+
+            updated_profile = await self.profile_service.modify_profile_async(
+                data["uuid"], data["updates"]
+            )
+            return self._updated_result(updated_profile, data["updates"])
+
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error modifying profile: {str(e)}")
+            return {"response": jsonify({"error": SERVER_ERROR}), "code_status": 500}
+
+    async def upload_image_async(self, request):
+        error = self._check_upload_request(request)
+        if error:
+            return error
 
-            # Validaciones básicas
-            if not uuid or not updates:
+        try:
+            uuid = request.form['uuid']
+            if self._respond_async(request):
+                job = await self.profile_service.submit_image_async(uuid, request.files['image'])
+                return self._accepted_result(job)
+            url = await self.profile_service.add_image_async(uuid, request.files['image'])
+            logger.info(f"Image saved in Google Cloud Storage ")
+            return self._uploaded_result(uuid, url)
+
+        except ImageTooLarge as e:
+            return self._too_large(e, "/upload")
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error uploading image: {str(e)}")
+            return self._server_error()
+
+    def create_direct_upload(self, request):
+        if not request.is_json:
+            return {"response": jsonify({"error": BAD_REQUEST}), "code_status": 400}
+
+        try:
+            data = request.get_json()
+            if not data.get("uuid") or not data.get("content_type") or "size" not in data:
                 return {
-                    "response": jsonify({"error": "UUID and updates are required"}),
+                    "response": get_error_json("Missing fields", "uuid, content_type and size are required", "/upload/direct", "POST"),
                     "code_status": 400,
                 }
 
-            # Campos no modificables
-            if "email" in updates or "password" in updates:
+            key, url, headers = self.profile_service.create_direct_upload(
+                data["uuid"], data["content_type"], data["size"]
+            )
+            return {
+                "response": jsonify({
+                    "key": key,
+                    "upload_url": url,
+                    "method": "PUT",
+                    "headers": headers,
+                    "expires_in": int(DIRECT_UPLOAD_EXPIRATION.total_seconds()),
+                }),
+                "code_status": 200,
+            }
+
+        except ImageTooLarge as e:
+            return self._too_large(e, "/upload/direct")
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error signing direct upload: {str(e)}")
+            return self._server_error()
+
+    def complete_direct_upload(self, request):
+        if not request.is_json:
+            return {"response": jsonify({"error": BAD_REQUEST}), "code_status": 400}
+
+        try:
+            data = request.get_json()
+            if not data.get("uuid") or not data.get("key"):
                 return {
-                    "response": jsonify(
-                        {"error": "Email and password cannot be modified"}
-                    ),
+                    "response": get_error_json("Missing fields", "uuid and key are required", "/upload/direct/complete", "POST"),
                     "code_status": 400,
                 }
 
-            # Validar campos permitidos
-            allowed_fields = [
-                "display_name",
-                "location",
-                "birthday",
-                "gender",
-                "description",
-                "display_image",
-                "phone",
-            ]
-            for field in updates.keys():
-                if field not in allowed_fields:
-                    return {
-                        "response": jsonify(
-                            {"error": f"Field '{field}' cannot be modified"}
-                        ),
-                        "code_status": 400,
-                    }
+            url = self.profile_service.complete_direct_upload(data["uuid"], data["key"])
+            logger.info(f"Direct upload completed")
+            return self._uploaded_result(data["uuid"], url)
+
+        except FileNotFoundError:
+            return {
+                "response": get_error_json("Upload not found", "Nothing was uploaded to this key, or it was already completed", "/upload/direct/complete", "POST"),
+                "code_status": 404,
+            }
+        except ImageTooLarge as e:
+            return self._too_large(e, "/upload/direct/complete")
+        except ValueError as e:
+            return self._bad_request(e)
+        except TimeoutError as e:
+            return self._unavailable(e)
+        except Exception as e:
+            logger.error(f"Profile API - Error completing direct upload: {str(e)}")
+            return self._server_error()
+
+    def put_stored_file(self, key, request):
+        """PUT target of direct uploads when storage is local."""
+        if not self.profile_service.storage.serves_files or not key.startswith("uploads/"):
+            return {
+                "response": get_error_json("Not found", f"Cannot upload to {key}", f"/storage/{key}", "PUT"),
+                "code_status": 404,
+            }
+
+        try:
+            self.profile_service.storage.put(key, request.stream, request.content_length, request.mimetype)
+            return {"response": jsonify({"key": key}), "code_status": 200}
+        except FileNotFoundError:
+            return {
+                "response": get_error_json("Not found", f"Cannot upload to {key}", f"/storage/{key}", "PUT"),
+                "code_status": 404,
+            }
+
+    def get_upload_job(self, job_id):
+        job = self.profile_service.get_upload_job(job_id)
+        if job is None:
+            return {
+                "response": get_error_json("Upload job not found", f"No upload job {job_id}", f"/upload/jobs/{job_id}"),
+                "code_status": 404,
+            }
+
+        response = jsonify(self._job_data(job))
+        if not job.finished:
+            response.headers["Retry-After"] = "1"
+        return {"response": response, "code_status": 200}
+
+    def get_stored_file(self, key):
+        storage = self.profile_service.storage
+        try:
+            if not storage.serves_files:
+                raise FileNotFoundError(key)
+            stream = storage.stream(key)
+        except FileNotFoundError:
+            return {
+                "response": get_error_json("File not found", f"No stored file {key}", f"/storage/{key}"),
+                "code_status": 404,
+            }
+
+        mimetype = mimetypes.guess_type(key)[0] or "application/octet-stream"
+        response = send_file(stream, mimetype=mimetype)
+        # Las keys son el hash del contenido: nunca cambian
+        response.headers["Cache-Control"] = VARIANT_CACHE_CONTROL
+        return {"response": response, "code_status": 200}
 
-            # Validar rol si está presente
-            if "role" in updates:
-                valid_roles = ["student", "teacher", "admin"]
-                if updates["role"] not in valid_roles:
-                    return {
-                        "response": jsonify(
-                            {
-                                "error": "Invalid role",
-                                "detail": f"Role must be one of: {', '.join(valid_roles)}",
-                            }
-                        ),
-                        "code_status": 400,
+    # Validaciones de request compartidas por las variantes sync y async
+
+    def _check_role(self, profile_data):
+        valid_roles = ["student", "teacher", "admin"]
+        if "role" in profile_data and profile_data["role"] not in valid_roles:
+            return {
+                "response": jsonify(
+                    {
+                        "error": "Invalid role",
+                        "detail": f"Role must be one of: {', '.join(valid_roles)}",
                     }
+                ),
+                "code_status": 400,
+            }
+        return None
 
-            # Actualizar el perfil
-            updated_profile = self.profile_service.modify_profile(uuid, updates)
+    def _check_list_body(self, data, field):
+        # El body puede ser cualquier JSON: una lista o un número no tienen .get()
+        if not isinstance(data, dict) or not isinstance(data.get(field), list):
+            return {
+                "response": jsonify(
+                    {
+                        "error": BAD_REQUEST,
+                        "detail": f"Body must be an object with a list of {field}",
+                    }
+                ),
+                "code_status": 400,
+            }
+        return None
 
+    def _check_view(self, data):
+        if data.get("view", "private") not in ("public", "private"):
             return {
                 "response": jsonify(
                     {
-                        "message": "Profile updated successfully",
-                        "data": {
-                            "uuid": updated_profile.uuid,
-                            "updated_fields": updates,
-                        },
+                        "error": BAD_REQUEST,
+                        "detail": "view must be one of: public, private",
                     }
                 ),
-                "code_status": 200,
+                "code_status": 400,
             }
+        return None
 
-        except ValueError as e:
+    def _check_modify_request(self, data):
+        uuid = data.get("uuid")
+        updates = data.get("updates")
+
+        # Validaciones básicas
+        if not uuid or not updates:
             return {
-                "response": jsonify({"error": BAD_REQUEST, "detail": str(e)}),
+                "response": jsonify({"error": "UUID and updates are required"}),
                 "code_status": 400,
             }
-        except Exception as e:
-            logger.error(f"Profile API - Error modifying profile: {str(e)}")
-            return {"response": jsonify({"error": SERVER_ERROR}), "code_status": 500}
 
-    def upload_image(self, request):
+        # Campos no modificables
+        if "email" in updates or "password" in updates:
+            return {
+                "response": jsonify(
+                    {"error": "Email and password cannot be modified"}
+                ),
+                "code_status": 400,
+            }
+
+        # Validar campos permitidos
+        allowed_fields = [
+            "display_name",
+            "location",
+            "birthday",
+            "gender",
+            "description",
+            "display_image",
+            "phone",
+        ]
+        for field in updates.keys():
+            if field not in allowed_fields:
+                return {
+                    "response": jsonify(
+                        {"error": f"Field '{field}' cannot be modified"}
+                    ),
+                    "code_status": 400,
+                }
+
+        # Validar rol si está presente
+        if "role" in updates:
+            return self._check_role(updates)
+        return None
+
+    def _check_upload_request(self, request):
         if 'uuid' not in request.form or 'image' not in request.files:
             return {
                 "response": get_error_json("Image and UUID are required", "Missing image or UUID in the request", "/upload", "POST"),
                 "code_status": 400,
             }
 
-        uuid = request.form['uuid']
-        image = request.files['image']
-
-        if image.filename == '':
+        if request.files['image'].filename == '':
             return {
                 "response": get_error_json("No selected file", "Missing image.filename in the request", "/upload", "POST"),
                 "code_status": 400,
             }
+        return None
+
+    # Respuestas compartidas
+
+    def _created_result(self, profile_data):
+        return {
+            "response": jsonify({"message": PROFILE_CREATED, "data": profile_data}),
+            "code_status": 201,
+        }
+
+    def _profile_result(self, uuid, profile, public_view):
+        if not profile:
+            return {
+                "response": jsonify(
+                    {
+                        "type": "about:blank",
+                        "title": PROFILE_NOT_FOUND,
+                        "status": 404,
+                        "detail": f"Profile with UUID {uuid} not found",
+                        "instance": f"/profiles/{uuid}",
+                    }
+                ),
+                "code_status": 404,
+            }
+
+        if public_view and profile.updated_at and self.public_body_cache is not None:
+            return self._public_result(profile)
+
+        if public_view:
+            response_data = self._public_data(profile)
+        else:
+            response_data = self._private_data(profile)
+
+        response = jsonify({"data": response_data})
+        if profile.updated_at:
+            response.set_etag(self._profile_etag(profile.uuid, profile.updated_at, public_view))
+        self._set_cache_control(response, public_view)
+        return {"response": response, "code_status": 200}
+
+    def _public_result(self, profile):
+        """
+        Public view served from pre-rendered bytes. The key includes
+        updated_at, so an update renders a new body on its first read.
+        """
+        key = f"{profile.uuid}:{profile.updated_at.isoformat()}"
+        rendered = self.public_body_cache.get(key)
+        if rendered is None:
+            body = jsonify({"data": self._public_data(profile)}).get_data()
+            etag = self._profile_etag(profile.uuid, profile.updated_at, True)
+            # Los headers también van ya armados: parsearlos cuesta tanto como el JSON
+            rendered = (body, {"ETag": quote_etag(etag), "Cache-Control": PUBLIC_CACHE_CONTROL})
+            self.public_body_cache.set(key, rendered)
+
+        body, headers = rendered
+        response = Response(body, mimetype="application/json", headers=headers)
+        return {"response": response, "code_status": 200}
+
+    def _batch_result(self, profiles, view, request=None):
+        public_view = view == "public"
+        etag = self._batch_etag(profiles, public_view)
+        # Excepción deliberada a RFC 9110 §13.1.2 (412 para métodos que no son
+        # GET/HEAD): el POST del batch es solo una lectura, y se trata como un GET
+        if etag and request is not None and request.if_none_match.contains_weak(etag):
+            return self._not_modified(etag, public_view)
+
+        project = self._public_data if public_view else self._private_data
+        response_data = {
+            uuid: project(profile) if profile else None
+            for uuid, profile in profiles.items()
+        }
+        missing = [uuid for uuid, profile in profiles.items() if not profile]
+
+        response = jsonify({"data": response_data, "missing": missing})
+        if etag:
+            response.set_etag(etag)
+        self._set_cache_control(response, public_view)
+        return {"response": response, "code_status": 200}
+
+    def _profile_etag(self, uuid, updated_at, public_view):
+        # Cada vista es una representación distinta: su ETag también
+        view = "public" if public_view else "private"
+        key = f"{uuid}:{updated_at.isoformat()}:{view}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def _batch_etag(self, profiles, public_view):
+        """ETag of a batch response, or None if some profile has no updated_at."""
+        parts = []
+        for uuid, profile in profiles.items():
+            if profile and not profile.updated_at:
+                return None
+            parts.append(f"{uuid}:{profile.updated_at.isoformat() if profile else '-'}")
+        parts.append("public" if public_view else "private")
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def _set_cache_control(self, response, public_view):
+        if public_view:
+            response.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
+        else:
+            # Datos privados: solo el cliente los guarda y siempre revalida
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
 
-        url = self.profile_service.add_image(uuid, image)
-        logger.info(f"Image saved in Google Cloud Storage ")
+    def _not_modified(self, etag, public_view):
+        response = Response(status=304)
+        response.set_etag(etag)
+        self._set_cache_control(response, public_view)
+        return {"response": response, "code_status": 304}
 
+    def _updated_result(self, updated_profile, updates):
+        return {
+            "response": jsonify(
+                {
+                    "message": "Profile updated successfully",
+                    "data": {
+                        "uuid": updated_profile.uuid,
+                        "updated_fields": updates,
+                    },
+                }
+            ),
+            "code_status": 200,
+        }
+
+    def _uploaded_result(self, uuid, url):
         return {
             "response": jsonify({
                 "message": "Image uploaded",
@@ -251,3 +590,83 @@ class ProfileController:
             }),
             "code_status": 200,
         }
+
+    def _respond_async(self, request):
+        # Prefer: respond-async (RFC 7240); sin upload jobs se sube en el request
+        if "respond-async" not in request.headers.get("Prefer", ""):
+            return False
+        return self.profile_service.accepts_background_uploads()
+
+    def _accepted_result(self, job):
+        logger.info(f"Image upload queued as job {job.id}")
+        response = jsonify({"message": "Image upload accepted", **self._job_data(job)})
+        response.headers["Location"] = f"/upload/jobs/{job.id}"
+        response.headers["Preference-Applied"] = "respond-async"
+        return {"response": response, "code_status": 202}
+
+    def _job_data(self, job):
+        return {
+            "job_id": job.id,
+            "uuid": job.uuid,
+            "status": job.status,
+            "url": job.url,
+            "error": job.error,
+            "created_at": job.created_at.isoformat(),
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    def _too_large(self, error, url):
+        return {
+            "response": get_error_json("Image too large", str(error), url, "POST"),
+            "code_status": 413,
+        }
+
+    def _bad_request(self, error):
+        return {
+            "response": jsonify({"error": BAD_REQUEST, "detail": str(error)}),
+            "code_status": 400,
+        }
+
+    def _server_error(self):
+        return {
+            "response": jsonify(
+                {"error": SERVER_ERROR, "detail": "Internal server error"}
+            ),
+            "code_status": 500,
+        }
+
+    def _unavailable(self, error):
+        # Deadline vencido o pool agotado: fallar rápido para que el cliente reintente
+        logger.warning(f"Profile API - Request timed out: {str(error)}")
+        response = jsonify({"error": SERVICE_UNAVAILABLE, "detail": str(error)})
+        response.headers["Retry-After"] = "1"
+        return {"response": response, "code_status": 503}
+
+    def _public_data(self, profile):
+        # Solo campos públicos
+        return {
+            "role": profile.role,
+            "display_name": profile.display_name,
+            "phone": profile.phone,
+            "birthday": profile.birthday,
+            "gender": profile.gender,
+            "description": profile.description,
+            "display_image": profile.display_image,
+            "image_variants": profile.image_variants,
+        }
+
+    def _private_data(self, profile):
+        # Todos los campos (vista privada)
+        return {
+            "uuid": profile.uuid,
+            "email": profile.email,
+            "role": profile.role,
+            "display_name": profile.display_name,
+            "location": profile.location,
+            "birthday": profile.birthday,
+            "gender": profile.gender,
+            "description": profile.description,
+            "display_image": profile.display_image,
+            "image_variants": profile.image_variants,
+            "phone": profile.phone,
+        }
@@ -1,9 +1,16 @@
 # tests/api_test.py
+import asyncio
+import io
 import pytest
 import uuid
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from flask import Flask, jsonify, Response
 from src.domain.profile import Profile
+from src.infrastructure.persistence.profiles_repository import (
+    PROFILE_COLUMNS,
+    PROFILE_FIELDS,
+    profile_row,
+)
 from src.headers import (
     PROFILE_CREATED,
     PROFILE_NOT_FOUND,
@@ -13,7 +20,7 @@ from src.headers import (
 )
 
 # Mockear todo antes de importar
-with patch('src.infrastructure.persistence.base_entity.BaseEntity.connect_with_retries', return_value=MagicMock()), \
+with patch('psycopg.Connection.connect', return_value=MagicMock()), \
         patch('google.cloud.storage.Client', return_value=MagicMock()):
     from src.app import profiles_app
 
@@ -70,18 +77,37 @@ class TestAPIEndpoints:
         with patch('src.app.profile_controller') as mock_controller:
             # Usamos app.app_context() para poder usar jsonify
             with app.app_context():
-                mock_controller.create_profile.return_value = {
+                mock_controller.create_profile_async = AsyncMock(return_value={
                     "response": jsonify({
                         "message": PROFILE_CREATED,
                         "data": sample_profile_data
                     }),
                     "code_status": 201
-                }
+                })
 
             response = client.post("/profiles", json=sample_profile_data)
             assert response.status_code == 201
             assert response.json["message"] == PROFILE_CREATED
 
+    def test_get_public_profile_conditional(self, client, sample_profile_data):
+        from datetime import datetime
+        from src.app import profile_controller
+
+        profile = Profile(**sample_profile_data, updated_at=datetime(2025, 5, 1, 12, 30))
+        service = profile_controller.profile_service
+        with patch.object(service, "get_specific_profile_async", AsyncMock(return_value=profile)), \
+                patch.object(service, "get_profile_version_async", AsyncMock(return_value=profile.updated_at)):
+            first = client.get(f"/profiles/public/{profile.uuid}")
+            second = client.get(
+                f"/profiles/public/{profile.uuid}",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        assert first.status_code == 200
+        assert "max-age=60" in first.headers["Cache-Control"]
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+
     def test_get_all_profiles_success(self, app, client, sample_profile_list):
         with patch('src.app.profile_controller') as mock_controller:
             # Preparar datos de respuesta
@@ -104,6 +130,22 @@ class TestAPIEndpoints:
             assert response.status_code == 200
             assert len(response.json["data"]) == 2
 
+    def test_upload_too_large_is_rejected_before_parsing(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", 1024)
+        with patch('src.app.profile_controller.profile_service') as mock_service:
+            response = client.post("/upload", data={
+                "uuid": "123",
+                "image": (io.BytesIO(b"\0" * 4096), "big.png"),
+            })
+
+            assert response.status_code == 413
+            assert response.json["title"] == "Request too large"
+            mock_service.add_image_async.assert_not_called()
+
+    def test_get_unknown_upload_job(self, client):
+        response = client.get("/upload/jobs/does-not-exist")
+        assert response.status_code == 404
+
 # [Mantener el resto de los tests...]
 
 # Tests para ProfileService
@@ -118,9 +160,10 @@ class TestProfileService:
         mock_repo.return_value.get_profiles.return_value = sample_profile_list
         service = ProfileService(mock_repo.return_value)
 
-        result = service.get_all_profiles()
+        result, next_cursor = service.get_all_profiles()
         assert len(result) == 2
         assert isinstance(result[0], Profile)
+        assert next_cursor is None
 
     @patch('src.infrastructure.persistence.profiles_repository.ProfilesRepository')
     def test_get_all_profiles_empty(self, mock_repo):
@@ -130,14 +173,37 @@ class TestProfileService:
         mock_repo.return_value.get_profiles.return_value = []
         service = ProfileService(mock_repo.return_value)
 
-        result = service.get_all_profiles()
+        result, next_cursor = service.get_all_profiles()
         assert result == []
+        assert next_cursor is None
 
 # Tests para ProfilesRepository
 
 
+def profile_values(profile_data):
+    """Fila de la DB en el orden de PROFILE_COLUMNS"""
+    return tuple(profile_data.get(column) for column in PROFILE_COLUMNS)
+
+
+def mock_profile_cursor(mock_conn, rows):
+    """Cursor falso que aplica el row_factory pedido sobre `rows`"""
+    mock_cursor = MagicMock()
+    mock_cursor.__enter__.return_value = mock_cursor
+
+    def cursor(*args, row_factory=None, **kwargs):
+        make_row = row_factory(mock_cursor) if row_factory else tuple
+        made = [make_row(row) for row in rows]
+        mock_cursor.fetchall.return_value = made
+        mock_cursor.fetchone.return_value = made[0] if made else None
+        mock_cursor.__iter__.return_value = iter(made)
+        return mock_cursor
+
+    mock_conn.cursor.side_effect = cursor
+    return mock_cursor
+
+
 class TestProfilesRepository:
-    @patch('psycopg.connect')
+    @patch('psycopg.Connection.connect')
     def test_get_profiles_success(self, mock_connect, sample_profile_data):
         """Test para obtener perfiles desde el repositorio"""
         from src.infrastructure.persistence.profiles_repository import ProfilesRepository
@@ -152,36 +218,189 @@ class TestProfilesRepository:
             "display_image": "test.jpg"
         }
 
-        mock_conn = mock_connect.return_value
-        mock_cursor = mock_conn.cursor.return_value
-        mock_cursor.fetchall.return_value = [
-            tuple(complete_data.values()),
-            tuple({**complete_data, "uuid": str(uuid.uuid4())}.values())
-        ]
-        mock_cursor.description = [(k,) for k in complete_data.keys()]
+        mock_cursor = mock_profile_cursor(mock_connect.return_value, [
+            profile_values(complete_data),
+            profile_values({**complete_data, "uuid": str(uuid.uuid4())})
+        ])
 
         repo = ProfilesRepository()
-        result = repo.get_profiles()
+        result = repo.get_profiles(10)
 
         assert len(result) == 2
         assert isinstance(result[0], Profile)
-        mock_cursor.execute.assert_called_once_with(
-            "SELECT * FROM profiles", ())
+        assert result[0].display_image == "test.jpg"
+        query, params = mock_cursor.execute.call_args[0]
+        assert query == f"SELECT {PROFILE_FIELDS} FROM profiles ORDER BY created_at, uuid LIMIT %s"
+        assert params == (10,)
+        assert mock_cursor.execute.call_args[1] == {"prepare": True}
 
-    @patch('psycopg.connect')
+    @patch('psycopg.Connection.connect')
     def test_get_profiles_empty(self, mock_connect):
         """Test para repositorio vacío"""
         from src.infrastructure.persistence.profiles_repository import ProfilesRepository
 
         mock_conn = mock_connect.return_value
         mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.__enter__.return_value = mock_cursor
         mock_cursor.fetchall.return_value = []
 
         repo = ProfilesRepository()
-        result = repo.get_profiles()
+        result = repo.get_profiles(10)
 
         assert result == []
 
+    @patch('psycopg.Connection.connect')
+    def test_get_profile_updated_at(self, mock_connect, sample_profile_data):
+        """Test para la consulta liviana que valida ETags"""
+        from datetime import datetime
+        from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.__enter__.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = (datetime(2025, 5, 1),)
+
+        repo = ProfilesRepository()
+        result = repo.get_profile_updated_at(sample_profile_data["uuid"])
+
+        assert result == datetime(2025, 5, 1)
+        query, params = mock_cursor.execute.call_args[0]
+        assert query == "SELECT updated_at FROM profiles WHERE uuid = %s"
+        assert params == (sample_profile_data["uuid"],)
+
+    @patch('psycopg.Connection.connect')
+    def test_search_profiles_ranked(self, mock_connect, sample_profile_data):
+        """Test para la búsqueda por trigramas y prefijo de email"""
+        from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+
+        mock_cursor = mock_profile_cursor(mock_connect.return_value, [
+            profile_values(sample_profile_data) + (0.75,)
+        ])
+
+        repo = ProfilesRepository()
+        result = repo.search_profiles("Te_st%", role="student", limit=11)
+
+        profile, score = result[0]
+        assert isinstance(profile, Profile)
+        assert profile.uuid == sample_profile_data["uuid"]
+        assert score == 0.75
+        query, params = mock_cursor.execute.call_args[0]
+        assert "display_name %% %(q)s" in query
+        assert "AND role = %(role)s" in query
+        assert "after_uuid" not in query
+        # Los comodines de LIKE que manda el usuario se escapan
+        assert params["pattern"] == "%Te\\_st\\%%"
+        assert params["email_prefix"] == "te\\_st\\%%"
+        assert params["limit"] == 11
+
+    @patch('psycopg.Connection.connect')
+    def test_iter_profiles_uses_server_side_cursor(self, mock_connect, sample_profile_data):
+        """Test para exportar perfiles con un cursor con nombre"""
+        from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+
+        mock_conn = mock_connect.return_value
+        mock_cursor = mock_profile_cursor(mock_conn, [
+            profile_values(sample_profile_data),
+            profile_values({**sample_profile_data, "uuid": str(uuid.uuid4())})
+        ])
+
+        repo = ProfilesRepository()
+        result = list(repo.iter_profiles(itersize=500))
+
+        assert len(result) == 2
+        assert result[0].uuid == sample_profile_data["uuid"]
+        assert mock_conn.cursor.call_args[1]["name"] == "profiles_export"
+        assert mock_cursor.itersize == 500
+
+    @patch('psycopg.Connection.connect')
+    def test_insert_profiles_copies_into_staging(self, mock_connect, sample_profile_data):
+        """Test para la carga masiva con COPY en una única transacción"""
+        from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+
+        mock_conn = mock_connect.return_value
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.__enter__.return_value = mock_cursor
+        mock_copy = mock_cursor.copy.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [(uuid.UUID(sample_profile_data["uuid"]),)]
+        second = {"uuid": str(uuid.uuid4()), "email": "b@example.com", "role": "teacher"}
+
+        repo = ProfilesRepository()
+        created = repo.insert_profiles([sample_profile_data, second])
+
+        assert created == {sample_profile_data["uuid"]}
+        assert mock_copy.write_row.call_count == 2
+        # Los opcionales ausentes viajan como NULL
+        assert mock_copy.write_row.call_args[0][0][:4] == [
+            second["uuid"], "b@example.com", "teacher", None]
+        assert "ON CONFLICT (uuid) DO NOTHING" in mock_cursor.execute.call_args[0][0]
+        mock_conn.transaction.assert_called_once()
+
+    @patch('psycopg.Connection.connect')
+    def test_insert_profile_conflict_returns_none(self, mock_connect, sample_profile_data):
+        """Test para insert con ON CONFLICT: sin fila retornada ya existía"""
+        from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+
+        mock_conn = mock_connect.return_value
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.__enter__.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = None
+
+        repo = ProfilesRepository()
+
+        assert repo.insert_profile(sample_profile_data) is None
+        assert "ON CONFLICT (uuid) DO NOTHING" in mock_cursor.execute.call_args[0][0]
+        mock_cursor.execute.assert_called_once()
+
+    def test_profile_row_builds_profile(self, sample_profile_data):
+        """Test para el row factory: tupla en orden de PROFILE_COLUMNS -> Profile"""
+        make_row = profile_row(MagicMock())
+
+        profile = make_row(profile_values({**sample_profile_data, "updated_at": "now"}))
+
+        for field in PROFILE_COLUMNS:
+            expected = sample_profile_data.get(field, "now" if field == "updated_at" else None)
+            assert getattr(profile, field) == expected
+
+    @patch('psycopg.Connection.connect')
+    def test_get_profile_not_found(self, mock_connect):
+        """Test para un UUID inexistente"""
+        from src.infrastructure.persistence.profiles_repository import ProfilesRepository
+
+        mock_cursor = mock_profile_cursor(mock_connect.return_value, [])
+
+        repo = ProfilesRepository()
+
+        assert repo.get_profile(uuid.uuid4()) is None
+        assert mock_cursor.execute.call_args[1] == {"prepare": True}
+
+    @patch('psycopg.AsyncConnection.connect', new_callable=AsyncMock)
+    def test_async_get_profile_runs_on_db_loop(self, mock_connect, sample_profile_data):
+        """Test para el repositorio async: se puede await desde otro event loop"""
+        from src.infrastructure.persistence.async_profiles_repository import AsyncProfilesRepository
+
+        mock_conn = mock_connect.return_value
+        mock_conn.closed = False
+        mock_conn.broken = False
+        mock_conn.cursor = MagicMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.__aenter__.return_value = mock_cursor
+
+        def cursor(row_factory=None):
+            mock_cursor.fetchone.return_value = row_factory(mock_cursor)(
+                profile_values(sample_profile_data))
+            return mock_cursor
+
+        mock_conn.cursor.side_effect = cursor
+
+        repo = AsyncProfilesRepository()
+        try:
+            profile = asyncio.run(repo.get_profile(sample_profile_data["uuid"]))
+        finally:
+            repo.close()
+
+        assert isinstance(profile, Profile)
+        assert profile.email == sample_profile_data["email"]
+        assert mock_cursor.execute.await_args[1] == {"prepare": True}
+
 # Tests para ProfileController
 
 
@@ -193,10 +412,10 @@ class TestProfileController:
 
         with app.app_context():
             mock_service = MagicMock(spec=ProfileService)
-            mock_service.get_all_profiles.return_value = sample_profile_list
+            mock_service.get_all_profiles.return_value = (sample_profile_list, None)
 
             controller = ProfileController(mock_service)
-            result = controller.get_all_profiles()
+            result = controller.get_all_profiles(MagicMock(args={}))
 
             assert result["code_status"] == 200
             assert len(result["response"].json["data"]) == 2
@@ -211,7 +430,7 @@ class TestProfileController:
             mock_service.get_all_profiles.side_effect = Exception("DB Error")
 
             controller = ProfileController(mock_service)
-            result = controller.get_all_profiles()
+            result = controller.get_all_profiles(MagicMock(args={}))
 
             assert result["code_status"] == 500
             assert "Internal server error" in result["response"].json["detail"]
@@ -1,5 +1,6 @@
 # tests/conftest.py
 import pytest
+from psycopg.pq import TransactionStatus
 from unittest.mock import patch, MagicMock
 import os
 
@@ -8,10 +9,14 @@ import os
 
 @pytest.fixture(autouse=True)
 def mock_db_connection():
-    with patch("src.infrastructure.persistence.base_entity.psycopg.connect") as mock_connect:
+    with patch("psycopg.Connection.connect") as mock_connect:
         # Configurar mock de conexión y cursor
         mock_conn = MagicMock()
+        mock_conn.closed = False
+        mock_conn.broken = False
+        mock_conn.pgconn.transaction_status = TransactionStatus.IDLE
         mock_cursor = MagicMock()
+        mock_cursor.__enter__.return_value = mock_cursor
         mock_conn.cursor.return_value = mock_cursor
         mock_connect.return_value = mock_conn
         yield
@@ -44,8 +49,9 @@ def set_env_vars():
 @pytest.fixture
 def app():
     # Mockear todo antes de importar la app
-    with patch("src.infrastructure.persistence.base_entity.BaseEntity.connect_with_retries"), \
+    with patch("psycopg.Connection.connect") as mock_connect, \
             patch("google.cloud.storage.Client"):
+        mock_connect.return_value.pgconn.transaction_status = TransactionStatus.IDLE
         from src.app import profiles_app
         app = profiles_app
         app.config['TESTING'] = True
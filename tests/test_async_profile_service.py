@@ -0,0 +1,155 @@
+# tests/test_async_profile_service.py
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.application.async_profile_service import AsyncProfileService
+from src.domain.profile import Profile
+from src.infrastructure.cache.lru_cache import LRUCache
+
+
+@pytest.fixture
+def mock_repo():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_async_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def service(mock_repo, mock_async_repo):
+    return AsyncProfileService(mock_repo, mock_async_repo)
+
+
+@pytest.fixture
+def sample_profile_data():
+    return {
+        "uuid": "123e4567-e89b-12d3-a456-426614174000",
+        "email": "test@example.com",
+        "role": "student",
+        "display_name": "Test User",
+        "phone": "+1234567890",
+        "location": "Test City",
+        "birthday": "2000-01-01",
+        "gender": "other",
+        "description": "Test description",
+        "display_image": "test.jpg"
+    }
+
+# Tests para create_profile_async
+
+
+def test_create_profile_async_success(service, mock_repo, mock_async_repo, sample_profile_data):
+    mock_async_repo.insert_profile.return_value = Profile(**sample_profile_data)
+
+    profile = asyncio.run(service.create_profile_async(sample_profile_data))
+
+    assert profile.uuid == sample_profile_data["uuid"]
+    mock_async_repo.insert_profile.assert_awaited_once_with(sample_profile_data)
+    mock_repo.insert_profile.assert_not_called()
+
+
+def test_create_profile_async_already_exists(service, mock_async_repo, sample_profile_data):
+    mock_async_repo.insert_profile.return_value = None
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(service.create_profile_async(sample_profile_data))
+    assert "Profile already exists" in str(excinfo.value)
+
+
+def test_create_profile_async_invalid_role(service, mock_async_repo):
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(service.create_profile_async(
+            {"uuid": "123", "email": "test@example.com", "role": "invalid_role"}))
+    assert "Invalid role" in str(excinfo.value)
+    mock_async_repo.insert_profile.assert_not_awaited()
+
+# Tests para lecturas
+
+
+def test_get_specific_profile_async(service, mock_async_repo, sample_profile_data):
+    mock_async_repo.get_profile.return_value = Profile(**sample_profile_data)
+
+    profile = asyncio.run(service.get_specific_profile_async("123"))
+
+    assert profile.email == sample_profile_data["email"]
+    mock_async_repo.get_profile.assert_awaited_once_with("123")
+
+
+def test_get_profiles_batch_async_marks_misses(service, mock_async_repo, sample_profile_data):
+    missing_uuid = "00000000-0000-0000-0000-000000000000"
+    mock_async_repo.get_profiles_by_uuids.return_value = [Profile(**sample_profile_data)]
+
+    result = asyncio.run(service.get_profiles_batch_async(
+        [sample_profile_data["uuid"], missing_uuid]))
+
+    assert result[sample_profile_data["uuid"]].uuid == sample_profile_data["uuid"]
+    assert result[missing_uuid] is None
+
+# Tests para modify_profile_async
+
+
+def test_modify_profile_async_not_found(service, mock_async_repo):
+    mock_async_repo.update_profile.return_value = None
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(service.modify_profile_async("123", {"display_name": "New Name"}))
+    assert "Profile not found" in str(excinfo.value)
+
+
+def test_modify_profile_async_protected_field(service, mock_async_repo):
+    with pytest.raises(ValueError) as excinfo:
+        asyncio.run(service.modify_profile_async("123", {"email": "new@example.com"}))
+    assert "Cannot modify protected field" in str(excinfo.value)
+    mock_async_repo.update_profile.assert_not_awaited()
+
+# Tests para add_image_async
+
+
+def test_add_image_async_runs_upload_in_thread(service):
+    with patch.object(service, "add_image", return_value="http://example.com/image.jpg") as add_image:
+        url = asyncio.run(service.add_image_async("123", MagicMock()))
+
+    assert url == "http://example.com/image.jpg"
+    add_image.assert_called_once()
+
+# Tests para el cache en el camino async
+
+
+def test_async_get_uses_cache_filled_by_create(mock_repo, mock_async_repo, sample_profile_data):
+    service = AsyncProfileService(mock_repo, mock_async_repo, LRUCache(max_size=10))
+    mock_async_repo.insert_profile.return_value = Profile(**sample_profile_data)
+
+    async def scenario():
+        await service.create_profile_async(sample_profile_data)
+        return await service.get_specific_profile_async(sample_profile_data["uuid"])
+
+    profile = asyncio.run(scenario())
+
+    assert profile.uuid == sample_profile_data["uuid"]
+    mock_async_repo.get_profile.assert_not_awaited()
+
+
+def test_async_get_negative_cache(mock_repo, mock_async_repo):
+    service = AsyncProfileService(
+        mock_repo, mock_async_repo, missing_cache=LRUCache(max_size=10, ttl=5))
+    mock_async_repo.replicas = []
+    mock_async_repo.get_profile.return_value = None
+
+    async def scenario():
+        await service.get_specific_profile_async("123")
+        return await service.get_specific_profile_async("123")
+
+    assert asyncio.run(scenario()) is None
+    mock_async_repo.get_profile.assert_awaited_once_with("123")
+
+
+def test_async_replica_miss_confirmed_on_primary(mock_repo, mock_async_repo):
+    service = AsyncProfileService(
+        mock_repo, mock_async_repo, missing_cache=LRUCache(max_size=10, ttl=5))
+    mock_async_repo.replicas = ["replica"]
+    mock_async_repo.get_profile_updated_at.return_value = None
+
+    assert asyncio.run(service.get_profile_version_async("123")) is None
+
+    assert mock_async_repo.get_profile_updated_at.await_args_list[-1].kwargs == {"primary": True}
+    assert service._known_missing("123")
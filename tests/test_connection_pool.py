@@ -0,0 +1,107 @@
+# tests/test_connection_pool.py
+import asyncio
+import pytest
+from psycopg.pq import TransactionStatus
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.infrastructure.persistence.connection_pool import (
+    AsyncConnectionPool,
+    ConnectionPool,
+    PoolTimeout,
+)
+
+
+def make_connection(mock_class=MagicMock):
+    conn = mock_class()
+    conn.closed = False
+    conn.broken = False
+    conn.pgconn.transaction_status = TransactionStatus.IDLE
+    return conn
+
+
+@pytest.fixture
+def connect():
+    with patch("psycopg.Connection.connect", side_effect=lambda *a, **k: make_connection()) as connect:
+        yield connect
+
+
+@pytest.fixture
+def async_connect():
+    with patch(
+        "psycopg.AsyncConnection.connect",
+        new_callable=AsyncMock,
+        side_effect=lambda *a, **k: make_connection(AsyncMock),
+    ) as connect:
+        yield connect
+
+# Tests para ConnectionPool
+
+
+def test_pool_reuses_released_connection(connect):
+    with ConnectionPool("", min_size=1, max_size=2, open=True) as pool:
+        pool.wait()
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+    assert first is second
+    assert connect.call_count == 1
+
+
+def test_pool_timeout_is_a_timeout_error(connect):
+    with ConnectionPool("", min_size=1, max_size=1, open=True) as pool:
+        pool.getconn()
+
+        with pytest.raises(PoolTimeout) as error:
+            pool.getconn(timeout=0.05)
+
+    assert isinstance(error.value, TimeoutError)
+
+
+def test_pool_pings_only_idle_connections(connect):
+    with ConnectionPool("", min_size=1, max_size=1, check_idle=60, open=True) as pool:
+        pool.wait()
+        with pool.connection() as conn:
+            pass
+        with pool.connection():
+            pass
+        conn.execute.assert_not_called()
+
+        pool.check_idle = 0
+        with pool.connection():
+            pass
+        conn.execute.assert_called_once_with("")
+
+# Tests para AsyncConnectionPool
+
+
+def test_async_pool_opens_on_first_checkout(async_connect):
+    pool = AsyncConnectionPool("", min_size=1, max_size=1)
+    assert async_connect.call_count == 0
+
+    async def scenario():
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            pass
+        await pool.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first is second
+    assert async_connect.call_count == 1
+
+
+def test_async_pool_timeout_is_a_timeout_error(async_connect):
+    pool = AsyncConnectionPool("", min_size=1, max_size=1)
+
+    async def scenario():
+        try:
+            await pool.getconn()
+            await pool.getconn(timeout=0.05)
+        finally:
+            await pool.close()
+
+    with pytest.raises(PoolTimeout):
+        asyncio.run(scenario())
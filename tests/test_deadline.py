@@ -0,0 +1,172 @@
+# tests/test_deadline.py
+import asyncio
+import time
+import psycopg
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src import deadline
+from src.deadline import DeadlineExceeded, with_deadline
+from src.infrastructure.persistence.base_entity import RESET_TIMEOUTS, SET_TIMEOUTS, BaseEntity
+from src.infrastructure.persistence.connection_pool import PoolTimeout
+from src.infrastructure.persistence.query_metrics import QueryMetrics
+from src.presentation.profile_controller import ProfileController
+
+# Tests para deadline
+
+
+def test_no_deadline_by_default():
+    assert deadline.remaining() is None
+    assert deadline.check() is None
+
+
+def test_nested_deadline_keeps_the_earliest():
+    with deadline.deadline(0.5):
+        with deadline.deadline(60):
+            assert deadline.remaining() <= 0.5
+    assert deadline.remaining() is None
+
+
+def test_check_raises_when_expired():
+    with deadline.deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            deadline.check()
+
+
+def test_with_deadline_async_view(monkeypatch):
+    monkeypatch.setenv("REQUEST_DEADLINE_SECONDS", "2")
+
+    @with_deadline
+    async def view():
+        await asyncio.sleep(0)
+        return deadline.remaining()
+
+    left = asyncio.run(view())
+
+    assert 0 < left <= 2
+    assert deadline.remaining() is None
+
+# Tests para BaseEntity con deadline
+
+
+def test_connection_sets_statement_timeout_from_budget():
+    entity = BaseEntity()
+
+    with deadline.deadline(1.5):
+        with entity.connection() as conn:
+            query, (statement_timeout, lock_timeout) = conn.execute.call_args[0]
+
+    assert query == SET_TIMEOUTS
+    assert 0 < int(statement_timeout) <= 1500
+    assert lock_timeout == statement_timeout
+
+
+def test_pool_reset_restores_only_shortened_connections():
+    entity = BaseEntity()
+    shortened, untouched = MagicMock(), MagicMock()
+
+    with deadline.deadline(1.5):
+        entity._apply_deadline(shortened)
+    entity._reset_timeouts(shortened)
+    entity._reset_timeouts(shortened)
+    entity._reset_timeouts(untouched)
+
+    shortened.execute.assert_called_with(RESET_TIMEOUTS)
+    assert shortened.execute.call_count == 2
+    untouched.execute.assert_not_called()
+
+
+def test_budget_above_session_default_sets_nothing(monkeypatch):
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+    entity = BaseEntity()
+
+    with deadline.deadline(60):
+        with entity.connection() as conn:
+            pass
+
+    conn.execute.assert_not_called()
+    assert entity.pool.kwargs["options"] == "-c statement_timeout=5000 -c lock_timeout=5000"
+
+
+def test_connection_without_deadline_sets_nothing():
+    entity = BaseEntity()
+
+    with entity.connection() as conn:
+        pass
+
+    conn.execute.assert_not_called()
+
+
+def test_pool_wait_capped_by_deadline():
+    entity = BaseEntity()
+    entity.pool = MagicMock()
+
+    with deadline.deadline(0.2):
+        with entity.connection():
+            pass
+
+    (timeout,), _ = entity.pool.connection.call_args
+    assert timeout <= 0.2
+
+
+def test_query_canceled_becomes_deadline_exceeded():
+    entity = BaseEntity()
+    cursor = MagicMock()
+    cursor.execute.side_effect = psycopg.errors.QueryCanceled("canceling statement")
+
+    with pytest.raises(DeadlineExceeded):
+        entity.execute(cursor, "get_profile", "SELECT 1")
+
+
+def test_copy_is_timed_and_canceled_copy_becomes_deadline_exceeded():
+    entity = BaseEntity()
+    entity.metrics = QueryMetrics()
+    cursor = MagicMock()
+    cursor.rowcount = 2
+
+    with entity.copy(cursor, "insert_profiles_copy", "COPY t FROM STDIN") as copy:
+        copy.write_row([1])
+    cursor.copy.return_value.__exit__.side_effect = psycopg.errors.QueryCanceled("canceling")
+    with pytest.raises(DeadlineExceeded):
+        with entity.copy(cursor, "insert_profiles_copy", "COPY t FROM STDIN"):
+            pass
+
+    assert entity.metrics.snapshot()["insert_profiles_copy"]["duration_ms"]["count"] == 1
+
+
+def test_expired_deadline_skips_the_query():
+    entity = BaseEntity()
+    cursor = MagicMock()
+
+    with deadline.deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            entity.execute(cursor, "get_profile", "SELECT 1")
+
+    cursor.execute.assert_not_called()
+
+# Tests para respuestas 503
+
+
+@pytest.mark.parametrize("error", [DeadlineExceeded("Request deadline exceeded"), PoolTimeout("pool exhausted")])
+def test_controller_timeout_returns_503(error):
+    mock_service = MagicMock()
+    mock_service.get_specific_profile_async = AsyncMock(side_effect=error)
+    controller = ProfileController(mock_service)
+
+    result = asyncio.run(controller.get_specific_profiles_async("uuid"))
+
+    assert result["code_status"] == 503
+    assert result["response"].headers["Retry-After"] == "1"
+
+
+def test_route_returns_503_when_deadline_expires(client, monkeypatch):
+    monkeypatch.setenv("REQUEST_DEADLINE_SECONDS", "0.05")
+
+    def slow_get(uuid):
+        time.sleep(0.1)
+        deadline.check()
+
+    with patch("src.app.profile_controller.profile_service.get_specific_profile_async",
+               AsyncMock(side_effect=lambda uuid: slow_get(uuid))):
+        response = client.get("/profiles/123e4567-e89b-12d3-a456-426614174000")
+
+    assert response.status_code == 503
@@ -0,0 +1,102 @@
+# tests/test_image_processing.py
+import io
+import threading
+import pytest
+from PIL import Image
+from src.application.image_processing import (
+    FORMATS,
+    VARIANTS,
+    ImageQueueFull,
+    ImageWorkers,
+    render_variants,
+    variant_key,
+)
+from src.application.image_upload import ImageTooLarge
+
+
+def make_image(size, mode="RGB", image_format="PNG"):
+    body = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else "red").save(body, image_format)
+    return body.getvalue()
+
+# Tests para render_variants
+
+
+def test_render_variants_sizes_and_formats():
+    rendered = list(render_variants(make_image((3200, 1600), image_format="JPEG")))
+
+    assert len(rendered) == len(VARIANTS) * len(FORMATS)
+    sizes = {}
+    for variant, ext, content_type, body in rendered:
+        with Image.open(io.BytesIO(body)) as image:
+            assert image.format == {"webp": "WEBP", "jpg": "JPEG"}[ext]
+            assert content_type == f"image/{image.format.lower()}"
+            sizes[variant] = image.size
+    assert sizes == {"full": (1600, 800), "card": (480, 240), "thumbnail": (128, 64)}
+
+
+def test_render_variants_checks_pixels_before_decoding(monkeypatch):
+    monkeypatch.setattr("src.application.image_upload.MAX_IMAGE_PIXELS", 100)
+
+    with pytest.raises(ImageTooLarge):
+        next(render_variants(make_image((20, 20))))
+
+
+def test_render_variants_never_upscales():
+    rendered = list(render_variants(make_image((100, 50))))
+
+    for _, _, _, body in rendered:
+        with Image.open(io.BytesIO(body)) as image:
+            assert image.size == (100, 50)
+
+
+def test_render_variants_flattens_transparency():
+    rendered = dict(
+        ((variant, ext), body) for variant, ext, _, body in render_variants(make_image((64, 64), "RGBA"))
+    )
+
+    with Image.open(io.BytesIO(rendered[("card", "jpg")])) as image:
+        assert image.mode == "RGB"
+
+
+def test_variant_keys_are_deterministic():
+    assert variant_key("abc", "card", "webp") == "images/abc/card.webp"
+
+# Tests para ImageWorkers
+
+
+def test_workers_run_jobs():
+    workers = ImageWorkers(workers=2, max_pending=4)
+    try:
+        assert workers.submit(lambda x: x * 2, 21).result(timeout=2) == 42
+    finally:
+        workers.shutdown()
+
+
+def test_workers_bound_pending_jobs():
+    workers = ImageWorkers(workers=1, max_pending=1, queue_timeout=0.05)
+    release = threading.Event()
+    try:
+        workers.submit(release.wait)
+
+        with pytest.raises(ImageQueueFull):
+            workers.submit(lambda: None)
+
+        release.set()
+    finally:
+        release.set()
+        workers.shutdown()
+
+
+def test_failed_job_frees_its_slot():
+    workers = ImageWorkers(workers=1, max_pending=1, queue_timeout=1)
+
+    def fail():
+        raise ValueError("cannot identify image file")
+
+    try:
+        with pytest.raises(ValueError):
+            workers.submit(fail).result(timeout=2)
+        assert workers.submit(lambda: "ok").result(timeout=2) == "ok"
+    finally:
+        workers.shutdown()
@@ -0,0 +1,89 @@
+# tests/test_lru_cache.py
+import threading
+import pytest
+from unittest.mock import patch
+from src.infrastructure.cache.lru_cache import LRUCache
+
+# Tests para LRU
+
+
+def test_cache_hit_and_miss():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_fill_never_overwrites_a_live_entry():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", "written")
+
+    assert not cache.fill("a", "read before the write")
+    assert cache.fill("b", "read")
+    assert cache.get("a") == "written"
+    assert cache.get("b") == "read"
+
+
+def test_cache_keys_are_normalized():
+    cache = LRUCache()
+    cache.set(123, "profile")
+
+    assert cache.get("123") == "profile"
+    cache.delete(123)
+    assert len(cache) == 0
+
+
+def test_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(max_size=0)
+
+# Tests para TTL
+
+
+def test_cache_entry_expires():
+    cache = LRUCache(ttl=10)
+    with patch("src.infrastructure.cache.lru_cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("src.infrastructure.cache.lru_cache.time.monotonic", return_value=109.0):
+        assert cache.get("a") == 1
+    with patch("src.infrastructure.cache.lru_cache.time.monotonic", return_value=110.0):
+        assert cache.get("a") is None
+
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_cache_concurrent_writers_stay_bounded():
+    cache = LRUCache(max_size=50)
+
+    def writer(offset):
+        for i in range(500):
+            cache.set(offset + i, i)
+            cache.get(offset + i // 2)
+
+    threads = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats["size"] == 50
+    assert stats["evictions"] == 8 * 500 - 50
@@ -1,10 +1,18 @@
 # tests/test_profile_controller.py
+import asyncio
+import json
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime
 from flask import jsonify
+from werkzeug.datastructures import ETags
 from src.presentation.profile_controller import ProfileController
-from src.application.profile_service import ProfileService
+from src.application.image_upload import ImageTooLarge
+from src.application.upload_jobs import UploadJob
+from src.application.async_profile_service import AsyncProfileService
+from src.application.profile_service import DEFAULT_PAGE_SIZE
 from src.domain.profile import Profile
+from src.infrastructure.cache.lru_cache import LRUCache
 from src.headers import (
     PROFILE_CREATED,
     PROFILE_NOT_FOUND,
@@ -18,7 +26,7 @@ from src.headers import (
 
 @pytest.fixture
 def mock_service():
-    return MagicMock(spec=ProfileService)
+    return MagicMock(spec=AsyncProfileService)
 
 
 @pytest.fixture
@@ -44,13 +52,13 @@ def test_create_profile_success(mock_service, sample_profile_data):
     mock_request = MagicMock()
     mock_request.is_json = True
     mock_request.get_json.return_value = sample_profile_data
-    mock_service.create_profile.return_value = Profile(**sample_profile_data)
+    mock_service.create_profile_async.return_value = Profile(**sample_profile_data)
 
-    result = controller.create_profile(mock_request)
+    result = asyncio.run(controller.create_profile_async(mock_request))
 
     assert result["code_status"] == 201
     assert PROFILE_CREATED in str(result["response"].data)
-    mock_service.create_profile.assert_called_once_with(sample_profile_data)
+    mock_service.create_profile_async.assert_called_once_with(sample_profile_data)
 
 
 def test_create_profile_invalid_json(mock_service):
@@ -58,7 +66,7 @@ def test_create_profile_invalid_json(mock_service):
     mock_request = MagicMock()
     mock_request.is_json = False
 
-    result = controller.create_profile(mock_request)
+    result = asyncio.run(controller.create_profile_async(mock_request))
 
     assert result["code_status"] == 400
     assert BAD_REQUEST in str(result["response"].data)
@@ -69,23 +77,78 @@ def test_create_profile_existing_user(mock_service, sample_profile_data):
     mock_request = MagicMock()
     mock_request.is_json = True
     mock_request.get_json.return_value = sample_profile_data
-    mock_service.create_profile.side_effect = ValueError(
+    mock_service.create_profile_async.side_effect = ValueError(
         "Profile already exists for this user")
 
-    result = controller.create_profile(mock_request)
+    result = asyncio.run(controller.create_profile_async(mock_request))
 
     assert result["code_status"] == 400
     assert "Profile already exists" in str(result["response"].data)
 
+# Tests para create_profiles
+
+
+def test_create_profiles_all_created(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"profiles": [sample_profile_data]}
+    mock_service.create_profiles.return_value = ([sample_profile_data["uuid"]], [])
+
+    result = controller.create_profiles(mock_request)
+
+    assert result["code_status"] == 201
+    assert result["response"].json["created"] == [sample_profile_data["uuid"]]
+
+
+def test_create_profiles_partial(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"profiles": [sample_profile_data, {}]}
+    errors = [{"index": 1, "uuid": None, "error": "Missing required fields: uuid"}]
+    mock_service.create_profiles.return_value = ([sample_profile_data["uuid"]], errors)
+
+    result = controller.create_profiles(mock_request)
+
+    assert result["code_status"] == 200
+    assert result["response"].json["errors"] == errors
+
+
+def test_create_profiles_invalid_payload(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"profiles": "nope"}
+    mock_service.create_profiles.side_effect = ValueError(
+        "profiles must be a non-empty list")
+
+    result = controller.create_profiles(mock_request)
+
+    assert result["code_status"] == 400
+
+
+@pytest.mark.parametrize("body", [[1, 2], "profiles", None])
+def test_create_profiles_body_not_an_object(mock_service, body):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = body
+
+    result = controller.create_profiles(mock_request)
+
+    assert result["code_status"] == 400
+    mock_service.create_profiles.assert_not_called()
+
 # Tests para get_specific_profiles
 
 
 def test_get_private_profile_success(mock_service, sample_profile_data):
     controller = ProfileController(mock_service)
     profile = Profile(**sample_profile_data)
-    mock_service.get_specific_profile.return_value = profile
+    mock_service.get_specific_profile_async.return_value = profile
 
-    result = controller.get_specific_profiles(profile.uuid, public_view=False)
+    result = asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=False))
 
     assert result["code_status"] == 200
     # Email visible en vista privada
@@ -95,9 +158,9 @@ def test_get_private_profile_success(mock_service, sample_profile_data):
 def test_get_public_profile_success(mock_service, sample_profile_data):
     controller = ProfileController(mock_service)
     profile = Profile(**sample_profile_data)
-    mock_service.get_specific_profile.return_value = profile
+    mock_service.get_specific_profile_async.return_value = profile
 
-    result = controller.get_specific_profiles(profile.uuid, public_view=True)
+    result = asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=True))
 
     assert result["code_status"] == 200
     # Email no visible en vista pública
@@ -106,10 +169,10 @@ def test_get_public_profile_success(mock_service, sample_profile_data):
 
 def test_get_profile_not_found(mock_service):
     controller = ProfileController(mock_service)
-    mock_service.get_specific_profile.return_value = None
+    mock_service.get_specific_profile_async.return_value = None
 
-    result = controller.get_specific_profiles(
-        "invalid-uuid", public_view=False)
+    result = asyncio.run(controller.get_specific_profiles_async(
+        "invalid-uuid", public_view=False))
 
     assert result["code_status"] == 404
     assert PROFILE_NOT_FOUND in str(result["response"].data)
@@ -124,22 +187,267 @@ def test_get_all_profiles_success(mock_service, sample_profile_data):
         Profile(**{**sample_profile_data, "uuid": "456",
                 "email": "test2@example.com"})
     ]
-    mock_service.get_all_profiles.return_value = profiles
+    mock_service.get_all_profiles.return_value = (profiles, "next-cursor")
+    mock_request = MagicMock()
+    mock_request.args = {"limit": "2"}
 
-    result = controller.get_all_profiles()
+    result = controller.get_all_profiles(mock_request)
 
     assert result["code_status"] == 200
     assert len(result["response"].json["data"]) == 2
+    assert result["response"].json["next"] == "next-cursor"
+    mock_service.get_all_profiles.assert_called_once_with(2, None)
 
 
 def test_get_all_profiles_empty(mock_service):
     controller = ProfileController(mock_service)
-    mock_service.get_all_profiles.return_value = []
+    mock_service.get_all_profiles.return_value = ([], None)
+    mock_request = MagicMock()
+    mock_request.args = {}
 
-    result = controller.get_all_profiles()
+    result = controller.get_all_profiles(mock_request)
 
     assert result["code_status"] == 200
     assert len(result["response"].json["data"]) == 0
+    assert result["response"].json["next"] is None
+
+
+def test_get_all_profiles_invalid_limit(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.args = {"limit": "many"}
+
+    result = controller.get_all_profiles(mock_request)
+
+    assert result["code_status"] == 400
+    mock_service.get_all_profiles.assert_not_called()
+
+# Tests para search_profiles
+
+
+def test_search_profiles_success(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    mock_service.search_profiles.return_value = ([Profile(**sample_profile_data)], None)
+    mock_request = MagicMock()
+    mock_request.args = {"q": "test", "role": "student"}
+
+    result = controller.search_profiles(mock_request)
+
+    assert result["code_status"] == 200
+    assert result["response"].json["data"][0]["email"] == sample_profile_data["email"]
+    assert result["response"].json["next"] is None
+    mock_service.search_profiles.assert_called_once_with(
+        "test", "student", DEFAULT_PAGE_SIZE, None)
+
+
+def test_search_profiles_invalid_query(mock_service):
+    controller = ProfileController(mock_service)
+    mock_service.search_profiles.side_effect = ValueError("q must have between 3 and 100 characters")
+    mock_request = MagicMock()
+    mock_request.args = {"q": "a"}
+
+    result = controller.search_profiles(mock_request)
+
+    assert result["code_status"] == 400
+
+# Tests para get_profiles_batch
+
+
+def test_get_profiles_batch_public_view(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {
+        "uuids": [sample_profile_data["uuid"], "missing-uuid"],
+        "view": "public"
+    }
+    mock_service.get_profiles_batch_async.return_value = {
+        sample_profile_data["uuid"]: Profile(**sample_profile_data),
+        "missing-uuid": None,
+    }
+
+    result = asyncio.run(controller.get_profiles_batch_async(mock_request))
+
+    body = result["response"].json
+    assert result["code_status"] == 200
+    assert body["missing"] == ["missing-uuid"]
+    assert body["data"]["missing-uuid"] is None
+    # Email no visible en vista pública
+    assert "email" not in body["data"][sample_profile_data["uuid"]]
+
+
+def test_get_profiles_batch_invalid_view(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"uuids": ["123"], "view": "admin"}
+
+    result = asyncio.run(controller.get_profiles_batch_async(mock_request))
+
+    assert result["code_status"] == 400
+    mock_service.get_profiles_batch_async.assert_not_called()
+
+
+@pytest.mark.parametrize("body", [["123"], {"uuids": "123"}, 5])
+def test_get_profiles_batch_rejects_malformed_body(mock_service, body):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = body
+
+    result = asyncio.run(controller.get_profiles_batch_async(mock_request))
+
+    assert result["code_status"] == 400
+    mock_service.get_profiles_batch_async.assert_not_called()
+
+# Tests para ETags y pedidos condicionales
+
+
+def conditional_request(*etags):
+    mock_request = MagicMock()
+    mock_request.if_none_match = ETags(list(etags))
+    return mock_request
+
+
+def test_get_public_profile_sets_etag_and_cache_control(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    profile = Profile(**sample_profile_data, updated_at=datetime(2025, 5, 1, 12, 30))
+    mock_service.get_specific_profile_async.return_value = profile
+
+    result = asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=True))
+
+    response = result["response"]
+    assert result["code_status"] == 200
+    assert response.get_etag() == (controller._profile_etag(profile.uuid, profile.updated_at, True), False)
+    assert response.cache_control.public
+    assert response.cache_control.max_age == 60
+
+
+def test_public_and_private_views_have_different_etags(mock_service):
+    controller = ProfileController(mock_service)
+    updated_at = datetime(2025, 5, 1, 12, 30)
+
+    assert controller._profile_etag("123", updated_at, True) != controller._profile_etag("123", updated_at, False)
+
+
+def test_get_profile_not_modified_skips_full_read(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    updated_at = datetime(2025, 5, 1, 12, 30)
+    etag = controller._profile_etag(sample_profile_data["uuid"], updated_at, False)
+    mock_service.get_profile_version_async = AsyncMock(return_value=updated_at)
+    mock_service.get_specific_profile_async = AsyncMock()
+
+    result = asyncio.run(controller.get_specific_profiles_async(
+        sample_profile_data["uuid"], request=conditional_request(etag)))
+
+    assert result["code_status"] == 304
+    assert result["response"].get_data() == b""
+    assert result["response"].cache_control.no_cache
+    mock_service.get_specific_profile_async.assert_not_awaited()
+
+
+def test_get_profile_changed_returns_body(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    profile = Profile(**sample_profile_data, updated_at=datetime(2025, 5, 2))
+    mock_service.get_profile_version_async.return_value = profile.updated_at
+    mock_service.get_specific_profile_async.return_value = profile
+
+    result = asyncio.run(controller.get_specific_profiles_async(
+        profile.uuid, request=conditional_request("stale-etag")))
+
+    assert result["code_status"] == 200
+    assert result["response"].json["data"]["email"] == profile.email
+
+
+def test_post_batch_answers_304_like_a_get(mock_service, sample_profile_data):
+    # Deliberado: el POST del batch es una lectura, un ETag que coincide da 304 y no 412
+    controller = ProfileController(mock_service)
+    profiles = {
+        sample_profile_data["uuid"]: Profile(**sample_profile_data, updated_at=datetime(2025, 5, 1)),
+        "missing-uuid": None,
+    }
+    mock_service.get_profiles_batch_async.return_value = profiles
+    mock_request = conditional_request(controller._batch_etag(profiles, True))
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"uuids": list(profiles), "view": "public"}
+
+    result = asyncio.run(controller.get_profiles_batch_async(mock_request))
+
+    assert result["code_status"] == 304
+
+# Tests para la vista pública pre-renderizada
+
+
+def test_public_view_rendered_once(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service, LRUCache(max_size=10, ttl=float("inf")))
+    profile = Profile(**sample_profile_data, updated_at=datetime(2025, 5, 1, 12, 30))
+    mock_service.get_specific_profile_async.return_value = profile
+
+    first = asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=True))
+    with patch("src.presentation.profile_controller.jsonify") as mock_jsonify:
+        second = asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=True))
+
+    mock_jsonify.assert_not_called()
+    assert second["code_status"] == 200
+    assert second["response"].get_data() == first["response"].get_data()
+    assert second["response"].headers["ETag"] == first["response"].headers["ETag"]
+    assert second["response"].json["data"]["display_name"] == "Test User"
+    assert "email" not in second["response"].json["data"]
+
+
+def test_public_view_rerendered_after_update(mock_service, sample_profile_data):
+    controller = ProfileController(mock_service, LRUCache(max_size=10, ttl=float("inf")))
+    profile = Profile(**sample_profile_data, updated_at=datetime(2025, 5, 1))
+    mock_service.get_specific_profile_async.return_value = profile
+    asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=True))
+
+    updated = Profile(**{**sample_profile_data, "display_name": "Nuevo nombre"},
+                      updated_at=datetime(2025, 5, 2))
+    mock_service.get_specific_profile_async.return_value = updated
+    result = asyncio.run(controller.get_specific_profiles_async(profile.uuid, public_view=True))
+
+    assert result["response"].json["data"]["display_name"] == "Nuevo nombre"
+
+# Tests para export_profiles
+
+
+def test_export_profiles_streams_ndjson(app, mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+    profiles = [
+        Profile(**sample_profile_data),
+        Profile(**{**sample_profile_data, "uuid": "456",
+                "email": "test2@example.com"})
+    ]
+    mock_service.export_profiles.return_value = iter(profiles)
+
+    with app.test_request_context("/profiles/export"):
+        result = controller.export_profiles()
+        lines = [json.loads(line) for line in result["response"].response]
+
+    assert result["code_status"] == 200
+    assert result["response"].mimetype == "application/x-ndjson"
+    assert [line["uuid"] for line in lines] == [sample_profile_data["uuid"], "456"]
+    assert lines[1]["email"] == "test2@example.com"
+
+
+def test_export_profiles_stops_on_error(app, mock_service, sample_profile_data):
+    controller = ProfileController(mock_service)
+
+    def failing_export():
+        yield Profile(**sample_profile_data)
+        raise Exception("DB Error")
+
+    mock_service.export_profiles.return_value = failing_export()
+
+    with app.test_request_context("/profiles/export"):
+        result = controller.export_profiles()
+        lines = iter(result["response"].response)
+        first = next(lines)
+
+        with pytest.raises(Exception, match="DB Error"):
+            next(lines)
+
+    assert json.loads(first)["uuid"] == sample_profile_data["uuid"]
 
 # Tests para modify_profile
 
@@ -155,9 +463,9 @@ def test_modify_profile_success(mock_service, sample_profile_data):
     }
     updated_profile = Profile(
         **{**sample_profile_data, "display_name": "New Name"})
-    mock_service.modify_profile.return_value = updated_profile
+    mock_service.modify_profile_async.return_value = updated_profile
 
-    result = controller.modify_profile(mock_request)
+    result = asyncio.run(controller.modify_profile_async(mock_request))
 
     assert result["code_status"] == 200
     assert PROFILE_UPDATED in str(result["response"].data)
@@ -172,10 +480,10 @@ def test_modify_profile_invalid_field(mock_service, sample_profile_data):
         "uuid": sample_profile_data["uuid"],
         "updates": {"invalid_field": "value"}
     }
-    mock_service.modify_profile.side_effect = ValueError(
+    mock_service.modify_profile_async.side_effect = ValueError(
         "Field 'invalid_field' cannot be modified")
 
-    result = controller.modify_profile(mock_request)
+    result = asyncio.run(controller.modify_profile_async(mock_request))
 
     assert result["code_status"] == 400
     response_data = result["response"].get_json()
@@ -190,14 +498,29 @@ def test_modify_profile_not_found(mock_service):
         "uuid": "invalid-uuid",
         "updates": {"display_name": "New Name"}
     }
-    mock_service.modify_profile.side_effect = ValueError("Profile not found")
+    mock_service.modify_profile_async.side_effect = ValueError("Profile not found")
 
-    result = controller.modify_profile(mock_request)
+    result = asyncio.run(controller.modify_profile_async(mock_request))
 
     # El controlador actual devuelve 400, no 404
     assert result["code_status"] == 400
     assert "Profile not found" in str(result["response"].data)
 
+def test_modify_profile_unknown_field_skips_service(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {
+        "uuid": "123",
+        "updates": {"invalid_field": "value"}
+    }
+    mock_service.modify_profile_async = AsyncMock()
+
+    result = asyncio.run(controller.modify_profile_async(mock_request))
+
+    assert result["code_status"] == 400
+    mock_service.modify_profile_async.assert_not_awaited()
+
 # Tests para upload_image
 
 
@@ -208,9 +531,9 @@ def test_upload_image_success(mock_service):
     mock_file = MagicMock()
     mock_file.filename = "test.jpg"
     mock_request.files = {"image": mock_file}
-    mock_service.add_image.return_value = "http://example.com/image.jpg"
+    mock_service.add_image_async.return_value = "http://example.com/image.jpg"
 
-    result = controller.upload_image(mock_request)
+    result = asyncio.run(controller.upload_image_async(mock_request))
 
     assert result["code_status"] == 200
     assert "image.jpg" in str(result["response"].data)
@@ -222,7 +545,7 @@ def test_upload_image_missing_uuid(mock_service):
     mock_request.form = {}
     mock_request.files = {"image": MagicMock()}
 
-    result = controller.upload_image(mock_request)
+    result = asyncio.run(controller.upload_image_async(mock_request))
 
     assert result["code_status"] == 400
     assert "UUID are required" in str(result["response"].data)
@@ -234,8 +557,150 @@ def test_upload_image_missing_file(mock_service):
     mock_request.form = {"uuid": "123"}
     mock_request.files = {}
 
-    result = controller.upload_image(mock_request)
+    result = asyncio.run(controller.upload_image_async(mock_request))
 
     assert result["code_status"] == 400
     assert "Missing image or UUID" in str(result["response"].data)
 
+
+
+def test_upload_image_too_large(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.form = {"uuid": "123"}
+    mock_request.files = {"image": MagicMock()}
+    mock_service.add_image_async.side_effect = ImageTooLarge("Image too large, max is 5 bytes")
+
+    result = asyncio.run(controller.upload_image_async(mock_request))
+
+    assert result["code_status"] == 413
+    assert "max is 5 bytes" in str(result["response"].data)
+
+
+def test_upload_image_not_an_image(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.form = {"uuid": "123"}
+    mock_request.files = {"image": MagicMock()}
+    mock_service.add_image_async = AsyncMock(side_effect=ValueError("Unsupported image type"))
+
+    result = asyncio.run(controller.upload_image_async(mock_request))
+
+    assert result["code_status"] == 400
+    assert "Unsupported image type" in str(result["response"].data)
+
+# Tests para uploads en segundo plano
+
+
+def test_upload_image_prefer_async_returns_job(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.form = {"uuid": "123"}
+    mock_request.files = {"image": MagicMock()}
+    mock_request.headers = {"Prefer": "respond-async"}
+    mock_service.accepts_background_uploads.return_value = True
+    mock_service.submit_image_async = AsyncMock(return_value=UploadJob("123"))
+    mock_service.add_image_async = AsyncMock()
+
+    result = asyncio.run(controller.upload_image_async(mock_request))
+
+    job_id = result["response"].json["job_id"]
+    assert result["code_status"] == 202
+    assert result["response"].json["status"] == "pending"
+    assert result["response"].headers["Location"] == f"/upload/jobs/{job_id}"
+    mock_service.add_image_async.assert_not_awaited()
+
+
+def test_upload_image_prefer_async_without_jobs_uploads_inline(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.form = {"uuid": "123"}
+    mock_request.files = {"image": MagicMock()}
+    mock_request.headers = {"Prefer": "respond-async"}
+    mock_service.accepts_background_uploads.return_value = False
+    mock_service.add_image_async.return_value = "http://example.com/image.jpg"
+
+    result = asyncio.run(controller.upload_image_async(mock_request))
+
+    assert result["code_status"] == 200
+    mock_service.submit_image_async.assert_not_called()
+
+
+def test_get_upload_job_pending_and_done(mock_service):
+    controller = ProfileController(mock_service)
+    job = UploadJob("123")
+    mock_service.get_upload_job.return_value = job
+
+    pending = controller.get_upload_job(job.id)
+    job.finish(url="http://example.com/image.jpg")
+    done = controller.get_upload_job(job.id)
+
+    assert pending["response"].headers["Retry-After"] == "1"
+    assert done["response"].json["url"] == "http://example.com/image.jpg"
+    assert "Retry-After" not in done["response"].headers
+
+
+def test_get_upload_job_not_found(mock_service):
+    controller = ProfileController(mock_service)
+    mock_service.get_upload_job.return_value = None
+
+    result = controller.get_upload_job("nope")
+
+    assert result["code_status"] == 404
+
+
+# Tests para uploads directos
+
+
+def test_create_direct_upload_success(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"uuid": "123", "content_type": "image/png", "size": 1024}
+    mock_service.create_direct_upload.return_value = (
+        "uploads/123/abc", "https://signed-put", {"Content-Type": "image/png"}
+    )
+
+    result = controller.create_direct_upload(mock_request)
+
+    assert result["code_status"] == 200
+    assert result["response"].json["upload_url"] == "https://signed-put"
+    assert result["response"].json["method"] == "PUT"
+    mock_service.create_direct_upload.assert_called_once_with("123", "image/png", 1024)
+
+
+def test_create_direct_upload_too_large(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"uuid": "123", "content_type": "image/png", "size": 10**9}
+    mock_service.create_direct_upload.side_effect = ImageTooLarge("Image too large, max is 5 bytes")
+
+    result = controller.create_direct_upload(mock_request)
+
+    assert result["code_status"] == 413
+
+
+def test_complete_direct_upload_not_uploaded(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"uuid": "123", "key": "uploads/123/abc"}
+    mock_service.complete_direct_upload.side_effect = FileNotFoundError("uploads/123/abc")
+
+    result = controller.complete_direct_upload(mock_request)
+
+    assert result["code_status"] == 404
+
+
+def test_complete_direct_upload_success(mock_service):
+    controller = ProfileController(mock_service)
+    mock_request = MagicMock()
+    mock_request.is_json = True
+    mock_request.get_json.return_value = {"uuid": "123", "key": "uploads/123/abc"}
+    mock_service.complete_direct_upload.return_value = "http://example.com/image.png"
+
+    result = controller.complete_direct_upload(mock_request)
+
+    assert result["code_status"] == 200
+    assert result["response"].json["url"] == "http://example.com/image.png"
@@ -1,20 +1,61 @@
 # tests/test_profile_service.py
 import pytest
 from unittest.mock import MagicMock, patch
-from src.application.profile_service import ProfileService
+from src.application.profile_service import (
+    ProfileService,
+    MAX_PAGE_SIZE,
+    MAX_BATCH_LOOKUP,
+    MAX_BULK_CREATE,
+)
+from src.application.image_processing import ImageQueueFull, ImageWorkers
+from src.application.upload_jobs import UploadJobs
+from src.application.image_upload import ImageTooLarge, sniff_image
 from src.domain.profile import Profile
+from src.domain.stored_image import StoredImage
+from src.infrastructure.cache.lru_cache import LRUCache
+from src.infrastructure.config.storage_config import StorageConfig
+from src.infrastructure.storage.local_storage import LocalStorage
+from src.infrastructure.storage.storage_backend import StorageBackend
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+import hashlib
+import psycopg
+import io
 import os
-from datetime import timedelta
+import threading
+import uuid as uuid_lib
+from datetime import datetime, timedelta
+
+
+
+def make_png(size=(4, 4)):
+    body = io.BytesIO()
+    Image.new("RGB", size, "blue").save(body, "PNG")
+    return body.getvalue()
+
+
+PNG_BYTES = make_png()
+PNG_SHA256 = hashlib.sha256(PNG_BYTES).hexdigest()
+PROFILE_UUID = "123e4567-e89b-12d3-a456-426614174000"
 
 
 @pytest.fixture
 def mock_repo():
-    return MagicMock()
+    repo = MagicMock()
+    # Índice de imágenes vacío: cada contenido es nuevo
+    repo.get_stored_image.return_value = None
+    repo.insert_stored_image.side_effect = lambda *fields: StoredImage(*fields)
+    return repo
+
+
+@pytest.fixture
+def mock_storage():
+    return MagicMock(spec=StorageBackend)
 
 
 @pytest.fixture
-def service(mock_repo):
-    return ProfileService(mock_repo)
+def service(mock_repo, mock_storage):
+    return ProfileService(mock_repo, storage=mock_storage)
 
 
 @pytest.fixture
@@ -50,6 +91,67 @@ def test_create_profile_invalid_role(service):
         })
     assert "Invalid role" in str(excinfo.value)
 
+# Tests para create_profiles
+
+
+def test_create_profiles_reports_row_errors(service, mock_repo, sample_profile_data):
+    existing_uuid = str(uuid_lib.uuid4())
+    mock_repo.insert_profiles.return_value = {sample_profile_data["uuid"]}
+
+    created, errors = service.create_profiles([
+        sample_profile_data,
+        {"uuid": str(uuid_lib.uuid4()), "email": "x@example.com", "role": "invalid_role"},
+        {**sample_profile_data, "email": "dup@example.com"},
+        {"uuid": existing_uuid, "email": "old@example.com", "role": "teacher"},
+        {"uuid": "not-a-uuid", "email": "y@example.com", "role": "student"},
+    ])
+
+    assert created == [sample_profile_data["uuid"]]
+    assert [error["index"] for error in errors] == [1, 2, 3, 4]
+    assert "Invalid role" in errors[0]["error"]
+    assert errors[1]["error"] == "Duplicated uuid in batch"
+    assert errors[2] == {
+        "index": 3,
+        "uuid": existing_uuid,
+        "error": "Profile already exists for this user.",
+    }
+    # Solo las filas válidas llegan al repositorio, en un único llamado
+    inserted = mock_repo.insert_profiles.call_args[0][0]
+    assert [row["uuid"] for row in inserted] == [sample_profile_data["uuid"], existing_uuid]
+
+
+def test_create_profiles_all_invalid_skips_insert(service, mock_repo):
+    created, errors = service.create_profiles([{"email": "test@example.com"}])
+
+    assert created == []
+    assert "Missing required fields" in errors[0]["error"]
+    mock_repo.insert_profiles.assert_not_called()
+
+
+def test_create_profiles_reports_wrong_types(service, mock_repo, sample_profile_data):
+    mock_repo.insert_profiles.side_effect = lambda rows: {row["uuid"] for row in rows}
+
+    created, errors = service.create_profiles([
+        sample_profile_data,
+        {"uuid": str(uuid_lib.uuid4()), "email": None, "role": "student"},
+        {"uuid": str(uuid_lib.uuid4()), "email": "x@example.com", "role": "student", "phone": 1234},
+        {"uuid": str(uuid_lib.uuid4()), "email": "y@example.com", "role": "student", "birthday": None},
+    ])
+
+    assert len(created) == 2
+    assert [(error["index"], error["error"]) for error in errors] == [
+        (1, "Field email must be a string"),
+        (2, "Field phone must be a string or null"),
+    ]
+    # Las filas con tipos inválidos no llegan al COPY
+    assert len(mock_repo.insert_profiles.call_args[0][0]) == 2
+
+
+def test_create_profiles_too_large(service, mock_repo):
+    with pytest.raises(ValueError) as excinfo:
+        service.create_profiles([{}] * (MAX_BULK_CREATE + 1))
+    assert "Too many profiles" in str(excinfo.value)
+
 # Tests para get_specific_profile
 
 
@@ -58,6 +160,259 @@ def test_get_specific_profile_not_found(service, mock_repo):
     assert service.get_specific_profile("123") is None
     mock_repo.get_profile.assert_called_once_with("123")
 
+
+@pytest.fixture
+def cached_service(mock_repo):
+    return ProfileService(mock_repo, LRUCache(max_size=10, ttl=60))
+
+
+def test_get_specific_profile_served_from_cache(cached_service, mock_repo, sample_profile_data):
+    mock_repo.get_profile.return_value = Profile(**sample_profile_data)
+
+    first = cached_service.get_specific_profile(sample_profile_data["uuid"])
+    second = cached_service.get_specific_profile(uuid_lib.UUID(sample_profile_data["uuid"]))
+
+    assert first is second
+    mock_repo.get_profile.assert_called_once()
+    assert cached_service.profile_cache.stats()["hits"] == 1
+
+
+def test_get_specific_profile_not_found_is_not_cached(cached_service, mock_repo):
+    mock_repo.get_profile.return_value = None
+
+    cached_service.get_specific_profile("123")
+    cached_service.get_specific_profile("123")
+
+    assert mock_repo.get_profile.call_count == 2
+
+
+def test_slow_read_does_not_overwrite_a_concurrent_modify(cached_service, mock_repo, sample_profile_data):
+    stale = Profile(**sample_profile_data)
+    updated = Profile(**{**sample_profile_data, "display_name": "Nuevo nombre"})
+    read_started, modify_done = threading.Event(), threading.Event()
+
+    def slow_get_profile(uuid):
+        read_started.set()
+        modify_done.wait(timeout=5)
+        return stale
+
+    mock_repo.get_profile.side_effect = slow_get_profile
+    mock_repo.update_profile.return_value = updated
+    reader = threading.Thread(
+        target=cached_service.get_specific_profile, args=(sample_profile_data["uuid"],)
+    )
+    reader.start()
+    read_started.wait(timeout=5)
+
+    cached_service.modify_profile(sample_profile_data["uuid"], {"display_name": "Nuevo nombre"})
+    modify_done.set()
+    reader.join(timeout=5)
+
+    assert cached_service.get_specific_profile(sample_profile_data["uuid"]) is updated
+
+
+def test_modify_profile_refreshes_cache(cached_service, mock_repo, sample_profile_data):
+    mock_repo.get_profile.return_value = Profile(**sample_profile_data)
+    cached_service.get_specific_profile(sample_profile_data["uuid"])
+    updated = Profile(**{**sample_profile_data, "display_name": "Nuevo nombre"})
+    mock_repo.update_profile.return_value = updated
+
+    cached_service.modify_profile(sample_profile_data["uuid"], {"display_name": "Nuevo nombre"})
+
+    assert cached_service.get_specific_profile(sample_profile_data["uuid"]) is updated
+    mock_repo.get_profile.assert_called_once()
+
+def test_get_profile_version_prefers_cache(cached_service, mock_repo, sample_profile_data):
+    updated_at = datetime(2025, 5, 1, 12, 30)
+    mock_repo.get_profile.return_value = Profile(**sample_profile_data, updated_at=updated_at)
+    cached_service.get_specific_profile(sample_profile_data["uuid"])
+
+    assert cached_service.get_profile_version(sample_profile_data["uuid"]) == updated_at
+    mock_repo.get_profile_updated_at.assert_not_called()
+
+
+def test_get_profile_version_from_db(service, mock_repo):
+    mock_repo.get_profile_updated_at.return_value = None
+
+    assert service.get_profile_version("123") is None
+    mock_repo.get_profile_updated_at.assert_called_once_with("123")
+
+# Tests para el cache negativo
+
+
+@pytest.fixture
+def negative_service(mock_repo):
+    mock_repo.replicas = []
+    return ProfileService(mock_repo, LRUCache(max_size=10), missing_cache=LRUCache(max_size=10, ttl=5))
+
+
+def test_unknown_profile_answered_from_negative_cache(negative_service, mock_repo):
+    mock_repo.get_profile.return_value = None
+
+    assert negative_service.get_specific_profile("123") is None
+    assert negative_service.get_specific_profile("123") is None
+    assert negative_service.get_profile_version("123") is None
+
+    mock_repo.get_profile.assert_called_once_with("123")
+    mock_repo.get_profile_updated_at.assert_not_called()
+
+
+def test_replica_miss_negative_cached_only_if_primary_confirms(
+    negative_service, mock_repo, sample_profile_data
+):
+    mock_repo.replicas = ["replica"]
+    created = Profile(**sample_profile_data)
+    # La réplica todavía no tiene el perfil recién creado; el primario sí
+    mock_repo.get_profile.side_effect = lambda uuid, primary=False: created if primary else None
+
+    assert negative_service.get_specific_profile(created.uuid) is created
+
+    mock_repo.get_profile.side_effect = None
+    mock_repo.get_profile.return_value = None
+    assert negative_service.get_specific_profile("123") is None
+    mock_repo.get_profile.assert_called_with("123", primary=True)
+    assert negative_service._known_missing("123")
+
+
+def test_create_profile_clears_negative_cache(negative_service, mock_repo, sample_profile_data):
+    mock_repo.get_profile.return_value = None
+    negative_service.get_specific_profile(sample_profile_data["uuid"])
+    mock_repo.insert_profile.return_value = Profile(**sample_profile_data)
+
+    negative_service.create_profile(sample_profile_data)
+
+    assert negative_service.get_specific_profile(sample_profile_data["uuid"]).email == sample_profile_data["email"]
+
+
+def test_bulk_create_clears_negative_cache(negative_service, mock_repo, sample_profile_data):
+    mock_repo.get_profile.return_value = None
+    negative_service.get_specific_profile(sample_profile_data["uuid"])
+    mock_repo.insert_profiles.return_value = {sample_profile_data["uuid"]}
+    negative_service.create_profiles([sample_profile_data])
+    mock_repo.get_profile.return_value = Profile(**sample_profile_data)
+
+    assert negative_service.get_specific_profile(sample_profile_data["uuid"]) is not None
+    assert mock_repo.get_profile.call_count == 2
+
+# Tests para get_all_profiles
+
+
+def test_get_all_profiles_returns_next_cursor(service, mock_repo, sample_profile_data):
+    created_at = datetime(2025, 5, 1, 12, 30, 15, 123456)
+    profiles = [
+        Profile(**{**sample_profile_data, "uuid": str(uuid_lib.uuid4())}, created_at=created_at)
+        for _ in range(3)
+    ]
+    mock_repo.get_profiles.return_value = profiles
+
+    page, next_cursor = service.get_all_profiles(limit=2)
+
+    assert page == profiles[:2]
+    mock_repo.get_profiles.assert_called_once_with(3, None)
+    # El cursor es opaco pero debe volver a la clave del último perfil
+    assert service._decode_cursor(next_cursor) == (created_at, profiles[1].uuid)
+
+
+def test_get_all_profiles_last_page(service, mock_repo, sample_profile_data):
+    mock_repo.get_profiles.return_value = [Profile(**sample_profile_data)]
+
+    page, next_cursor = service.get_all_profiles(limit=2)
+
+    assert len(page) == 1
+    assert next_cursor is None
+
+
+def test_get_all_profiles_caps_page_size(service, mock_repo):
+    mock_repo.get_profiles.return_value = []
+
+    service.get_all_profiles(limit=10_000)
+
+    mock_repo.get_profiles.assert_called_once_with(MAX_PAGE_SIZE + 1, None)
+
+
+def test_get_all_profiles_after_uuid(service, mock_repo, sample_profile_data):
+    mock_repo.get_profiles.return_value = []
+
+    service.get_all_profiles(limit=10, after=sample_profile_data["uuid"])
+
+    mock_repo.get_profiles.assert_called_once_with(11, sample_profile_data["uuid"])
+
+
+def test_get_all_profiles_invalid_cursor(service, mock_repo):
+    with pytest.raises(ValueError) as excinfo:
+        service.get_all_profiles(limit=10, after="not-a-cursor")
+    assert "Invalid pagination cursor" in str(excinfo.value)
+    mock_repo.get_profiles.assert_not_called()
+
+# Tests para search_profiles
+
+
+def test_search_profiles_returns_next_cursor(service, mock_repo, sample_profile_data):
+    results = [
+        (Profile(**{**sample_profile_data, "uuid": str(uuid_lib.uuid4())}), score)
+        for score in (0.9, 0.61803398875, 0.5)
+    ]
+    mock_repo.search_profiles.return_value = results
+
+    page, next_cursor = service.search_profiles(" test ", role="student", limit=2)
+
+    assert page == [profile for profile, _ in results[:2]]
+    mock_repo.search_profiles.assert_called_once_with("test", "student", 3, None)
+    assert service._decode_search_cursor(next_cursor) == (0.61803398875, results[1][0].uuid)
+
+
+def test_search_profiles_last_page(service, mock_repo, sample_profile_data):
+    mock_repo.search_profiles.return_value = [(Profile(**sample_profile_data), 1.0)]
+
+    page, next_cursor = service.search_profiles("test", limit=10_000)
+
+    assert len(page) == 1
+    assert next_cursor is None
+    mock_repo.search_profiles.assert_called_once_with("test", None, MAX_PAGE_SIZE + 1, None)
+
+
+@pytest.mark.parametrize("q, role", [("", None), ("ab", None), ("x" * 101, None), ("test", "guest")])
+def test_search_profiles_invalid_params(service, mock_repo, q, role):
+    with pytest.raises(ValueError):
+        service.search_profiles(q, role=role)
+    mock_repo.search_profiles.assert_not_called()
+
+
+def test_search_profiles_invalid_cursor(service, mock_repo):
+    with pytest.raises(ValueError) as excinfo:
+        service.search_profiles("test", after="not-a-cursor")
+    assert "Invalid pagination cursor" in str(excinfo.value)
+
+# Tests para get_profiles_batch
+
+
+def test_get_profiles_batch_marks_misses(service, mock_repo, sample_profile_data):
+    missing_uuid = str(uuid_lib.uuid4())
+    mock_repo.get_profiles_by_uuids.return_value = [Profile(**sample_profile_data)]
+
+    result = service.get_profiles_batch(
+        [sample_profile_data["uuid"], missing_uuid, sample_profile_data["uuid"]])
+
+    assert list(result.keys()) == [sample_profile_data["uuid"], missing_uuid]
+    assert result[sample_profile_data["uuid"]].email == sample_profile_data["email"]
+    assert result[missing_uuid] is None
+    mock_repo.get_profiles_by_uuids.assert_called_once_with(
+        [sample_profile_data["uuid"], missing_uuid])
+
+
+def test_get_profiles_batch_too_large(service, mock_repo):
+    uuids = [str(uuid_lib.uuid4()) for _ in range(MAX_BATCH_LOOKUP + 1)]
+    with pytest.raises(ValueError) as excinfo:
+        service.get_profiles_batch(uuids)
+    assert "Too many uuids" in str(excinfo.value)
+    mock_repo.get_profiles_by_uuids.assert_not_called()
+
+
+def test_get_profiles_batch_invalid_uuid(service, mock_repo):
+    with pytest.raises(ValueError) as excinfo:
+        service.get_profiles_batch(["not-a-uuid"])
+    assert "valid UUIDs" in str(excinfo.value)
+
 # Tests para modify_profile
 
 
@@ -77,49 +432,342 @@ def test_modify_profile_protected_field(service, mock_repo):
 # Tests para add_image
 
 
-@patch('google.cloud.storage.Client')
-@patch('builtins.open', new_callable=MagicMock)
-def test_add_image_success(MockOpen, MockClient, service, mock_repo):
-    # Configurar mocks
-    mock_bucket = MagicMock()
-    mock_blob = MagicMock()
-    MockClient.from_service_account_json.return_value.bucket.return_value = mock_bucket
-    mock_bucket.blob.return_value = mock_blob
-    mock_blob.generate_signed_url.return_value = "http://example.com/image.jpg"
-
-    # Configurar entorno
-    os.environ['GOOGLE_CREDENTIALS_JSON'] = "{}"
-    os.environ['GCS_BUCKET_NAME'] = "test-bucket"
-
-    # Mock file
-    mock_file = MagicMock()
-    mock_file.filename = "test.jpg"
-    mock_file.content_type = "image/jpeg"
+def test_add_image_success(service, mock_repo, mock_storage):
+    mock_storage.signed_url.return_value = "http://example.com/image.jpg"
+    # Archivo PNG con nombre y content type engañosos
+    file = FileStorage(
+        stream=io.BytesIO(PNG_BYTES), filename="test.jpg", content_type="image/jpeg"
+    )
 
     # Ejecutar
-    url = service.add_image("123", mock_file)
+    url = service.add_image(PROFILE_UUID, file)
 
     # Verificar
+    key = f"images/{PNG_SHA256}.png"
     assert url == "http://example.com/image.jpg"
-    mock_blob.upload_from_file.assert_called_once()
-    mock_blob.generate_signed_url.assert_called_once_with(
-        version="v4",
-        expiration=timedelta(minutes=15),
-        method="GET"
+    mock_storage.put.assert_called_once_with(key, file.stream, len(PNG_BYTES), "image/png")
+    mock_repo.insert_stored_image.assert_called_once_with(
+        PNG_SHA256, key, "image/png", len(PNG_BYTES)
     )
+    mock_storage.signed_url.assert_called_once_with(key, timedelta(minutes=15))
+
+def test_uploads_reject_invalid_uuid_before_storing(background_service):
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png")
+
+    with pytest.raises(ValueError, match="valid UUID"):
+        background_service.add_image("123", file)
+    with pytest.raises(ValueError, match="valid UUID"):
+        background_service.submit_image("not-a-uuid", file)
+    background_service.storage.put.assert_not_called()
+    assert background_service.upload_jobs.stats()["size"] == 0
+
+
+def test_add_image_rejects_non_images(service):
+    file = FileStorage(stream=io.BytesIO(b"%PDF-1.7 ..."), filename="cv.jpg")
+
+    with pytest.raises(ValueError, match="Unsupported image type"):
+        service.add_image(PROFILE_UUID, file)
+
+
+def test_add_image_rejects_oversized_images(service, monkeypatch):
+    monkeypatch.setattr("src.application.image_upload.MAX_IMAGE_BYTES", 64)
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES + b"\0" * 64), filename="big.png")
+
+    with pytest.raises(ImageTooLarge):
+        service.add_image(PROFILE_UUID, file)
+
+
+def test_add_image_rejects_too_many_pixels(service, mock_storage, monkeypatch):
+    monkeypatch.setattr("src.application.image_upload.MAX_IMAGE_PIXELS", 100)
+    file = FileStorage(stream=io.BytesIO(make_png((20, 20))), filename="bomb.png")
+
+    with pytest.raises(ImageTooLarge):
+        service.add_image(PROFILE_UUID, file)
+    mock_storage.put.assert_not_called()
+
+
+def test_private_storage_leaves_profile_images_alone(mock_repo, mock_storage):
+    mock_storage.public_reads = False
+    workers = MagicMock()
+    service = ProfileService(mock_repo, storage=mock_storage, image_workers=workers)
+
+    service.add_image(PROFILE_UUID, FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png"))
+
+    workers.submit.assert_not_called()
+    mock_storage.public_url.assert_not_called()
+    mock_repo.set_profile_images.assert_not_called()
+    mock_storage.signed_url.assert_called_once()
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", ("image/jpeg", ".jpg")),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", ("image/png", ".png")),
+    (b"GIF89a\x01\x00", ("image/gif", ".gif")),
+    (b"RIFF\x24\x00\x00\x00WEBPVP8 ", ("image/webp", ".webp")),
+])
+def test_sniff_image(head, expected):
+    assert sniff_image(head) == expected
 
 # Tests para edge cases
 
 
+def test_modify_display_image_drops_old_variants(service, mock_repo):
+    service.modify_profile("123", {"display_image": "https://example.com/new.png"})
+
+    mock_repo.update_profile.assert_called_once_with(
+        "123", {"display_image": "https://example.com/new.png", "image_variants": None}
+    )
+
+
 def test_modify_profile_not_found(service, mock_repo):
-    mock_repo.profile_exists.return_value = False
+    mock_repo.update_profile.return_value = None
     with pytest.raises(ValueError) as excinfo:
         service.modify_profile("123", {"display_name": "New Name"})
     assert "Profile not found" in str(excinfo.value)
+    mock_repo.profile_exists.assert_not_called()
+
+
+def test_create_profile_already_exists(service, mock_repo, sample_profile_data):
+    mock_repo.insert_profile.return_value = None
+    with pytest.raises(ValueError) as excinfo:
+        service.create_profile(sample_profile_data)
+    assert "Profile already exists" in str(excinfo.value)
+    mock_repo.profile_exists.assert_not_called()
+
+
+def test_create_profile_success(service, mock_repo, sample_profile_data):
+    mock_repo.insert_profile.return_value = Profile(**sample_profile_data)
+
+    profile = service.create_profile(sample_profile_data)
+
+    assert profile.uuid == sample_profile_data["uuid"]
+    mock_repo.insert_profile.assert_called_once_with(sample_profile_data)
 
 
 def test_add_image_missing_env_vars(service):
     os.environ.pop('GOOGLE_CREDENTIALS_JSON', None)
     os.environ.pop('GCS_BUCKET_NAME', None)
     with pytest.raises(Exception):
-        service.add_image("123", MagicMock())
+        service.add_image(PROFILE_UUID, MagicMock())
+
+# Tests para el procesamiento de imágenes
+
+
+def test_add_image_hands_bytes_to_image_workers(mock_repo):
+    workers = MagicMock()
+    service = ProfileService(mock_repo, image_workers=workers, storage=MagicMock())
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png")
+
+    service.add_image(PROFILE_UUID, file)
+
+    workers.submit.assert_called_once_with(service._process_image, PROFILE_UUID, PNG_SHA256, PNG_BYTES)
+
+
+def test_duplicate_upload_reuses_stored_object_and_variants(mock_repo, sample_profile_data):
+    variants = {"card": {"jpg": "https://storage/images/abc/card.jpg"}}
+    mock_repo.get_stored_image.return_value = StoredImage(
+        PNG_SHA256, f"images/{PNG_SHA256}.png", "image/png", len(PNG_BYTES), variants
+    )
+    mock_repo.set_profile_images.return_value = Profile(**sample_profile_data)
+    workers = MagicMock()
+    storage = MagicMock()
+    service = ProfileService(mock_repo, image_workers=workers, storage=storage)
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="same-avatar.png")
+
+    service.add_image(PROFILE_UUID, file)
+
+    storage.put.assert_not_called()
+    storage.signed_url.assert_called_once_with(f"images/{PNG_SHA256}.png", timedelta(minutes=15))
+    workers.submit.assert_not_called()
+    mock_repo.set_profile_images.assert_called_once_with(
+        PROFILE_UUID, "https://storage/images/abc/card.jpg", variants
+    )
+
+
+def test_process_image_stores_variants_and_updates_profile(mock_repo, sample_profile_data):
+    image = io.BytesIO()
+    Image.new("RGB", (800, 600), "blue").save(image, "PNG")
+    storage = MagicMock()
+    storage.public_url.side_effect = lambda key: f"https://storage/{key}"
+    profile = Profile(**sample_profile_data)
+    mock_repo.set_profile_images.return_value = profile
+    service = ProfileService(mock_repo, LRUCache(max_size=10), storage=storage)
+
+    assert service._process_image("123", "abc", image.getvalue()) is profile
+
+    keys = [call.args[0] for call in storage.put.call_args_list]
+    assert sorted(keys) == sorted(
+        f"images/abc/{variant}.{ext}"
+        for variant in ("full", "card", "thumbnail") for ext in ("webp", "jpg")
+    )
+    display_image, variants = mock_repo.set_profile_images.call_args.args[1:]
+    assert display_image == "https://storage/images/abc/card.jpg"
+    assert variants["thumbnail"]["webp"] == "https://storage/images/abc/thumbnail.webp"
+    mock_repo.set_stored_image_variants.assert_called_once_with("abc", variants)
+    assert service.profile_cache.get(profile.uuid) is profile
+
+# Tests para uploads en segundo plano
+
+
+@pytest.fixture
+def background_service(mock_repo, tmp_path):
+    workers = ImageWorkers(workers=1, max_pending=2, queue_timeout=0.05)
+    storage = MagicMock()
+    storage.signed_url.return_value = "http://example.com/123.png"
+    service = ProfileService(
+        mock_repo, image_workers=workers, upload_jobs=UploadJobs(str(tmp_path)), storage=storage
+    )
+    yield service
+    workers.shutdown()
+
+
+def test_submit_image_uploads_in_background(background_service, tmp_path):
+    processed = threading.Event()
+    background_service._process_image = lambda uuid, sha256, data: processed.set()
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png")
+
+    job = background_service.submit_image(PROFILE_UUID, file)
+
+    assert processed.wait(timeout=2)
+    background_service.image_workers.shutdown()
+    assert background_service.get_upload_job(job.id) is job
+    assert (job.status, job.url) == ("done", "http://example.com/123.png")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_background_upload_is_reported(background_service, tmp_path):
+    background_service.storage.put.side_effect = OSError("503 from GCS")
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png")
+
+    job = background_service.submit_image(PROFILE_UUID, file)
+    background_service.image_workers.shutdown()
+
+    assert (job.status, job.error) == ("failed", "Upload failed, try again")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("error, message", [
+    (ImageTooLarge("Image too large, max is 100 pixels"), "Image too large"),
+    (ValueError("cannot write mode P as JPEG"), "Invalid image"),
+    (psycopg.OperationalError("server closed the connection at 10.0.0.7"), "Upload failed, try again"),
+])
+def test_failed_background_upload_hides_exception_text(background_service, error, message):
+    background_service.profile_repository.get_stored_image.side_effect = error
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png")
+
+    job = background_service.submit_image(PROFILE_UUID, file)
+    background_service.image_workers.shutdown()
+
+    assert (job.status, job.error) == ("failed", message)
+
+
+def test_submit_image_full_queue_drops_the_job(background_service, tmp_path):
+    background_service.image_workers = MagicMock()
+    background_service.image_workers.submit.side_effect = ImageQueueFull("Image processing queue is full")
+    file = FileStorage(stream=io.BytesIO(PNG_BYTES), filename="avatar.png")
+
+    with pytest.raises(ImageQueueFull):
+        background_service.submit_image(PROFILE_UUID, file)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_submit_image_requires_upload_jobs(service):
+    assert not service.accepts_background_uploads()
+    with pytest.raises(ValueError):
+        service.submit_image(PROFILE_UUID, FileStorage(stream=io.BytesIO(PNG_BYTES)))
+
+# Tests para uploads directos al storage
+
+
+@pytest.fixture
+def direct_service(mock_repo, tmp_path, monkeypatch):
+    monkeypatch.setenv("STORAGE_LOCAL_DIR", str(tmp_path))
+    return ProfileService(mock_repo, storage=LocalStorage(StorageConfig()))
+
+
+def test_create_direct_upload_signs_a_staging_key(direct_service, mock_repo):
+    mock_repo.profile_exists.return_value = True
+
+    key, url, headers = direct_service.create_direct_upload(PROFILE_UUID, "image/png", 1024)
+
+    assert key.startswith(f"uploads/{PROFILE_UUID}/")
+    assert url == f"/storage/{key}"
+    assert headers == {"Content-Type": "image/png"}
+
+
+@pytest.mark.parametrize("content_type, size, error", [
+    ("application/pdf", 1024, ValueError),
+    ("image/png", 0, ValueError),
+    ("image/png", "1024", ValueError),
+    ("image/png", 50 * 1024 * 1024, ImageTooLarge),
+])
+def test_create_direct_upload_constraints(direct_service, content_type, size, error):
+    with pytest.raises(error):
+        direct_service.create_direct_upload(PROFILE_UUID, content_type, size)
+
+
+def test_complete_direct_upload_moves_object_to_content_key(direct_service, mock_repo, tmp_path):
+    staged = f"uploads/{PROFILE_UUID}/abc"
+    direct_service.storage.put(staged, io.BytesIO(PNG_BYTES), len(PNG_BYTES), "image/png")
+
+    url = direct_service.complete_direct_upload(PROFILE_UUID, staged)
+
+    assert url == f"/storage/images/{PNG_SHA256}.png"
+    assert (tmp_path / "images" / f"{PNG_SHA256}.png").read_bytes() == PNG_BYTES
+    assert list((tmp_path / "uploads" / PROFILE_UUID).iterdir()) == []
+    mock_repo.update_profile.assert_called_once_with(
+        PROFILE_UUID, {"display_image": url, "image_variants": None}
+    )
+
+
+def test_complete_direct_upload_rejects_and_deletes_non_images(direct_service, mock_repo, tmp_path):
+    staged = f"uploads/{PROFILE_UUID}/abc"
+    direct_service.storage.put(staged, io.BytesIO(b"%PDF-1.7 ..."), 12, "image/png")
+
+    with pytest.raises(ValueError, match="Unsupported image type"):
+        direct_service.complete_direct_upload(PROFILE_UUID, staged)
+    assert list((tmp_path / "uploads" / PROFILE_UUID).iterdir()) == []
+    mock_repo.insert_stored_image.assert_not_called()
+
+
+def test_complete_direct_upload_only_for_own_keys(direct_service):
+    with pytest.raises(ValueError, match="Invalid upload key"):
+        direct_service.complete_direct_upload(PROFILE_UUID, "uploads/456/abc")
+    with pytest.raises(ValueError, match="Invalid upload key"):
+        direct_service.complete_direct_upload(PROFILE_UUID, f"uploads/{PROFILE_UUID}/../../images/x.png")
+    with pytest.raises(ValueError, match="Invalid upload key"):
+        direct_service.complete_direct_upload(PROFILE_UUID, 5)
+
+
+def test_complete_direct_upload_keeps_staged_object_on_transient_errors(
+    direct_service, mock_repo, tmp_path
+):
+    staged = f"uploads/{PROFILE_UUID}/abc"
+    direct_service.storage.put(staged, io.BytesIO(PNG_BYTES), len(PNG_BYTES), "image/png")
+    mock_repo.get_stored_image.side_effect = psycopg.OperationalError("connection lost")
+
+    with pytest.raises(psycopg.OperationalError):
+        direct_service.complete_direct_upload(PROFILE_UUID, staged)
+    assert (tmp_path / staged).exists()
+
+    # El cliente reintenta y esta vez se completa
+    mock_repo.get_stored_image.side_effect = None
+    direct_service.complete_direct_upload(PROFILE_UUID, staged)
+    assert not (tmp_path / staged).exists()
+
+
+def test_direct_upload_rejects_invalid_uuid(direct_service, mock_repo):
+    with pytest.raises(ValueError, match="valid UUID"):
+        direct_service.create_direct_upload("123", "image/png", 1024)
+    with pytest.raises(ValueError, match="valid UUID"):
+        direct_service.complete_direct_upload("123", "uploads/123/abc")
+    mock_repo.profile_exists.assert_not_called()
+
+
+def test_complete_direct_upload_for_missing_profile(direct_service, mock_repo):
+    staged = f"uploads/{PROFILE_UUID}/abc"
+    direct_service.storage.put(staged, io.BytesIO(PNG_BYTES), len(PNG_BYTES), "image/png")
+    mock_repo.update_profile.return_value = None
+
+    with pytest.raises(ValueError, match="Profile not found."):
+        direct_service.complete_direct_upload(PROFILE_UUID, staged)
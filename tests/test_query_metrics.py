@@ -0,0 +1,94 @@
+# tests/test_query_metrics.py
+import pytest
+from unittest.mock import MagicMock, patch
+from src.infrastructure.persistence.base_entity import BaseEntity
+from src.infrastructure.persistence.query_metrics import Histogram, QueryMetrics
+
+
+@pytest.fixture
+def entity(monkeypatch):
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "0")
+    monkeypatch.setenv("DB_EXPLAIN_SAMPLE_RATE", "1")
+    entity = BaseEntity()
+    entity.metrics = QueryMetrics()
+    return entity
+
+
+def make_cursor(rowcount=2):
+    cursor = MagicMock()
+    cursor.rowcount = rowcount
+    explain = cursor.connection.cursor.return_value.__enter__.return_value
+    explain.fetchall.return_value = [("Seq Scan on profiles",), ("Execution Time: 1 ms",)]
+    return cursor
+
+# Tests para Histogram / QueryMetrics
+
+
+def test_histogram_buckets():
+    histogram = Histogram((1, 10))
+
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["buckets"] == {"1": 2, "10": 1, "+Inf": 1}
+
+
+def test_metrics_skip_unknown_rowcount():
+    metrics = QueryMetrics()
+
+    metrics.observe("iter_profiles", 3.0, None, 0.0)
+
+    snapshot = metrics.snapshot()["iter_profiles"]
+    assert snapshot["duration_ms"]["count"] == 1
+    assert snapshot["rows"]["count"] == 0
+
+# Tests para BaseEntity.execute
+
+
+def test_execute_records_query_metrics(entity):
+    cursor = make_cursor(rowcount=3)
+
+    with entity.connection():
+        entity.execute(cursor, "get_profiles", "SELECT 1 LIMIT %s", (3,), prepare=True)
+
+    cursor.execute.assert_called_once_with("SELECT 1 LIMIT %s", (3,), prepare=True)
+    snapshot = entity.metrics.snapshot()["get_profiles"]
+    assert snapshot["duration_ms"]["count"] == 1
+    assert snapshot["rows"]["sum"] == 3
+    assert snapshot["pool_wait_ms"]["count"] == 1
+
+
+def test_execute_logs_slow_select_with_plan(entity):
+    cursor = make_cursor()
+
+    with patch("src.infrastructure.persistence.query_metrics.logger") as mock_logger:
+        entity.execute(cursor, "get_profile", "SELECT 1 WHERE uuid = %s", ("abc",))
+
+    explain = cursor.connection.cursor.return_value.__enter__.return_value
+    explain.execute.assert_called_once_with(
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT 1 WHERE uuid = %s", ("abc",))
+    kwargs = mock_logger.warning.call_args[1]
+    assert kwargs["query"] == "get_profile"
+    assert kwargs["plan"] == "Seq Scan on profiles\nExecution Time: 1 ms"
+
+
+def test_execute_never_explains_writes(entity):
+    cursor = make_cursor()
+
+    with patch("src.infrastructure.persistence.query_metrics.logger") as mock_logger:
+        entity.execute(cursor, "update_profile", "UPDATE profiles SET phone = %s", ("1",))
+
+    cursor.connection.cursor.assert_not_called()
+    assert mock_logger.warning.call_args[1]["plan"] is None
+
+
+def test_execute_fast_query_not_logged(entity):
+    entity.config.slow_query_ms = 10_000
+    cursor = make_cursor()
+
+    with patch("src.infrastructure.persistence.query_metrics.logger") as mock_logger:
+        entity.execute(cursor, "get_profile", "SELECT 1")
+
+    mock_logger.warning.assert_not_called()
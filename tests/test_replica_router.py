@@ -0,0 +1,161 @@
+# tests/test_replica_router.py
+import pytest
+import uuid
+import psycopg
+from psycopg.pq import TransactionStatus
+from unittest.mock import MagicMock, patch
+from src import deadline
+from src.infrastructure.persistence.base_entity import BaseEntity
+from src.infrastructure.persistence.replica_router import RecentWrites, ReplicaRouter
+
+PRIMARY = "primary"
+REPLICA_A = "host=replica-a"
+REPLICA_B = "host=replica-b"
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Una conexión falsa por DSN; las réplicas en `down` no conectan"""
+    monkeypatch.setenv("DB_REPLICA_DSNS", f"{REPLICA_A}, {REPLICA_B}")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.2")
+    conns = {}
+    down = set()
+
+    def connect(dsn, **kwargs):
+        key = dsn if dsn in (REPLICA_A, REPLICA_B) else PRIMARY
+        if key in down:
+            raise psycopg.OperationalError("connection refused")
+        conn = MagicMock(name=key)
+        conn.closed = False
+        conn.broken = False
+        conn.pgconn.transaction_status = TransactionStatus.IDLE
+        conns.setdefault(key, []).append(conn)
+        return conn
+
+    with patch("psycopg.Connection.connect", side_effect=connect):
+        yield conns, down
+
+# Tests para ReplicaRouter
+
+
+def test_router_round_robin():
+    router = ReplicaRouter(3)
+
+    firsts = [router.candidates()[0] for _ in range(4)]
+
+    assert firsts == [0, 1, 2, 0]
+
+
+def test_router_skips_ejected_replica():
+    router = ReplicaRouter(2, eject_seconds=60)
+    router.eject(0)
+
+    assert router.candidates() == [1]
+    assert router.candidates() == [1]
+    assert router.is_ejected(0)
+
+
+def test_router_readmits_after_eject_window():
+    router = ReplicaRouter(2, eject_seconds=0)
+    router.eject(0)
+
+    assert 0 in router.candidates()
+
+
+def test_router_without_replicas():
+    assert ReplicaRouter(0).candidates() == []
+
+# Tests para RecentWrites
+
+
+def test_recent_writes_expire():
+    recent = RecentWrites(window=60)
+    recent.add("abc")
+
+    assert "abc" in recent
+    assert recent.any(["x", "abc"])
+    assert not RecentWrites(window=0).any(["abc"])
+
+
+def test_recent_writes_match_any_spelling_of_a_uuid():
+    recent = RecentWrites(window=60)
+    recent.add("123E4567E89B12D3A456426614174000")
+
+    assert "123e4567-e89b-12d3-a456-426614174000" in recent
+    assert uuid.UUID("123e4567-e89b-12d3-a456-426614174000") in recent
+
+# Tests para BaseEntity.read_connection
+
+
+def test_reads_go_to_replicas_in_turn(connections):
+    conns, _ = connections
+    entity = BaseEntity()
+
+    with entity.read_connection() as first:
+        pass
+    with entity.read_connection() as second:
+        pass
+
+    assert {first, second} == {conns[REPLICA_A][0], conns[REPLICA_B][0]}
+
+
+def test_writes_use_primary(connections):
+    conns, _ = connections
+    entity = BaseEntity()
+
+    with entity.connection() as conn:
+        assert conn is conns[PRIMARY][0]
+
+
+def test_read_your_own_write_pins_primary(connections):
+    conns, _ = connections
+    entity = BaseEntity()
+    entity.recent_writes.add("123")
+
+    with entity.read_connection(["123"]) as conn:
+        assert conn is conns[PRIMARY][0]
+
+    with entity.read_connection(["456"]) as conn:
+        assert conn is not conns[PRIMARY][0]
+
+
+def test_failing_replica_is_ejected(connections):
+    conns, down = connections
+    down.add(REPLICA_A)
+    entity = BaseEntity()
+
+    for _ in range(3):
+        with entity.read_connection() as conn:
+            assert conn in conns[REPLICA_B]
+
+    assert entity.router.is_ejected(0)
+
+
+def test_reads_fall_back_to_primary(connections):
+    conns, down = connections
+    down.update({REPLICA_A, REPLICA_B})
+    entity = BaseEntity()
+
+    with entity.read_connection() as conn:
+        assert conn is conns[PRIMARY][0]
+
+
+def test_broken_replica_connection_ejects_replica(connections):
+    conns, _ = connections
+    entity = BaseEntity()
+
+    with entity.read_connection() as conn:
+        conn.broken = True
+
+    assert entity.router.is_ejected(0) or entity.router.is_ejected(1)
+
+
+def test_replica_wait_bounded_by_pool_timeout_and_deadline(connections):
+    entity = BaseEntity()
+
+    # DB_POOL_TIMEOUT=0.2 en el fixture acota el DB_REPLICA_CONNECT_TIMEOUT por defecto
+    assert entity.config.replica_connect_timeout == 0.2
+    assert entity.replicas[0].kwargs["connect_timeout"] == 1
+    assert entity._replica_timeout() == 0.2
+    with deadline.deadline(0.05):
+        assert entity._replica_timeout() <= 0.05
@@ -0,0 +1,175 @@
+# tests/test_shared_cache.py
+import time
+import uuid
+from datetime import datetime
+import fakeredis
+import pytest
+import redis
+from unittest.mock import MagicMock, patch
+from src.application.profile_service import ProfileService
+from src.domain.profile import Profile
+from src.infrastructure.cache.lru_cache import LRUCache
+from src.infrastructure.cache.shared_cache import SharedProfileCache
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def profile():
+    return Profile(
+        uuid="123e4567-e89b-12d3-a456-426614174000",
+        email="test@example.com",
+        role="student",
+        display_name="Test User",
+        updated_at=datetime(2025, 5, 1, 12, 30),
+    )
+
+
+def make_cache(server):
+    return SharedProfileCache(fakeredis.FakeRedis(server=server), ttl=60)
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+# Tests para SharedProfileCache
+
+
+def test_shared_cache_round_trip(server, profile):
+    cache = make_cache(server)
+
+    cache.set(profile)
+    cached = cache.get(profile.uuid)
+
+    assert vars(cached) == vars(profile)
+    assert 0 < cache.client.pttl(f"profiles:{profile.uuid}") <= 60_000
+
+
+def test_fill_never_overwrites_a_write(server, profile):
+    cache = make_cache(server)
+    cache.set(profile)
+    stale = Profile(**{**vars(profile), "display_name": "Old name"})
+
+    cache.fill(stale)
+
+    assert cache.get(profile.uuid).display_name == "Test User"
+
+
+def test_write_invalidates_other_pods(server, profile):
+    writer, reader = make_cache(server), make_cache(server)
+    writer_local, reader_local = LRUCache(), LRUCache()
+    writer_local.set(profile.uuid, profile)
+    reader_local.set(profile.uuid, profile)
+    reader.listen(reader_local)
+    writer.listen(writer_local)
+
+    try:
+        writer.set(profile)
+
+        assert wait_for(lambda: reader_local.get(profile.uuid) is None)
+        # El pod que escribió conserva su copia
+        assert writer_local.get(profile.uuid) is profile
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_failed_subscription_is_retried_and_clears_local_copies(server, profile):
+    writer, reader = make_cache(server), make_cache(server)
+    reader_local = LRUCache()
+    reader_local.set(profile.uuid, profile)
+    pubsub = reader.client.pubsub
+    broken = MagicMock()
+    broken.subscribe.side_effect = redis.ConnectionError("connection refused")
+    reader.client.pubsub = MagicMock(side_effect=[broken, pubsub(ignore_subscribe_messages=True)])
+
+    try:
+        assert reader.listen(reader_local, retry_interval=0.05) is None
+        # Mientras no hay suscripción no se conserva nada local
+        reader._retry.join(timeout=3)
+        assert reader._listener is not None
+        assert reader_local.get(profile.uuid) is None
+
+        reader_local.set(profile.uuid, profile)
+        writer.set(profile)
+        assert wait_for(lambda: reader_local.get(profile.uuid) is None)
+    finally:
+        reader.close()
+
+
+def test_redis_errors_are_misses(profile):
+    client = MagicMock()
+    client.get.side_effect = redis.ConnectionError("connection refused")
+    client.pipeline.return_value.execute.side_effect = redis.ConnectionError("connection refused")
+    cache = SharedProfileCache(client)
+
+    cache.set(profile)
+    assert cache.get(profile.uuid) is None
+
+
+def test_values_from_the_driver_are_encoded(server, profile):
+    cache = make_cache(server)
+    row = Profile(**{**vars(profile), "uuid": uuid.UUID(profile.uuid)})
+
+    cache.set(row)
+    cache.fill(row)
+
+    assert cache.get(profile.uuid).uuid == profile.uuid
+
+
+def test_encoding_errors_are_misses(server, profile):
+    cache = make_cache(server)
+    cache.client.set(f"profiles:{profile.uuid}", "{not json")
+
+    assert cache.get(profile.uuid) is None
+    with patch("src.infrastructure.cache.shared_cache.json.dumps", side_effect=TypeError):
+        cache.set(profile)
+        cache.fill(profile)
+
+# Tests para ProfileService con cache compartido
+
+
+def test_service_promotes_shared_hit_to_local(server, profile):
+    mock_repo = MagicMock()
+    shared = make_cache(server)
+    shared.set(profile)
+    service = ProfileService(mock_repo, LRUCache(), shared)
+
+    found = service.get_specific_profile(profile.uuid)
+
+    assert found.display_name == "Test User"
+    assert service.profile_cache.get(profile.uuid) is found
+    mock_repo.get_profile.assert_not_called()
+
+
+def test_service_writes_update_through(server, profile):
+    mock_repo = MagicMock()
+    mock_repo.update_profile.return_value = profile
+    shared = make_cache(server)
+    service = ProfileService(mock_repo, None, shared)
+
+    service.modify_profile(profile.uuid, {"display_name": "Test User"})
+
+    assert make_cache(server).get(profile.uuid).display_name == "Test User"
+
+
+def test_bulk_invalidation_reaches_negative_cache(server):
+    writer, reader = make_cache(server), make_cache(server)
+    reader_missing = LRUCache(ttl=60)
+    reader_missing.set("123", True)
+    reader.listen(LRUCache(), reader_missing)
+
+    try:
+        writer.invalidate(["123"])
+
+        assert wait_for(lambda: reader_missing.get("123") is None)
+    finally:
+        reader.close()
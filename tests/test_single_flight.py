@@ -0,0 +1,146 @@
+# tests/test_single_flight.py
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from src import deadline
+from src.application.profile_service import ProfileService
+from src.application.single_flight import SingleFlight
+from src.domain.profile import Profile
+
+
+def run_concurrently(target, count):
+    results = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+def wait_until(condition, timeout=2.0):
+    limit = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < limit, "timed out waiting for waiters"
+        time.sleep(0.001)
+
+# Tests para SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_lookup():
+        calls.append(1)
+        release.wait(2)
+        return "profile"
+
+    threads, results = run_concurrently(lambda: flight.do("profile:1", slow_lookup), 8)
+    wait_until(lambda: flight.stats()["coalesced"] >= 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["profile"] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"executed": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_exception_fans_out_to_waiters():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing_lookup():
+        release.wait(2)
+        raise RuntimeError("Database connection error.")
+
+    threads, results = run_concurrently(lambda: flight.do("profile:1", failing_lookup), 3)
+    wait_until(lambda: flight.stats()["coalesced"] >= 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_waiter_respects_its_own_deadline():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flight.do("k", lambda: release.wait(2)))
+    leader.start()
+    wait_until(lambda: flight.stats()["in_flight"] == 1)
+
+    try:
+        with deadline.deadline(0.05):
+            with pytest.raises(deadline.DeadlineExceeded):
+                flight.do("k", lambda: None)
+    finally:
+        release.set()
+        leader.join()
+
+
+def test_async_callers_on_different_loops_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        started.set()
+        await asyncio.to_thread(release.wait, 2)
+        return "profile"
+
+    def request():
+        # Cada pedido async de Flask corre en su propio event loop
+        return asyncio.run(flight.do_async("profile:1", lookup))
+
+    threads, results = run_concurrently(request, 4)
+    started.wait(2)
+    wait_until(lambda: flight.stats()["coalesced"] >= 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["profile"] * 4
+    assert len(calls) == 1
+
+# Tests para ProfileService con single-flight
+
+
+def test_service_coalesces_concurrent_misses():
+    mock_repo = MagicMock()
+    release = threading.Event()
+
+    def get_profile(uuid):
+        release.wait(2)
+        return Profile(uuid=str(uuid), email="test@example.com", role="teacher")
+
+    mock_repo.get_profile.side_effect = get_profile
+    service = ProfileService(mock_repo)
+
+    threads, results = run_concurrently(lambda: service.get_specific_profile("123"), 5)
+    wait_until(lambda: service.single_flight.stats()["coalesced"] >= 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(result.uuid == "123" for result in results)
+    mock_repo.get_profile.assert_called_once_with("123")
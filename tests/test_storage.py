@@ -0,0 +1,185 @@
+# tests/test_storage.py
+import io
+import threading
+from datetime import timedelta
+import pytest
+from flask import request
+from unittest.mock import MagicMock, patch
+from src.application.profile_service import ProfileService
+from src.infrastructure.config.storage_config import StorageConfig
+from src.infrastructure.storage.gcs_storage import UPLOAD_CHUNK_SIZE, GCSStorage
+from src.infrastructure.storage.local_storage import LocalStorage
+from src.presentation.profile_controller import ProfileController
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setenv("STORAGE_LOCAL_DIR", str(tmp_path))
+    return LocalStorage(StorageConfig())
+
+# Tests para GCSStorage
+
+
+@patch('google.cloud.storage.Client')
+def test_gcs_bucket_built_once_from_memory(MockClient, monkeypatch):
+    monkeypatch.setenv('GOOGLE_CREDENTIALS_JSON', '{"type": "service_account"}')
+    storage = GCSStorage(StorageConfig())
+
+    with patch('builtins.open') as mock_open:
+        buckets = [storage._get_bucket() for _ in range(3)]
+
+    mock_open.assert_not_called()
+    MockClient.from_service_account_info.assert_called_once_with({"type": "service_account"})
+    MockClient.from_service_account_info.return_value.bucket.assert_called_once_with("test-bucket")
+    assert buckets[0] is buckets[1] is buckets[2]
+
+
+@patch('google.cloud.storage.Client')
+def test_gcs_bucket_initialized_once_across_threads(MockClient):
+    storage = GCSStorage()
+    barrier = threading.Barrier(8)
+
+    def upload():
+        barrier.wait()
+        storage._get_bucket()
+
+    threads = [threading.Thread(target=upload) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    MockClient.from_service_account_info.assert_called_once()
+
+
+def test_gcs_put_is_a_chunked_upload():
+    storage = GCSStorage()
+    storage._bucket = MagicMock()
+    blob = storage._bucket.blob.return_value
+    stream = io.BytesIO(b"data")
+
+    storage.put("images/abc.png", stream, 4, "image/png", "public, max-age=60")
+
+    storage._bucket.blob.assert_called_once_with("images/abc.png", chunk_size=UPLOAD_CHUNK_SIZE)
+    assert blob.cache_control == "public, max-age=60"
+    blob.upload_from_file.assert_called_once_with(stream, size=4, content_type="image/png")
+
+
+def test_gcs_public_url_requires_public_bucket(monkeypatch):
+    private = GCSStorage()
+    monkeypatch.setenv("GCS_PUBLIC_BUCKET", "true")
+    public = GCSStorage()
+    public._bucket = MagicMock()
+    public._bucket.blob.return_value.public_url = "https://storage.googleapis.com/b/images/abc.png"
+
+    with pytest.raises(ValueError):
+        private.public_url("images/abc.png")
+    assert public.public_url("images/abc.png") == "https://storage.googleapis.com/b/images/abc.png"
+
+
+def test_gcs_signed_url():
+    storage = GCSStorage()
+    storage._bucket = MagicMock()
+    storage._bucket.blob.return_value.generate_signed_url.return_value = "https://signed"
+
+    assert storage.signed_url("images/abc.png", timedelta(minutes=15)) == "https://signed"
+    storage._bucket.blob.return_value.generate_signed_url.assert_called_once_with(
+        version="v4", expiration=timedelta(minutes=15), method="GET"
+    )
+
+def test_gcs_signed_upload_url_pins_type_and_size():
+    storage = GCSStorage()
+    storage._bucket = MagicMock()
+    storage._bucket.blob.return_value.generate_signed_url.return_value = "https://signed-put"
+
+    url, headers = storage.signed_upload_url(
+        "uploads/123/abc", "image/png", 1024, timedelta(minutes=10)
+    )
+
+    assert url == "https://signed-put"
+    assert headers == {"Content-Type": "image/png", "x-goog-content-length-range": "0,1024"}
+    storage._bucket.blob.return_value.generate_signed_url.assert_called_once_with(
+        version="v4",
+        expiration=timedelta(minutes=10),
+        method="PUT",
+        content_type="image/png",
+        headers={"x-goog-content-length-range": "0,1024"},
+    )
+
+# Tests para LocalStorage
+
+
+def test_local_round_trip(local_storage, tmp_path):
+    local_storage.put("images/abc/card.jpg", io.BytesIO(b"jpeg bytes"), 10, "image/jpeg")
+
+    with local_storage.stream("images/abc/card.jpg") as stream:
+        assert stream.read() == b"jpeg bytes"
+    assert [path.name for path in (tmp_path / "images" / "abc").iterdir()] == ["card.jpg"]
+    assert local_storage.public_url("images/abc/card.jpg") == "/storage/images/abc/card.jpg"
+
+
+def test_local_rejects_keys_outside_root(local_storage):
+    with pytest.raises(FileNotFoundError):
+        local_storage.put("../escape.png", io.BytesIO(b"x"), 1, "image/png")
+    with pytest.raises(FileNotFoundError):
+        local_storage.stream("../../etc/passwd")
+
+
+def test_local_failed_put_leaves_nothing(local_storage, tmp_path):
+    stream = MagicMock()
+    stream.read.side_effect = OSError("connection reset")
+
+    with pytest.raises(OSError):
+        local_storage.put("images/abc.png", stream, 10, "image/png")
+    assert list((tmp_path / "images").iterdir()) == []
+
+def test_local_copy_and_delete(local_storage):
+    local_storage.put("uploads/123/abc", io.BytesIO(b"png bytes"), 9, "image/png")
+
+    local_storage.copy("uploads/123/abc", "images/abc.png")
+    local_storage.delete("uploads/123/abc")
+    local_storage.delete("uploads/123/abc")
+
+    with local_storage.stream("images/abc.png") as stream:
+        assert stream.read() == b"png bytes"
+    with pytest.raises(FileNotFoundError):
+        local_storage.stream("uploads/123/abc")
+
+# Tests para GET /storage/<key>
+
+
+def test_controller_serves_local_files(app, local_storage):
+    local_storage.put("images/abc.png", io.BytesIO(b"png bytes"), 9, "image/png")
+    controller = ProfileController(ProfileService(MagicMock(), storage=local_storage))
+
+    with app.test_request_context("/storage/images/abc.png"):
+        result = controller.get_stored_file("images/abc.png")
+    result["response"].direct_passthrough = False
+
+    assert result["code_status"] == 200
+    assert result["response"].mimetype == "image/png"
+    assert result["response"].get_data() == b"png bytes"
+    assert "immutable" in result["response"].headers["Cache-Control"]
+    result["response"].close()
+
+
+def test_controller_404_for_missing_or_remote_files(local_storage):
+    local_controller = ProfileController(ProfileService(MagicMock(), storage=local_storage))
+    gcs_controller = ProfileController(ProfileService(MagicMock(), storage=GCSStorage()))
+
+    assert local_controller.get_stored_file("images/missing.png")["code_status"] == 404
+    assert gcs_controller.get_stored_file("images/abc.png")["code_status"] == 404
+
+
+def test_controller_accepts_local_direct_uploads_only_to_staging(app, local_storage):
+    controller = ProfileController(ProfileService(MagicMock(), storage=local_storage))
+
+    with app.test_request_context("/storage/uploads/123/abc", method="PUT", data=b"png bytes"):
+        staged = controller.put_stored_file("uploads/123/abc", request)
+    with app.test_request_context("/storage/images/abc.png", method="PUT", data=b"evil"):
+        overwrite = controller.put_stored_file("images/abc.png", request)
+
+    assert staged["code_status"] == 200
+    assert overwrite["code_status"] == 404
+    with local_storage.stream("uploads/123/abc") as stream:
+        assert stream.read() == b"png bytes"